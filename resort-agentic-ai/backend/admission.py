@@ -0,0 +1,192 @@
+# backend/admission.py
+"""
+Admission control for /chat.
+
+- Per-session token bucket            -> 429 when a session sends too fast
+- Global concurrency limit with a
+  bounded wait queue                  -> 503 when the queue is full / wait times out
+- Separate, smaller budget for the
+  paid LLM fallback                   -> router degrades to the keyword answer;
+                                         hedges and failovers are charged too
+
+Limits come from ADMISSION_* environment variables (see AdmissionConfig).
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+
+
+@dataclass
+class AdmissionConfig:
+    session_rate: float = 2.0          # tokens per second per session
+    session_burst: int = 10            # bucket size per session
+    max_sessions: int = 100_000        # tracked buckets (LRU)
+    max_concurrent: int = 16           # messages routed at once
+    max_queue: int = 16                # messages allowed to wait for a slot
+    queue_timeout: float = 2.0         # seconds a queued message may wait
+    llm_max_concurrent: int = 4        # LLM fallback calls in flight (hedges included)
+    llm_rate: float = 2.0              # LLM fallback calls per second (global)
+    llm_burst: int = 10
+
+    @classmethod
+    def from_env(cls):
+        """Read ADMISSION_<FIELD> overrides, e.g. ADMISSION_MAX_CONCURRENT=32."""
+        values = {}
+        for f in fields(cls):
+            raw = os.getenv(f"ADMISSION_{f.name.upper()}")
+            if raw is not None:
+                values[f.name] = type(f.default)(raw)
+        return cls(**values)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: int = 1):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: int, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class AdmissionController:
+    def __init__(self, config: AdmissionConfig = None, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.configure(config or AdmissionConfig())
+
+    def configure(self, config: AdmissionConfig):
+        with self._lock:
+            self.config = config
+            self._buckets = OrderedDict()
+            self._slots = threading.BoundedSemaphore(config.max_concurrent)
+            self._llm_slots = threading.BoundedSemaphore(config.llm_max_concurrent)
+            self._llm_bucket = TokenBucket(config.llm_rate, config.llm_burst, self._clock())
+            self._waiting = 0
+            self._in_flight = 0
+            self._counters = dict.fromkeys((
+                "admitted", "queued", "shed_rate_limited", "shed_queue_full",
+                "shed_queue_timeout", "llm_calls", "llm_degraded",
+                "llm_extra_calls", "llm_extra_denied"
+            ), 0)
+            self._peak_waiting = 0
+
+    # ---------------------------
+    # Per-session rate limit
+    # ---------------------------
+    def _take_session_token(self, session_id: str) -> bool:
+        now = self._clock()
+        bucket = self._buckets.get(session_id)
+        if bucket is None:
+            bucket = TokenBucket(self.config.session_rate, self.config.session_burst, now)
+            self._buckets[session_id] = bucket
+            if len(self._buckets) > self.config.max_sessions:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(session_id)
+        return bucket.take(now)
+
+    # ---------------------------
+    # Admission
+    # ---------------------------
+    @contextmanager
+    def admit(self, session_id: str):
+        """Hold a routing slot for the duration of the block or raise AdmissionRejected."""
+        slots = self._slots
+        with self._lock:
+            if not self._take_session_token(session_id):
+                self._counters["shed_rate_limited"] += 1
+                raise AdmissionRejected(429, "Too many messages, please slow down.")
+
+            acquired = slots.acquire(blocking=False)
+            if not acquired:
+                if self._waiting >= self.config.max_queue:
+                    self._counters["shed_queue_full"] += 1
+                    raise AdmissionRejected(503, "Server busy, please retry shortly.")
+                self._waiting += 1
+                self._peak_waiting = max(self._peak_waiting, self._waiting)
+                self._counters["queued"] += 1
+
+        if not acquired:
+            acquired = slots.acquire(timeout=self.config.queue_timeout)
+            with self._lock:
+                self._waiting -= 1
+                if not acquired:
+                    self._counters["shed_queue_timeout"] += 1
+            if not acquired:
+                raise AdmissionRejected(503, "Server busy, please retry shortly.")
+
+        with self._lock:
+            self._counters["admitted"] += 1
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            slots.release()
+
+    def _take_llm_call(self, counters):
+        slots = self._llm_slots
+        with self._lock:
+            # slot first: a token taken while every slot is busy would be wasted
+            allowed = slots.acquire(blocking=False)
+            if allowed and not self._llm_bucket.take(self._clock()):
+                slots.release()
+                allowed = False
+            self._counters[counters[0] if allowed else counters[1]] += 1
+        return slots.release if allowed else None
+
+    def llm_call(self):
+        """
+        Reserve the first LLM call of a turn: a callable that frees its slot
+        (call it once the HTTP call has ended), or None when the caller should degrade.
+        """
+        return self._take_llm_call(("llm_calls", "llm_degraded"))
+
+    def llm_extra_call(self):
+        """Same for a hedge or failover of that call; None means don't make it."""
+        return self._take_llm_call(("llm_extra_calls", "llm_extra_denied"))
+
+    @contextmanager
+    def llm_slot(self):
+        """Yields True when an LLM call fits the budget, False when the caller should degrade."""
+        release = self.llm_call()
+        try:
+            yield release is not None
+        finally:
+            if release is not None:
+                release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "peak_waiting": self._peak_waiting,
+                "tracked_sessions": len(self._buckets),
+                "limits": {f.name: getattr(self.config, f.name) for f in fields(self.config)}
+            }
+
+
+ADMISSION = AdmissionController()
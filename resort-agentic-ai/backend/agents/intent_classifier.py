@@ -0,0 +1,179 @@
+# backend/agents/intent_classifier.py
+"""
+Local intent classifier: character n-gram TF-IDF + softmax regression.
+
+Sits between the fuzzy keyword passes and the LLM in `route_message`.
+Trained offline (`python -m backend.tools.train_intent`) from captured
+router decisions and stored as an uncompressed .npz, which loads in a few
+milliseconds. The confidence threshold the router applies is calibrated on
+held-out examples at training time and stored with the model.
+"""
+import re
+
+import numpy as np
+from scipy import sparse
+
+NGRAM_RANGE = (2, 4)
+MODEL_VERSION = 1
+
+
+def normalize(text: str) -> str:
+    text = re.sub(r"[^a-z0-9 ]+", " ", (text or "").lower())
+    return " ".join(text.split())
+
+
+def char_ngrams(text: str, ngram_range=NGRAM_RANGE):
+    padded = f" {text} "
+    lo, hi = ngram_range
+    for n in range(lo, hi + 1):
+        for i in range(len(padded) - n + 1):
+            yield padded[i:i + n]
+
+
+def _softmax(z):
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+class IntentClassifier:
+    def __init__(self, vocab: dict, idf, coef, intercept, classes, ngram_range=NGRAM_RANGE,
+                 threshold: float = None):
+        self.vocab = vocab
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.classes = list(classes)
+        self.ngram_range = tuple(ngram_range)
+        self.threshold = threshold      # calibrated confidence threshold, None if not calibrated
+
+    # ---------------------------
+    # Features
+    # ---------------------------
+    def _counts(self, messages):
+        rows, cols = [], []
+        vocab = self.vocab
+        for row, message in enumerate(messages):
+            for gram in char_ngrams(normalize(message), self.ngram_range):
+                col = vocab.get(gram)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        data = np.ones(len(rows), dtype=np.float64)
+        X = sparse.csr_matrix(
+            (data, (rows, cols)), shape=(len(messages), len(vocab))
+        )
+        X.sum_duplicates()
+        return X
+
+    def transform(self, messages):
+        """Sublinear tf * idf, L2-normalized rows."""
+        X = self._counts(messages)
+        X.data = (1.0 + np.log(X.data)) * self.idf[X.indices]
+        norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ X
+
+    # ---------------------------
+    # Prediction
+    # ---------------------------
+    def predict_proba(self, messages):
+        X = self.transform(messages)
+        return _softmax(X @ self.coef + self.intercept)
+
+    def predict(self, message: str):
+        """Returns: (label, confidence)"""
+        proba = self.predict_proba([message])[0]
+        best = int(proba.argmax())
+        return self.classes[best], float(proba[best])
+
+    def calibrate(self, messages, labels, min_precision: float, min_answered: int = 1):
+        """
+        Lowest confidence threshold at which the answers on held-out
+        `messages` are at least `min_precision` correct.
+        Returns: (threshold, precision, coverage), or None if none gets there.
+        """
+        proba = self.predict_proba(messages)
+        best = proba.argmax(axis=1)
+        confidence = proba[np.arange(len(messages)), best]
+        correct = np.array([self.classes[j] == label for j, label in zip(best, labels)])
+
+        order = np.argsort(-confidence, kind="stable")
+        confidence, correct = confidence[order], correct[order]
+        answered = np.arange(1, len(order) + 1)
+        precision = np.cumsum(correct) / answered
+        # a threshold admits every tie, so only cut between distinct confidences
+        cut = np.append(confidence[1:] < confidence[:-1], True)
+        ok = np.nonzero(cut & (precision >= min_precision) & (answered >= min_answered))[0]
+        if not len(ok):
+            return None
+        k = ok[-1]
+        return float(confidence[k]), float(precision[k]), float(answered[k] / len(order))
+
+    # ---------------------------
+    # Training
+    # ---------------------------
+    @classmethod
+    def train(cls, messages, labels, min_df=2, epochs=300, lr=5.0, l2=1e-4,
+              ngram_range=NGRAM_RANGE):
+        classes = sorted(set(labels))
+
+        # document frequencies
+        df = {}
+        for message in messages:
+            for gram in set(char_ngrams(normalize(message), ngram_range)):
+                df[gram] = df.get(gram, 0) + 1
+        grams = sorted(g for g, c in df.items() if c >= min_df)
+        vocab = {g: i for i, g in enumerate(grams)}
+        n = len(messages)
+        idf = np.log((1.0 + n) / (1.0 + np.array([df[g] for g in grams], dtype=np.float64))) + 1.0
+
+        model = cls(vocab, idf, np.zeros((len(grams), len(classes))),
+                    np.zeros(len(classes)), classes, ngram_range)
+        X = model.transform(messages)
+        Xt = X.T.tocsr()
+        Y = np.zeros((n, len(classes)))
+        Y[np.arange(n), [classes.index(label) for label in labels]] = 1.0
+
+        # full-batch gradient descent on the softmax cross-entropy
+        W, b = model.coef, model.intercept
+        for _ in range(epochs):
+            G = (_softmax(X @ W + b) - Y) / n
+            W -= lr * (Xt @ G + l2 * W)
+            b -= lr * G.sum(axis=0)
+
+        return model
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    def save(self, path):
+        grams = sorted(self.vocab, key=self.vocab.get)
+        np.savez(
+            path,
+            version=np.array(MODEL_VERSION),
+            ngrams=np.array(grams, dtype=str),
+            ngram_range=np.array(self.ngram_range),
+            idf=self.idf,
+            coef=self.coef,
+            intercept=self.intercept,
+            classes=np.array(self.classes, dtype=str),
+            threshold=np.array(np.nan if self.threshold is None else self.threshold)
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != MODEL_VERSION:
+                raise ValueError(f"Unsupported intent model version: {int(data['version'])}")
+            grams = data["ngrams"].tolist()
+            threshold = float(data["threshold"]) if "threshold" in data.files else np.nan
+            return cls(
+                dict(zip(grams, range(len(grams)))),
+                data["idf"],
+                data["coef"],
+                data["intercept"],
+                data["classes"].tolist(),
+                data["ngram_range"].tolist(),
+                None if np.isnan(threshold) else threshold
+            )
@@ -0,0 +1,342 @@
+# backend/agents/llm_pool.py
+"""
+Pool of OpenAI-compatible chat endpoints for the LLM routing fallback.
+
+- Latency-aware selection: providers are tried fastest first (median of
+  recent calls, ties in configured order); a provider with too many consecutive errors cools down and
+  is only used when nothing else is left.
+- Hedging: if the first provider hasn't answered after its own p95 latency,
+  the next one is asked too and the first valid answer wins. At most
+  `max_hedges` extra calls are made this way.
+- Failover: an error or an invalid answer immediately fires the next provider.
+- Budget: with `admit`, every hedge and failover first reserves a call
+  from the caller's budget (the router uses the admission LLM limits) and
+  is skipped when none is left. Each reservation is held until its own
+  call ends, even if another provider answered first.
+
+Providers come from LLM_PROVIDERS, a JSON list such as
+
+    [{"name": "local", "base_url": "http://127.0.0.1:8001/v1", "model": "qwen2.5-7b-instruct"},
+     {"name": "openai", "model": "gpt-4o-mini", "api_key_env": "OPENAI_API_KEY"}]
+
+(default: OpenAI gpt-4o-mini with OPENAI_API_KEY). A provider whose API key
+variable is unset is skipped. Timing limits come from LLM_POOL_* variables
+(see LLMPoolConfig). Per-provider stats: `LLM_POOL.stats()`.
+"""
+import json
+import logging
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Callable, Optional
+
+from openai import OpenAI
+
+LOG = logging.getLogger("llm_pool")
+
+DEFAULT_PROVIDERS = [{"name": "openai", "model": "gpt-4o-mini", "api_key_env": "OPENAI_API_KEY"}]
+
+
+@dataclass
+class LLMPoolConfig:
+    timeout: float = 8.0                # seconds per decision, all attempts included
+    hedge_quantile: float = 0.95        # hedge after this latency quantile of the provider
+    hedge_min_delay: float = 0.05
+    hedge_max_delay: float = 2.0
+    hedge_default_delay: float = 1.0    # until a provider has min_samples latencies
+    min_samples: int = 20
+    max_hedges: int = 1                 # extra concurrent calls per decision
+    window: int = 200                   # latencies kept per provider
+    error_threshold: int = 3            # consecutive failures before a cooldown
+    cooldown: float = 30.0
+    max_workers: int = 16
+
+    @classmethod
+    def from_env(cls):
+        """Read LLM_POOL_<FIELD> overrides, e.g. LLM_POOL_MAX_HEDGES=2."""
+        values = {}
+        for f in fields(cls):
+            raw = os.getenv(f"LLM_POOL_{f.name.upper()}")
+            if raw is not None:
+                values[f.name] = type(f.default)(raw)
+        return cls(**values)
+
+
+@dataclass
+class ProviderSpec:
+    name: str
+    model: str
+    base_url: Optional[str] = None      # None = api.openai.com
+    api_key_env: Optional[str] = None
+
+    def api_key(self):
+        """The key to send, or None if the provider can't be used."""
+        env = self.api_key_env or ("OPENAI_API_KEY" if self.base_url is None else None)
+        if env is None:
+            return "not-needed"         # local servers usually ignore the key
+        return os.getenv(env) or None
+
+
+class LLMUnavailable(Exception):
+    pass
+
+
+class Provider:
+    def __init__(self, spec: ProviderSpec, api_key: str, config: LLMPoolConfig, clock=time.monotonic):
+        self.spec = spec
+        self.config = config
+        self._clock = clock
+        self._client = OpenAI(
+            api_key=api_key, base_url=spec.base_url, timeout=config.timeout, max_retries=0
+        )
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=config.window)
+        self._consecutive_failures = 0
+        self._cooldown_until = 0.0
+        self._in_flight = 0
+        self._counters = dict.fromkeys(
+            ("calls", "ok", "errors", "invalid", "hedges", "failovers", "wins"), 0
+        )
+
+    def count(self, key, delta=1):
+        with self._lock:
+            self._counters[key] += delta
+
+    def complete(self, messages) -> str:
+        with self._lock:
+            self._counters["calls"] += 1
+            self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            response = self._client.chat.completions.create(
+                model=self.spec.model, messages=messages, temperature=0
+            )
+            text = (response.choices[0].message.content or "").strip()
+        except Exception:
+            self._failed("errors")
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        with self._lock:
+            self._counters["ok"] += 1
+            self._latencies.append(time.perf_counter() - started)
+            self._consecutive_failures = 0
+        return text
+
+    def reject(self):
+        """The answer arrived but wasn't usable."""
+        self._failed("invalid")
+
+    def _failed(self, key):
+        with self._lock:
+            self._counters[key] += 1
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.config.error_threshold:
+                self._cooldown_until = self._clock() + self.config.cooldown
+
+    # ---- latency / health ----
+
+    def quantile(self, q: float):
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        return samples[max(math.ceil(q * len(samples)) - 1, 0)]
+
+    def cooling_down(self) -> bool:
+        return self._clock() < self._cooldown_until
+
+    def rank_key(self):
+        median = self.quantile(0.5)
+        # an unmeasured provider is assumed to be as slow as the default hedge delay
+        return (self.cooling_down(), self.config.hedge_default_delay if median is None else median)
+
+    def hedge_delay(self) -> float:
+        config = self.config
+        if len(self._latencies) < config.min_samples:
+            return config.hedge_default_delay
+        delay = self.quantile(config.hedge_quantile)
+        return min(max(delay, config.hedge_min_delay), config.hedge_max_delay)
+
+    def stats(self) -> dict:
+        p50, p95 = self.quantile(0.5), self.quantile(0.95)
+        with self._lock:
+            counters = dict(self._counters)
+            in_flight = self._in_flight
+        finished = counters["ok"] + counters["errors"]
+        return {
+            "model": self.spec.model,
+            "base_url": self.spec.base_url,
+            **counters,
+            "in_flight": in_flight,
+            "error_rate": round((counters["errors"] + counters["invalid"]) / finished, 3) if finished else 0.0,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "hedge_delay_ms": round(self.hedge_delay() * 1000, 1),
+            "cooling_down": self.cooling_down()
+        }
+
+
+def providers_from_env() -> list:
+    raw = os.getenv("LLM_PROVIDERS")
+    rows = json.loads(raw) if raw else DEFAULT_PROVIDERS
+    return [ProviderSpec(**row) for row in rows]
+
+
+class ProviderPool:
+    def __init__(self, specs=None, config: LLMPoolConfig = None, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._providers = None
+        self._executor = None
+        self._counters = dict.fromkeys(
+            ("requests", "answered", "hedged", "hedge_wins", "budget_denied", "failed"), 0
+        )
+        if specs is not None:
+            self.configure(specs, config)
+
+    def configure(self, specs=None, config: LLMPoolConfig = None):
+        """
+        Replace the providers. specs=None defers to LLM_PROVIDERS /
+        LLM_POOL_* on first use (after .env is loaded).
+        """
+        with self._lock:
+            previous = self._executor
+            self._providers = self._executor = None
+            self._counters = dict.fromkeys(self._counters, 0)
+            if specs is not None:
+                self._build(specs, config or LLMPoolConfig())
+        if previous is not None:
+            previous.shutdown(wait=False)
+
+    def _build(self, specs, config):
+        providers = []
+        for spec in specs:
+            api_key = spec.api_key()
+            if api_key is None:
+                LOG.warning("LLM provider skipped: no API key", extra={"provider": spec.name})
+                continue
+            providers.append(Provider(spec, api_key, config, self._clock))
+        self.config = config
+        self._providers = providers
+        self._executor = ThreadPoolExecutor(max_workers=config.max_workers, thread_name_prefix="llm")
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    def providers(self) -> list:
+        if self._providers is None:
+            with self._lock:
+                if self._providers is None:
+                    self._build(providers_from_env(), LLMPoolConfig.from_env())
+        return self._providers
+
+    def ranked(self) -> list:
+        """Healthy providers fastest first, then those cooling down."""
+        providers = self.providers()
+        return sorted(providers, key=lambda p: (*p.rank_key(), providers.index(p)))
+
+    def complete(self, messages, validate: Callable[[str], bool] = None,
+                 admit: Callable[[], Optional[Callable]] = None,
+                 release: Callable[[], None] = None) -> str:
+        """
+        First valid answer from the pool (hedged / failed over as needed).
+        Raises LLMUnavailable when every provider failed or the timeout passed.
+
+        `release` is called when the first call has ended. `admit` is asked
+        before each hedge or failover: it returns that call's release, or
+        None to skip it.
+        """
+        try:
+            ranked = self.ranked()
+        except BaseException:
+            if release:
+                release()
+            raise
+        if not ranked:
+            if release:
+                release()
+            raise LLMUnavailable("No LLM provider configured")
+        self._count("requests")
+
+        config = self.config
+        executor = self._executor
+        done = queue.SimpleQueue()
+        deadline = self._clock() + config.timeout
+        attempts = {"next": 0, "pending": 0}
+
+        def launch(kind=None, release=None):
+            if kind and admit:
+                release = admit()
+                if release is None:
+                    self._count("budget_denied")
+                    return None
+            provider = ranked[attempts["next"]]
+            try:
+                future = executor.submit(provider.complete, messages)
+            except BaseException:
+                if release:
+                    release()
+                raise
+            attempts["next"] += 1
+            attempts["pending"] += 1
+            if kind:
+                provider.count(kind)
+            if release:
+                future.add_done_callback(lambda f: release())
+            future.add_done_callback(lambda f: done.put((provider, f, kind)))
+            return provider
+
+        hedges = 0
+        hedge_at = self._clock() + launch(release=release).hedge_delay()
+
+        while attempts["pending"]:
+            now = self._clock()
+            if now >= deadline:
+                break
+            can_hedge = hedges < config.max_hedges and attempts["next"] < len(ranked)
+            wait = (min(hedge_at, deadline) if can_hedge else deadline) - now
+            try:
+                provider, future, kind = done.get(timeout=max(wait, 0))
+            except queue.Empty:
+                if can_hedge and self._clock() >= hedge_at:
+                    provider = launch("hedges")
+                    if provider is None:
+                        hedges = config.max_hedges      # no budget: wait for the calls in flight
+                        continue
+                    if not hedges:
+                        self._count("hedged")
+                    hedges += 1
+                    hedge_at = self._clock() + provider.hedge_delay()
+                continue
+
+            attempts["pending"] -= 1
+            if future.exception() is None:
+                text = future.result()
+                if validate is None or validate(text):
+                    provider.count("wins")
+                    self._count("answered")
+                    if kind == "hedges":
+                        self._count("hedge_wins")
+                    return text
+                provider.reject()
+            if attempts["next"] < len(ranked):
+                launch("failovers")
+
+        self._count("failed")
+        raise LLMUnavailable("No LLM provider answered in time")
+
+    def stats(self) -> dict:
+        providers = {p.spec.name: p.stats() for p in self.providers()}
+        with self._lock:
+            return {**self._counters, "providers": providers}
+
+
+LLM_POOL = ProviderPool()
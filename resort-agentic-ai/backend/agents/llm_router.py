@@ -1,33 +1,35 @@
-import os
-from openai import OpenAI
+from backend.agents.llm_pool import LLM_POOL
+from backend.agents.registry import AGENTS, dispatch
 
-from backend.agents.receptionist import receptionist_agent
-from backend.agents.restaurant import restaurant_agent
-from backend.agents.room_service import room_service_agent
 
+def llm_decide(message: str, use_llm: bool = True, admit=None, release=None) -> str:
+    """LLM-based intent decision: the department that should handle the message."""
+    return llm_decision(message, use_llm, admit, release)[0]
 
-def llm_router(session_id: str, message: str):
-    """
-    LLM-based router that decides which agent should handle the message.
 
-    - Uses OpenAI for intent reasoning
-    - Falls back to rule-based routing if OpenAI fails
-    - OpenAI client is created lazily to avoid env / reload issues
+def llm_decision(message: str, use_llm: bool = True, admit=None, release=None):
+    """
+    LLM-based intent decision: returns (department, answered), where answered
+    is False when the keyword fallback below decided instead of a provider.
+
+    - Asks the LLM provider pool (hedged / failed over across endpoints)
+    - Falls back to rule-based routing if no provider gives a valid answer
+    - Providers are configured lazily to avoid env / reload issues
+    - use_llm=False skips the LLM call (LLM budget exhausted)
+    - admit / release charge the pool's calls to a budget (see ProviderPool.complete)
     """
 
     # Step 1: Prepare fallback
 
     msg = message.lower()
     decision = None
+    answered = False
 
     # Step 2: Try LLM routing
 
     try:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY not found")
-
-        client = OpenAI(api_key=api_key)
+        if not use_llm:
+            raise RuntimeError("LLM budget exhausted")
 
         system_prompt = """
 You are an AI intent router for a resort chatbot.
@@ -73,16 +75,16 @@ restaurant
 room_service
 """
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        decision = LLM_POOL.complete(
+            [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": message}
             ],
-            temperature=0
-        )
-
-        decision = response.choices[0].message.content.strip().lower()
+            validate=lambda text: text.lower() in AGENTS,
+            admit=admit,
+            release=release
+        ).lower()
+        answered = True
 
     except Exception as e:
 
@@ -95,12 +97,12 @@ room_service
         else:
             decision = "receptionist"
 
-    # Step 4: Call agent
+    return (decision if decision in AGENTS else "receptionist"), answered
 
-    if decision == "restaurant":
-        return restaurant_agent(session_id, message)
 
-    if decision == "room_service":
-        return room_service_agent(session_id, message)
-
-    return receptionist_agent(message)
+def llm_router(session_id: str, message: str, use_llm: bool = True):
+    """
+    LLM-based router that decides which agent should handle the message
+    and calls it.
+    """
+    return dispatch(llm_decide(message, use_llm=use_llm), session_id, message)
@@ -1,7 +1,9 @@
 # backend/agents/receptionist.py
 from backend.database import SessionLocal
 from backend.models.room import Room
-import re
+from backend.properties import availability_index, property_rooms
+from backend.utils.dates import parse_date_range
+from backend.utils.session import extract_room_number
 
 # Static resort info
 CHECK_IN_TIME = "2:00 PM"
@@ -13,57 +15,134 @@ FACILITIES_INFO = {
     "pool": "🏊 The swimming pool is open from 7:00 AM to 9:00 PM."
 }
 
+# a date range only means "availability" when one of these is present
+AVAILABILITY_WORDS = ("free", "availab", "vacan", "book", "reserv")
 
-def extract_room_number(text: str):
-    match = re.search(r"\b(10[0-9])\b", text)
-    return int(match.group(1)) if match else None
+# longest room list we spell out in a reply
+MAX_LISTED_ROOMS = 20
+
+FACILITIES_REPLY = (
+    "🏨 **Our facilities include:**\n"
+    "• Gym\n"
+    "• Spa\n"
+    "• Swimming Pool\n\n"
+    "Ask about any of them (e.g., 'gym')."
+)
+
+HELP_REPLY = (
+    "I can help with:\n"
+    "• Check-in / Check-out\n"
+    "• Facilities\n"
+    "• Room availability (e.g. 'rooms free next weekend')\n"
+    "You can ask a specific room number (e.g. 'Is room 101 available?')."
+)
+
+# pre-rendered answers that depend only on the question (see static_intent)
+STATIC_REPLIES = {
+    "check_in": f"🕑 Check-in time is **{CHECK_IN_TIME}**.",
+    "check_out": f"🕚 Check-out time is **{CHECK_OUT_TIME}**.",
+    **FACILITIES_INFO,
+    "facilities": FACILITIES_REPLY,
+    "help": HELP_REPLY
+}
+
+
+def format_stay(check_in, check_out):
+    nights = (check_out - check_in).days
+    return (
+        f"{check_in:%a %d %b} → {check_out:%a %d %b} "
+        f"({nights} night{'s' if nights != 1 else ''})"
+    )
+
+
+def date_range_reply(db, msg: str, room_no, stay):
+    check_in, check_out = stay
+    index = availability_index()
+    index.ensure_loaded(db)
+    when = format_stay(check_in, check_out)
+
+    if room_no:
+        free = index.is_free(room_no, check_in, check_out)
+        if free is None:
+            return "❌ That room does not exist."
+        return f"{'✅' if free else '❌'} Room **{room_no}** is {'free' if free else 'booked'} for {when}."
+
+    if "how many" in msg:
+        count = index.count_free(check_in, check_out)
+        if not count:
+            return f"❌ No rooms are free for {when}."
+        return f"✅ **{count}** rooms are free for {when}."
+
+    rooms = index.free_rooms(check_in, check_out)
+    if not rooms:
+        return f"❌ No rooms are free for {when}."
+    if len(rooms) > MAX_LISTED_ROOMS:
+        return f"✅ **{len(rooms)}** rooms are free for {when}."
+    return f"✅ Free rooms for {when}: {', '.join(str(r) for r in rooms)}"
+
+
+def static_intent(msg: str):
+    """
+    Key of the reply for a message with no room number or stay in it:
+    a STATIC_REPLIES key, or "room_availability" (read from the rooms table).
+    """
+    if "check in" in msg or "check-in" in msg:
+        return "check_in"
+    if "check out" in msg or "check-out" in msg:
+        return "check_out"
+    for facility in FACILITIES_INFO:
+        if facility in msg:
+            return facility
+    if "facilities" in msg or "facility" in msg:
+        return "facilities"
+    if "room availability" in msg or "available room" in msg or "room available" in msg:
+        return "room_availability"
+    return "help"
+
+
+def memo_intent(msg: str):
+    """
+    static_intent() of a message whose reply can't depend on room numbers or
+    dates (no digits, no relative stay like "next weekend"); else None.
+    """
+    if any(ch.isdigit() for ch in msg):
+        return None
+    if any(w in msg for w in AVAILABILITY_WORDS) and parse_date_range(msg):
+        return None
+    return static_intent(msg)
+
+
+def available_rooms_reply(db):
+    rooms = db.query(Room).filter(Room.is_available == True).all()
+    if not rooms:
+        return "❌ No rooms are currently available."
+    room_list = ", ".join(str(r.room_number) for r in rooms)
+    return f"✅ Available rooms: {room_list}"
 
 
 def receptionist_agent(session_id: str, message: str):
     msg = (message or "").lower().strip()
     db = SessionLocal()
     try:
+        room_no = extract_room_number(message, property_rooms(db))
+
+        # date-ranged availability ("free from the 12th to the 15th", "next weekend")
+        if any(w in msg for w in AVAILABILITY_WORDS):
+            stay = parse_date_range(msg)
+            if stay:
+                return date_range_reply(db, msg, room_no, stay)
+
         # specific room query first
-        room_no = extract_room_number(message or "")
         if room_no:
             room = db.query(Room).filter(Room.room_number == room_no).first()
             if not room:
                 return "❌ That room does not exist."
             return f"✅ Room **{room_no}** is {'available' if room.is_available else 'occupied'}."
 
-        # check-in / check-out
-        if "check in" in msg or "check-in" in msg:
-            return f"🕑 Check-in time is **{CHECK_IN_TIME}**."
-        if "check out" in msg or "check-out" in msg:
-            return f"🕚 Check-out time is **{CHECK_OUT_TIME}**."
-
-        # facilities queries
-        for facility, info in FACILITIES_INFO.items():
-            if facility in msg:
-                return info
-        if "facilities" in msg or "facility" in msg:
-            return (
-                "🏨 **Our facilities include:**\n"
-                "• Gym\n"
-                "• Spa\n"
-                "• Swimming Pool\n\n"
-                "Ask about any of them (e.g., 'gym')."
-            )
-
-        # room availability (all)
-        if "room availability" in msg or "available room" in msg or "room available" in msg:
-            rooms = db.query(Room).filter(Room.is_available == True).all()
-            if not rooms:
-                return "❌ No rooms are currently available."
-            room_list = ", ".join(str(r.room_number) for r in rooms)
-            return f"✅ Available rooms: {room_list}"
-
-        return (
-            "I can help with:\n"
-            "• Check-in / Check-out\n"
-            "• Facilities\n"
-            "• Room availability\n"
-            "You can ask a specific room number (e.g. 'Is room 101 available?')."
-        )
+        # check-in / check-out, facilities, room availability (all), help
+        intent = static_intent(msg)
+        if intent == "room_availability":
+            return available_rooms_reply(db)
+        return STATIC_REPLIES[intent]
     finally:
         db.close()
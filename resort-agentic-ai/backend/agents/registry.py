@@ -0,0 +1,172 @@
+# backend/agents/registry.py
+"""
+Agent registry: department name -> handler, each behind its own bulkhead.
+
+Both routers dispatch through `dispatch(name, session_id, message)`. Every
+agent runs on its own bounded thread pool with a queue limit and a timeout,
+so a slow restaurant DB write or a stuck call can't starve receptionist
+answers. When an agent is saturated, or a queued call times out before it
+started (it is cancelled), the guest gets the agent's fallback reply. A call
+that times out while running keeps running in that agent's pool and may
+still write, so the guest gets `timeout_reply` instead, which must not
+invite a retry for agents that place orders or requests.
+
+Limits can be overridden per agent with AGENT_<NAME>_<LIMIT> environment
+variables, e.g. AGENT_RESTAURANT_TIMEOUT=5.
+"""
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Callable
+
+from backend.agents.receptionist import receptionist_agent
+from backend.agents.restaurant import restaurant_agent
+from backend.agents.room_service import room_service_agent
+
+
+@dataclass
+class AgentSpec:
+    name: str
+    handler: Callable
+    max_concurrent: int = 4
+    max_queue: int = 16
+    timeout: float = 10.0
+    fallback: str = "Sorry, that desk is busy right now. Please try again in a moment."
+    timeout_reply: str = None           # handler started but is slow (default: fallback)
+
+    def with_env_overrides(self):
+        prefix = f"AGENT_{self.name.upper()}_"
+        for field, cast in (("max_concurrent", int), ("max_queue", int), ("timeout", float)):
+            raw = os.getenv(prefix + field.upper())
+            if raw is not None:
+                setattr(self, field, cast(raw))
+        return self
+
+
+class Bulkhead:
+    def __init__(self, spec: AgentSpec):
+        self.spec = spec
+        self._executor = ThreadPoolExecutor(
+            max_workers=spec.max_concurrent, thread_name_prefix=f"agent-{spec.name}"
+        )
+        self._capacity = threading.BoundedSemaphore(spec.max_concurrent + spec.max_queue)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._counters = dict.fromkeys(
+            ("calls", "completed", "errors", "timeouts", "rejected"), 0
+        )
+
+    def _count(self, key, delta=1):
+        with self._lock:
+            self._counters[key] += delta
+
+    def _run(self, session_id, message):
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return self.spec.handler(session_id, message)
+        finally:
+            with self._lock:
+                self._running -= 1
+            self._capacity.release()
+
+    def call(self, session_id: str, message: str):
+        self._count("calls")
+        if not self._capacity.acquire(blocking=False):
+            self._count("rejected")
+            return self.spec.fallback
+
+        with self._lock:
+            self._queued += 1
+        # carry request context (e.g. contextvars) into the agent's thread
+        ctx = contextvars.copy_context()
+        future = self._executor.submit(ctx.run, self._run, session_id, message)
+        try:
+            reply = future.result(timeout=self.spec.timeout)
+        except FutureTimeout:
+            self._count("timeouts")
+            if future.cancel():
+                # still queued: it will never run, so nothing was written
+                with self._lock:
+                    self._queued -= 1
+                self._capacity.release()
+                return self.spec.fallback
+            return self.spec.timeout_reply or self.spec.fallback
+        except Exception:
+            self._count("errors")
+            raise
+        self._count("completed")
+        return reply
+
+    def stats(self) -> dict:
+        with self._lock:
+            capacity = self.spec.max_concurrent + self.spec.max_queue
+            return {
+                **self._counters,
+                "running": self._running,
+                "queue_depth": self._queued,
+                "saturation": round((self._running + self._queued) / capacity, 3),
+                "max_concurrent": self.spec.max_concurrent,
+                "max_queue": self.spec.max_queue,
+                "timeout": self.spec.timeout
+            }
+
+    def fallback_replies(self) -> tuple:
+        """Replies that don't come from the handler."""
+        return (self.spec.fallback, self.spec.timeout_reply or self.spec.fallback)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+AGENTS = {}
+
+
+def register_agent(name: str, handler: Callable, **limits) -> Bulkhead:
+    """Register (or replace) the handler for a department."""
+    spec = AgentSpec(name, handler, **limits).with_env_overrides()
+    previous = AGENTS.get(name)
+    AGENTS[name] = Bulkhead(spec)
+    if previous is not None:
+        previous.shutdown()
+    return AGENTS[name]
+
+
+def dispatch(name: str, session_id: str, message: str):
+    return AGENTS[name].call(session_id, message)
+
+
+def agent_stats() -> dict:
+    return {name: bulkhead.stats() for name, bulkhead in AGENTS.items()}
+
+
+# ===============================
+# Built-in departments
+# ===============================
+register_agent(
+    "receptionist", receptionist_agent,
+    max_concurrent=4, timeout=5.0,
+    fallback="🏨 Reception is busy right now. Please try again in a moment."
+)
+register_agent(
+    "restaurant", restaurant_agent,
+    max_concurrent=4, timeout=10.0,
+    fallback="🍽️ The restaurant is busy right now. Please try again in a moment.",
+    timeout_reply=(
+        "⏳ The restaurant is still processing your last message and your order "
+        "may already be placed. Please don't resend it."
+    )
+)
+register_agent(
+    "room_service", room_service_agent,
+    max_concurrent=2, timeout=10.0,
+    fallback="🧹 Room service is busy right now. Please try again in a moment.",
+    timeout_reply=(
+        "⏳ Room service is still processing your request and it may already be "
+        "recorded. Please don't resend it."
+    )
+)
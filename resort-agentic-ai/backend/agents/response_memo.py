@@ -0,0 +1,187 @@
+# backend/agents/response_memo.py
+"""
+Memoized answers for stateless questions, checked by the router first.
+
+Check-in/out times, facility hours, the help text and the router's
+fallback prompt depend only on the question. Once the router has seen a
+message route to one of them (keyword tier, no order in progress), the
+normalized text is remembered with its intent and later turns get the
+pre-rendered reply straight from the table: no cascade, no agent thread,
+no DB session.
+
+Answers read from the database (the available-rooms list, the menu) are
+memoized per property and tagged with the data version of the tables they
+read. Versions are bumped after every commit that touches those tables,
+so the next turn re-renders the answer through the agent. The property's
+cached menu is dropped first (`backend.properties`), so that re-render
+reads the new rows. The version also includes the shard's shared data
+versions (`backend.data_versions`), so writes by other workers or raw SQL
+expire an answer too, within a second.
+
+Environment: RESPONSE_MEMO (1 = on), RESPONSE_MEMO_MAX_MESSAGES (10000).
+"""
+import os
+import threading
+from collections import OrderedDict, defaultdict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.agents.receptionist import memo_intent
+from backend.data_versions import SHARED_VERSIONS
+from backend.database import current_property
+from backend.models.menu import MenuItem
+from backend.models.room import Room
+
+MAX_MESSAGES = int(os.getenv("RESPONSE_MEMO_MAX_MESSAGES", 10000))
+
+# DB-backed intents: (agent, tables read by the answer)
+DATA_INTENTS = {
+    "room_availability": ("receptionist", (Room.__tablename__,)),
+    "menu": ("restaurant", (MenuItem.__tablename__,))
+}
+WATCHED_TABLES = {table for _, tables in DATA_INTENTS.values() for table in tables}
+
+
+# ===============================
+# Data versions (per property and table)
+# ===============================
+_VERSIONS = defaultdict(int)        # (property_id, table) -> commits seen
+_VERSIONS_LOCK = threading.Lock()
+
+
+def data_version(tables, property_id: str = None) -> tuple:
+    property_id = property_id or current_property()
+    local = tuple(_VERSIONS[(property_id, table)] for table in tables)
+    return local + SHARED_VERSIONS.get(property_id, tables)
+
+
+def bump_data_version(table: str, property_id: str = None):
+    with _VERSIONS_LOCK:
+        _VERSIONS[(property_id or current_property(), table)] += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _note_watched_writes(session, flush_context):
+    touched = {
+        obj.__tablename__
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if getattr(obj, "__tablename__", None) in WATCHED_TABLES
+    }
+    if touched:
+        session.info.setdefault("memo_tables", set()).update(touched)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_versions(session):
+    # after the commit: an answer rendered from the old rows carries the old version
+    for table in session.info.pop("memo_tables", ()):
+        bump_data_version(table, getattr(session, "property_id", None))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session):
+    session.info.pop("memo_tables", None)
+
+
+class ResponseMemo:
+    def __init__(self, static_replies: dict, max_messages: int = MAX_MESSAGES,
+                 enabled: bool = True):
+        self.static_replies = static_replies     # intent -> (agent, reply)
+        self.max_messages = max_messages
+        self.enabled = enabled
+        self._intents = OrderedDict()           # normalized message -> intent, oldest first
+        self._answers = {}                      # (property_id, intent) -> (version, reply)
+        self._full_ms = {}                      # intent -> mean latency without the memo
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ("turns", "hits", "static_hits", "data_hits", "stale", "saved_ms"), 0
+        )
+
+    def lookup(self, msg: str, busy: bool = False):
+        """(intent, agent, reply) for a memoized message, else None."""
+        with self._lock:
+            self._counters["turns"] += 1
+            if busy or not self.enabled:
+                return None
+            intent = self._intents.get(msg)
+            if intent is None:
+                return None
+            if intent in self.static_replies:
+                self._counters["static_hits"] += 1
+                return (intent, *self.static_replies[intent])
+
+            property_id = current_property()
+            agent, tables = DATA_INTENTS[intent]
+            answer = self._answers.get((property_id, intent))
+            if answer is None or answer[0] != data_version(tables, property_id):
+                self._counters["stale"] += 1
+                return None
+            self._counters["data_hits"] += 1
+            return intent, agent, answer[1]
+
+    def hit(self, intent: str, elapsed_ms: float):
+        """Record a served hit and the time it saved against the full path."""
+        with self._lock:
+            self._counters["hits"] += 1
+            self._counters["saved_ms"] += max(self._full_ms.get(intent, elapsed_ms) - elapsed_ms, 0.0)
+
+    def recognize(self, msg: str, agent, tier) -> str:
+        """Intent of a freshly routed message if its reply is memoizable."""
+        if not self.enabled:
+            return None
+        if agent is None:
+            return "fallback"
+        if tier != "keyword":
+            return None
+        if agent == "receptionist":
+            return memo_intent(msg)
+        if agent == "restaurant" and "menu" in msg:
+            return "menu"
+        return None
+
+    def version(self, intent: str):
+        if intent in DATA_INTENTS:
+            return data_version(DATA_INTENTS[intent][1])
+        return None
+
+    def remember(self, msg: str, intent: str, reply: str, version=None,
+                 elapsed_ms: float = None):
+        """
+        Map a message to its intent, given the reply the full path produced
+        (for a DB-backed intent, rendered at data `version`, read before).
+        A static reply that doesn't match the table is not memoized.
+        """
+        if intent in self.static_replies and self.static_replies[intent][1] != reply:
+            return
+        with self._lock:
+            if msg not in self._intents:
+                self._intents[msg] = intent
+                if len(self._intents) > self.max_messages:
+                    self._intents.popitem(last=False)
+            if intent in DATA_INTENTS:
+                self._answers[(current_property(), intent)] = (version, reply)
+            if elapsed_ms is not None:
+                full = self._full_ms.get(intent)
+                self._full_ms[intent] = elapsed_ms if full is None else 0.9 * full + 0.1 * elapsed_ms
+
+    def clear(self):
+        """Forget learned messages (e.g. after the routing model changed)."""
+        with self._lock:
+            self._intents.clear()
+            self._answers.clear()
+            self._full_ms.clear()
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            turns, hits = counters["turns"], counters["hits"]
+            return {
+                **counters,
+                "saved_ms": round(counters["saved_ms"], 1),
+                "hit_share": round(hits / turns, 3) if turns else 0.0,
+                "avg_saved_ms": round(counters["saved_ms"] / hits, 3) if hits else 0.0,
+                "messages": len(self._intents),
+                "full_path_ms": {intent: round(ms, 3) for intent, ms in self._full_ms.items()}
+            }
@@ -1,14 +1,14 @@
 from backend.database import SessionLocal
-from backend.models.menu import MenuItem
 from backend.models.order import Order
-from backend.models.room import Room
+from backend.properties import menu_entry, property_menu, property_rooms
+from backend.utils.session import OrderSession, CartLine, Stage, extract_room_number
 from rapidfuzz import fuzz
 import re
 
 # ===============================
 # In-memory session store
 # ===============================
-SESSION_ORDERS = {}
+SESSION_ORDERS = {}     # session_id -> OrderSession
 
 # ===============================
 # Number words map
@@ -68,7 +68,7 @@ def parse_items_with_qty(msg: str):
 
 
 def find_menu_match(text: str, db, threshold=65):
-    items = db.query(MenuItem).filter(MenuItem.available == True).all()
+    items = property_menu(db)
     best = None
     best_score = 0
 
@@ -81,6 +81,11 @@ def find_menu_match(text: str, db, threshold=65):
     return best
 
 
+def line_item(db, line: CartLine):
+    """Menu entry behind a cart line (from the property's menu cache)."""
+    return menu_entry(db, line.item_id)
+
+
 # ===============================
 # Restaurant Agent
 # ===============================
@@ -93,11 +98,7 @@ def restaurant_agent(session_id: str, message: str):
         # Init session
         # ---------------------------
         if session_id not in SESSION_ORDERS:
-            SESSION_ORDERS[session_id] = {
-                "items": [],
-                "stage": "awaiting_items",
-                "current_index": 0
-            }
+            SESSION_ORDERS[session_id] = OrderSession()
 
         session = SESSION_ORDERS[session_id]
 
@@ -105,7 +106,7 @@ def restaurant_agent(session_id: str, message: str):
         # Show menu
         # ---------------------------
         if "menu" in msg:
-            items = db.query(MenuItem).filter(MenuItem.available == True).all()
+            items = property_menu(db)
             response = "🍽️ **Here is our menu:**\n\n"
             for it in items:
                 response += f"- **{it.item_name}** (₹{it.price})\n  {it.description}\n\n"
@@ -116,34 +117,37 @@ def restaurant_agent(session_id: str, message: str):
         # ---------------------------
         parsed = parse_items_with_qty(msg)
         if parsed:
-            session["items"] = []
+            session.lines = []
             for qty, text in parsed:
                 menu_item = find_menu_match(text, db)
                 if menu_item:
-                    session["items"].append({
-                        "name": menu_item.item_name,
-                        "price": menu_item.price,
-                        "qty": qty
-                    })
+                    session.lines.append(CartLine(menu_item.id, qty))
 
-            if not session["items"]:
+            if not session.lines:
                 return "I couldn't recognize those items. Please check the menu."
 
             # If any item has missing qty → ask sequentially
-            for idx, item in enumerate(session["items"]):
-                if item["qty"] is None:
-                    session["stage"] = "awaiting_quantity"
-                    session["current_index"] = idx
-                    return f"How many **{item['name']}** would you like?"
+            idx = session.next_missing_qty()
+            if idx is not None:
+                session.stage = Stage.AWAITING_QUANTITY
+                session.current_index = idx
+                return f"How many **{line_item(db, session.lines[idx]).item_name}** would you like?"
 
             # All quantities known → ask room
-            session["stage"] = "awaiting_room"
+            session.stage = Stage.AWAITING_ROOM
             return "🛏️ Please tell me your room number to place the order."
 
+        # ---------------------------
+        # Cart items taken off the menu meanwhile
+        # ---------------------------
+        if session.lines and any(line_item(db, line) is None for line in session.lines):
+            SESSION_ORDERS.pop(session_id, None)
+            return "❌ Some items in your order are no longer available. Please check the menu and order again."
+
         # ---------------------------
         # Awaiting quantity
         # ---------------------------
-        if session["stage"] == "awaiting_quantity":
+        if session.stage == Stage.AWAITING_QUANTITY:
             qty = None
             for w, n in NUM_WORDS.items():
                 if re.search(rf"\b{w}\b", msg):
@@ -156,41 +160,38 @@ def restaurant_agent(session_id: str, message: str):
             if not qty or qty < 1:
                 return "Please enter a valid quantity (e.g., 1, 2, two)."
 
-            idx = session["current_index"]
-            session["items"][idx]["qty"] = qty
+            session.lines[session.current_index].qty = qty
 
             # Check for next missing quantity
-            for i, it in enumerate(session["items"]):
-                if it["qty"] is None:
-                    session["current_index"] = i
-                    return f"How many **{it['name']}** would you like?"
+            idx = session.next_missing_qty()
+            if idx is not None:
+                session.current_index = idx
+                return f"How many **{line_item(db, session.lines[idx]).item_name}** would you like?"
 
-            session["stage"] = "awaiting_room"
+            session.stage = Stage.AWAITING_ROOM
             return "🛏️ Please tell me your room number to place the order."
 
         # ---------------------------
         # Awaiting room number
         # ---------------------------
-        if session["stage"] == "awaiting_room":
-            m = re.search(r"\b(10[0-9])\b", msg)
-            if not m:
+        if session.stage == Stage.AWAITING_ROOM:
+            rooms = property_rooms(db)
+            room_number = extract_room_number(msg, rooms)
+            if room_number is None:
                 return "Please provide a valid room number (e.g., 101)."
-
-            room_number = int(m.group(1))
-            room = db.query(Room).filter(
-                Room.room_number == room_number).first()
-            if not room:
+            if room_number not in rooms:
                 return "❌ Invalid room number."
 
-            total = sum(it["price"] * it["qty"] for it in session["items"])
+            lines = [(line_item(db, line), line.qty) for line in session.lines]
+            total = sum(item.price * qty for item, qty in lines)
             item_summary = ", ".join(
-                f"{it['name']} x{it['qty']}" for it in session["items"]
+                f"{item.item_name} x{qty}" for item, qty in lines
             )
 
             order = Order(
                 room_number=room_number,
                 items=item_summary,
-                quantity="; ".join(str(it["qty"]) for it in session["items"]),
+                quantity="; ".join(str(qty) for _, qty in lines),
                 total_amount=total,
                 status="Confirmed"
             )
@@ -206,13 +207,9 @@ def restaurant_agent(session_id: str, message: str):
         # ---------------------------
         item = find_menu_match(msg, db)
         if item:
-            session["items"] = [{
-                "name": item.item_name,
-                "price": item.price,
-                "qty": None
-            }]
-            session["stage"] = "awaiting_quantity"
-            session["current_index"] = 0
+            session.lines = [CartLine(item.id)]
+            session.stage = Stage.AWAITING_QUANTITY
+            session.current_index = 0
             return f"How many **{item.item_name}** would you like?"
 
         return "You can ask for the menu or name an item to order."
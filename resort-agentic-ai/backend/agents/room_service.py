@@ -1,5 +1,21 @@
+import re
+
 from backend.database import SessionLocal
 from backend.models.service_request import ServiceRequest
+from backend.properties import property_rooms
+from backend.utils.session import extract_room_number
+
+PENDING_REQUESTS = {}   # session_id -> request type waiting for the guest's room number
+
+
+def awaiting_room(session_id: str, message: str) -> bool:
+    """The guest is answering our room-number question; any other message drops the request."""
+    if session_id not in PENDING_REQUESTS:
+        return False
+    if re.search(r"\d", message or ""):
+        return True
+    PENDING_REQUESTS.pop(session_id, None)
+    return False
 
 
 def room_service_agent(session_id: str, message: str):
@@ -27,9 +43,22 @@ def room_service_agent(session_id: str, message: str):
     elif "blanket" in msg:
         request_type = "Extra Blanket"
 
+    # answer to "which room?" for an earlier request
+    request_type = request_type or PENDING_REQUESTS.get(session_id)
+
     if request_type:
+        rooms = property_rooms(db)
+        room_number = extract_room_number(msg, rooms)
+        if room_number is None or room_number not in rooms:
+            db.close()
+            PENDING_REQUESTS[session_id] = request_type
+            if room_number is None:
+                return f"🛏️ Which room is the {request_type} request for? Please tell me your room number."
+            return "❌ Invalid room number. Please tell me your room number (e.g., 101)."
+
+        PENDING_REQUESTS.pop(session_id, None)
         request = ServiceRequest(
-            room_number=101,
+            room_number=room_number,
             request_type=request_type,
             status="Pending"
         )
@@ -38,7 +67,7 @@ def room_service_agent(session_id: str, message: str):
         db.commit()
         db.close()
 
-        return f"{request_type} request has been placed successfully."
+        return f"{request_type} request for room {room_number} has been placed successfully."
 
     db.close()
     return "I can help with room cleaning, laundry, towels, toiletries, pillows, or blankets."
@@ -1,20 +1,46 @@
 # backend/agents/router.py
 from rapidfuzz import fuzz
+import json
 import logging
-
-from backend.agents.receptionist import receptionist_agent
-from backend.agents.restaurant import restaurant_agent, SESSION_ORDERS
-from backend.agents.room_service import room_service_agent
+import os
+import threading
+import time
+
+from backend.agents.restaurant import SESSION_ORDERS
+from backend.agents.room_service import PENDING_REQUESTS, awaiting_room
+from backend.agents.registry import AGENTS, dispatch
+from backend.agents.receptionist import STATIC_REPLIES
+from backend.agents.response_memo import ResponseMemo
+from backend.utils.session import Stage
+from backend.admission import ADMISSION
 
 # optional LLM router (fallback only)
 try:
-    from backend.agents.llm_router import llm_router
+    from backend.agents.llm_router import llm_decision
+    from backend.agents.llm_pool import LLM_POOL
     LLM_AVAILABLE = True
 except Exception:
     LLM_AVAILABLE = False
 
+# optional local intent classifier (numpy / scipy)
+try:
+    from backend.agents.intent_classifier import IntentClassifier
+    CLASSIFIER_AVAILABLE = True
+except Exception:
+    CLASSIFIER_AVAILABLE = False
+
 LOG = logging.getLogger("router")
-logging.basicConfig(level=logging.INFO)
+
+DEFAULT_INTENT_MODEL_PATH = os.path.join(os.path.dirname(__file__), "intent_model.npz")
+
+# loaded at startup by load_intent_model(); None = tier disabled
+INTENT_CLASSIFIER = None
+INTENT_THRESHOLD = 0.8
+DEFAULT_INTENT_THRESHOLD = 0.8      # for models trained without a calibrated threshold
+
+# JSONL file that receives (message, agent, tier) decisions for training
+CAPTURE_PATH = os.getenv("ROUTER_CAPTURE_PATH")
+_CAPTURE_LOCK = threading.Lock()
 
 ROOM_SERVICE_KEYWORDS = [
     "room service", "clean", "cleaning", "laundry",
@@ -32,58 +58,173 @@ RESTAURANT_KEYWORDS = [
 RECEPTIONIST_KEYWORDS = [
     "check in", "check-in", "check out", "check-out",
     "gym", "spa", "pool", "facility", "facilities",
-    "room availability", "available room", "room available"
+    "room availability", "available room", "room available",
+    "rooms free", "room free", "free room", "free from", "free between",
+    "free next", "free this", "free on",
+    "vacant", "vacancy", "reservation", "book a room"
 ]
 
+FALLBACK_REPLY = (
+    "Sorry, I didn't understand that clearly.\n"
+    "You can ask about:\n"
+    "• Food & menu 🍽️\n"
+    "• Room service 🧹\n"
+    "• Check-in / facilities 🏨"
+)
+
+RESPONSE_MEMO = ResponseMemo(
+    {
+        **{intent: ("receptionist", reply) for intent, reply in STATIC_REPLIES.items()},
+        "fallback": (None, FALLBACK_REPLY)
+    },
+    enabled=os.getenv("RESPONSE_MEMO", "1") == "1"
+)
+
+
+def load_intent_model(path: str = None, threshold: float = None):
+    """
+    Load the local classifier tier (INTENT_MODEL_PATH / INTENT_THRESHOLD env vars).
+    The threshold defaults to the one calibrated when the model was trained.
+    """
+    global INTENT_CLASSIFIER, INTENT_THRESHOLD
+
+    path = path or os.getenv("INTENT_MODEL_PATH", DEFAULT_INTENT_MODEL_PATH)
+    if threshold is None and os.getenv("INTENT_THRESHOLD"):
+        threshold = float(os.getenv("INTENT_THRESHOLD"))
+
+    if not CLASSIFIER_AVAILABLE or not os.path.exists(path):
+        INTENT_CLASSIFIER = None
+        return None
+
+    model = IntentClassifier.load(path)
+    if threshold is None:
+        threshold = model.threshold if model.threshold is not None else DEFAULT_INTENT_THRESHOLD
+    INTENT_CLASSIFIER, INTENT_THRESHOLD = model, threshold
+    RESPONSE_MEMO.clear()       # learned fallback answers may route differently now
+    LOG.info("Loaded intent model %s (threshold %.2f)", path, INTENT_THRESHOLD)
+    return INTENT_CLASSIFIER
+
+
+def capture_decision(message: str, agent: str, tier: str):
+    if not CAPTURE_PATH:
+        return
+    line = json.dumps({"message": message, "agent": agent, "tier": tier}, ensure_ascii=False)
+    with _CAPTURE_LOCK:
+        with open(CAPTURE_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
 
 def fuzzy_match(words, msg, threshold=75):
     return any(fuzz.partial_ratio(w, msg) >= threshold for w in words)
 
 
+def order_in_progress(session_id: str) -> bool:
+    """The restaurant is waiting for quantities / a room number from this session."""
+    session = SESSION_ORDERS.get(session_id)
+    return session is not None and session.stage in {Stage.AWAITING_QUANTITY, Stage.AWAITING_ROOM}
+
+
+def decide_route(session_id: str, msg: str):
+    """
+    Local routing tiers for a normalized message.
+    Returns: (agent, tier), or (None, None) when no local tier is confident.
+    """
+    # 1️⃣ If there's an active restaurant session, continue only when it's expecting quantities/room
+    if order_in_progress(session_id):
+        return "restaurant", "session"
+
+    # ... or when room service asked for the room number of a request
+    if awaiting_room(session_id, msg):
+        return "room_service", "session"
+
+    # 2️⃣ High-priority room-service interrupts (always allowed)
+    if any(k in msg for k in ROOM_SERVICE_KEYWORDS):
+        return "room_service", "keyword"
+
+    # 3️⃣ Receptionist (check-in/availability/facilities)
+    if any(k in msg for k in RECEPTIONIST_KEYWORDS):
+        return "receptionist", "keyword"
+
+    # 4️⃣ Restaurant (menu / ordering)
+    if any(k in msg for k in RESTAURANT_KEYWORDS):
+        return "restaurant", "keyword"
+
+    # 5️⃣ fuzzy fallbacks (spelling mistakes)
+    if fuzzy_match(ROOM_SERVICE_KEYWORDS, msg):
+        return "room_service", "fuzzy"
+    if fuzzy_match(RECEPTIONIST_KEYWORDS, msg):
+        return "receptionist", "fuzzy"
+    if fuzzy_match(RESTAURANT_KEYWORDS, msg):
+        return "restaurant", "fuzzy"
+
+    # 6️⃣ local classifier (optional, confidence-gated)
+    if INTENT_CLASSIFIER is not None:
+        agent, confidence = INTENT_CLASSIFIER.predict(msg)
+        if confidence >= INTENT_THRESHOLD and agent in AGENTS:
+            return agent, "classifier"
+
+    return None, None
+
+
+def llm_stats() -> dict:
+    """Per-provider latency / error counters of the LLM fallback."""
+    return LLM_POOL.stats() if LLM_AVAILABLE else {}
+
+
 def route_message(session_id: str, message: str):
     msg = (message or "").lower().strip()
-    LOG.info("Routing message: %s", msg)
+    started = time.perf_counter()
+    agent = tier = None
 
     try:
-        # 1️⃣ If there's an active restaurant session, continue only when it's expecting quantities/room
-        if session_id in SESSION_ORDERS:
-            stage = SESSION_ORDERS[session_id].get("stage")
-            if stage in {"awaiting_quantity", "awaiting_room"}:
-                return restaurant_agent(session_id, message)
-
-        # 2️⃣ High-priority room-service interrupts (always allowed)
-        if any(k in msg for k in ROOM_SERVICE_KEYWORDS):
-            return room_service_agent(session_id, message)
-
-        # 3️⃣ Receptionist (check-in/availability/facilities)
-        if any(k in msg for k in RECEPTIONIST_KEYWORDS):
-            return receptionist_agent(session_id, message)
-
-        # 4️⃣ Restaurant (menu / ordering)
-        if any(k in msg for k in RESTAURANT_KEYWORDS):
-            return restaurant_agent(session_id, message)
-
-        # 5️⃣ fuzzy fallbacks (spelling mistakes)
-        if fuzzy_match(ROOM_SERVICE_KEYWORDS, msg):
-            return room_service_agent(session_id, message)
-        if fuzzy_match(RECEPTIONIST_KEYWORDS, msg):
-            return receptionist_agent(session_id, message)
-        if fuzzy_match(RESTAURANT_KEYWORDS, msg):
-            return restaurant_agent(session_id, message)
-
-        # 6️⃣ LLM fallback (optional)
-        if LLM_AVAILABLE:
-            return llm_router(session_id, message)
-
-        # 7️⃣ safe fallback
-        return (
-            "Sorry, I didn't understand that clearly.\n"
-            "You can ask about:\n"
-            "• Food & menu 🍽️\n"
-            "• Room service 🧹\n"
-            "• Check-in / facilities 🏨"
-        )
+        # 0️⃣ memoized stateless answer (not while an order is in progress)
+        busy = order_in_progress(session_id) or session_id in PENDING_REQUESTS
+        hit = RESPONSE_MEMO.lookup(msg, busy)
+        if hit is not None:
+            intent, agent, reply = hit
+            tier = "memo"
+            RESPONSE_MEMO.hit(intent, (time.perf_counter() - started) * 1000)
+            return reply
+
+        agent, tier = decide_route(session_id, msg)
+
+        # 7️⃣ LLM fallback (optional, budgeted: degrades to keyword routing)
+        if agent is None and LLM_AVAILABLE:
+            release = ADMISSION.llm_call()          # held until the first call ends
+            allowed = release is not None
+            agent, answered = llm_decision(message, use_llm=allowed,
+                                           admit=ADMISSION.llm_extra_call, release=release)
+            # keyword guesses when no provider answered: not LLM labels
+            tier = "llm" if answered else "llm_fallback" if allowed else "llm_degraded"
+
+        intent = None if busy else RESPONSE_MEMO.recognize(msg, agent, tier)
+
+        # 8️⃣ safe fallback
+        if agent is None:
+            if intent:
+                RESPONSE_MEMO.remember(msg, intent, FALLBACK_REPLY,
+                                       elapsed_ms=(time.perf_counter() - started) * 1000)
+            return FALLBACK_REPLY
+
+        capture_decision(message, agent, tier)
+        version = RESPONSE_MEMO.version(intent)
+        reply = dispatch(agent, session_id, message)
+        if intent and reply not in AGENTS[agent].fallback_replies():
+            RESPONSE_MEMO.remember(msg, intent, reply, version,
+                                   elapsed_ms=(time.perf_counter() - started) * 1000)
+        return reply
 
     except Exception:
-        LOG.exception("Router error")
+        LOG.exception("Router error", extra={"session": session_id, "agent": agent, "tier": tier})
         return "Backend error. Please try again."
+
+    finally:
+        # one structured record per turn; sampled unless slow (see logging_setup)
+        LOG.info("Routed message", extra={
+            "session": session_id,
+            "agent": agent,
+            "tier": tier or "fallback",
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            "text": msg[:200],
+            "routine": True
+        })
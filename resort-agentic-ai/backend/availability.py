@@ -0,0 +1,203 @@
+# backend/availability.py
+"""
+In-memory availability engine for date-ranged reservations.
+
+Each room keeps its reservations as two parallel sorted arrays of day
+ordinals (check-in, check-out). Stays of one room never overlap, so both
+arrays are sorted and "is the room free for [start, end)" is one bisect:
+only the last stay starting before `end` can overlap.
+
+Whole-hotel questions ("how many rooms are free next weekend") use a second,
+global view: every stay in NumPy arrays sorted by check-in. A stay can only
+overlap [start, end) if it begins in (start - longest_stay, end), so one
+searchsorted slice plus a vectorized mask finds the busy rooms.
+
+The index is loaded from the database once and updated by `book` / `cancel`,
+which write the row and the index together. There is one index per property
+(`backend.properties.availability_index()`).
+"""
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+import numpy as np
+
+from backend.models.reservation import Reservation
+from backend.models.room import Room
+
+CANCELLED = "Cancelled"
+
+
+class RoomIntervals:
+    __slots__ = ("starts", "ends")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def is_free(self, start: int, end: int) -> bool:
+        i = bisect_left(self.starts, end)
+        return i == 0 or self.ends[i - 1] <= start
+
+    def add(self, start: int, end: int):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+
+    def remove(self, start: int, end: int):
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.ends[i] == end:
+                del self.starts[i]
+                del self.ends[i]
+                return
+            i += 1
+
+
+class AvailabilityIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rooms = {}
+        self.loaded = False
+        self._set_rooms([])
+        self._starts = np.empty(0, dtype=np.int64)
+        self._ends = np.empty(0, dtype=np.int64)
+        self._slots = np.empty(0, dtype=np.int64)      # index into _room_numbers
+        self._max_nights = 0
+
+    def _set_rooms(self, room_numbers):
+        self._room_numbers = np.array(sorted(room_numbers), dtype=np.int64)
+        self._slot_of = {int(r): i for i, r in enumerate(self._room_numbers)}
+
+    # ---------------------------
+    # Loading
+    # ---------------------------
+    def load_rows(self, room_numbers, stays):
+        """stays: iterable of (room_number, check_in, check_out) as dates."""
+        rooms = {room: RoomIntervals() for room in room_numbers}
+        by_room = {}
+        for room, check_in, check_out in stays:
+            by_room.setdefault(room, []).append((check_in.toordinal(), check_out.toordinal()))
+        for room, intervals in by_room.items():
+            intervals.sort()
+            target = rooms.setdefault(room, RoomIntervals())
+            target.starts = [s for s, _ in intervals]
+            target.ends = [e for _, e in intervals]
+
+        with self._lock:
+            self.rooms = rooms
+            self._set_rooms(rooms)
+            starts = np.fromiter((s for iv in by_room.values() for s, _ in iv), dtype=np.int64)
+            ends = np.fromiter((e for iv in by_room.values() for _, e in iv), dtype=np.int64)
+            slots = np.fromiter(
+                (self._slot_of[room] for room, iv in by_room.items() for _ in iv), dtype=np.int64
+            )
+            order = np.argsort(starts, kind="stable")
+            self._starts, self._ends, self._slots = starts[order], ends[order], slots[order]
+            self._max_nights = int((ends - starts).max()) if len(starts) else 0
+            self.loaded = True
+
+    def load(self, db):
+        rooms = [r for (r,) in db.query(Room.room_number).all()]
+        stays = db.query(
+            Reservation.room_number, Reservation.check_in, Reservation.check_out
+        ).filter(Reservation.status != CANCELLED).all()
+        self.load_rows(rooms, stays)
+
+    def ensure_loaded(self, db):
+        if not self.loaded:
+            self.load(db)
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def is_free(self, room_number: int, check_in: date, check_out: date):
+        """True / False, or None when the room doesn't exist."""
+        intervals = self.rooms.get(room_number)
+        if intervals is None:
+            return None
+        with self._lock:
+            return intervals.is_free(check_in.toordinal(), check_out.toordinal())
+
+    def _busy_mask(self, start: int, end: int):
+        lo = np.searchsorted(self._starts, start - self._max_nights, side="right")
+        hi = np.searchsorted(self._starts, end, side="left")
+        overlapping = self._slots[lo:hi][self._ends[lo:hi] > start]
+        busy = np.zeros(len(self._room_numbers), dtype=bool)
+        busy[overlapping] = True
+        return busy
+
+    def free_rooms(self, check_in: date, check_out: date) -> list:
+        with self._lock:
+            busy = self._busy_mask(check_in.toordinal(), check_out.toordinal())
+            return self._room_numbers[~busy].tolist()
+
+    def count_free(self, check_in: date, check_out: date) -> int:
+        with self._lock:
+            busy = self._busy_mask(check_in.toordinal(), check_out.toordinal())
+            return int(len(busy) - busy.sum())
+
+    # ---------------------------
+    # Writes (DB row + index together)
+    # ---------------------------
+    def book(self, db, room_number: int, check_in: date, check_out: date, guest_name: str = None):
+        if check_out <= check_in:
+            raise ValueError("Check-out must be after check-in.")
+        self.ensure_loaded(db)
+
+        with self._lock:
+            intervals = self.rooms.get(room_number)
+            if intervals is None:
+                raise ValueError(f"Room {room_number} does not exist.")
+            start, end = check_in.toordinal(), check_out.toordinal()
+            if not intervals.is_free(start, end):
+                raise ValueError(f"Room {room_number} is not free for those dates.")
+
+            reservation = Reservation(
+                room_number=room_number,
+                guest_name=guest_name,
+                check_in=check_in,
+                check_out=check_out,
+                status="Booked"
+            )
+            db.add(reservation)
+            db.commit()
+            intervals.add(start, end)
+            self._insert_global(self._slot_of[room_number], start, end)
+        return reservation
+
+    def cancel(self, db, reservation_id: int):
+        self.ensure_loaded(db)
+        with self._lock:
+            reservation = db.get(Reservation, reservation_id)
+            if reservation is None or reservation.status == CANCELLED:
+                return None
+            reservation.status = CANCELLED
+            db.commit()
+            intervals = self.rooms.get(reservation.room_number)
+            if intervals is not None:
+                start, end = reservation.check_in.toordinal(), reservation.check_out.toordinal()
+                intervals.remove(start, end)
+                self._remove_global(self._slot_of[reservation.room_number], start, end)
+        return reservation
+
+    # ---------------------------
+    # Global arrays (caller holds the lock)
+    # ---------------------------
+    def _insert_global(self, slot: int, start: int, end: int):
+        i = np.searchsorted(self._starts, start, side="right")
+        self._starts = np.insert(self._starts, i, start)
+        self._ends = np.insert(self._ends, i, end)
+        self._slots = np.insert(self._slots, i, slot)
+        self._max_nights = max(self._max_nights, end - start)
+
+    def _remove_global(self, slot: int, start: int, end: int):
+        lo = np.searchsorted(self._starts, start, side="left")
+        hi = np.searchsorted(self._starts, start, side="right")
+        for i in range(lo, hi):
+            if self._slots[i] == slot and self._ends[i] == end:
+                self._starts = np.delete(self._starts, i)
+                self._ends = np.delete(self._ends, i)
+                self._slots = np.delete(self._slots, i)
+                return
+
@@ -0,0 +1,92 @@
+"""
+Range availability queries on the in-memory interval index.
+
+Generates back-to-back random stays for every room over several years and
+compares one-room and whole-hotel queries against a linear scan.
+
+    python -m backend.benchmarks.bench_availability --rooms 3000 --years 3
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from backend.availability import AvailabilityIndex
+
+
+def generate(rooms, years, seed=0):
+    rnd = random.Random(seed)
+    start = date(2024, 1, 1)
+    horizon = start + timedelta(days=365 * years)
+    stays = []
+    for room in rooms:
+        day = start + timedelta(days=rnd.randint(0, 3))
+        while day < horizon:
+            nights = rnd.randint(1, 7)
+            stays.append((room, day, day + timedelta(days=nights)))
+            day += timedelta(days=nights + rnd.randint(0, 4))
+    return start, horizon, stays
+
+
+def queries(n, start, horizon, seed=1):
+    rnd = random.Random(seed)
+    span = (horizon - start).days - 14
+    out = []
+    for _ in range(n):
+        check_in = start + timedelta(days=rnd.randrange(span))
+        out.append((check_in, check_in + timedelta(days=rnd.randint(1, 7))))
+    return out
+
+
+def per_call_us(fn, args):
+    t0 = time.perf_counter()
+    for a in args:
+        fn(*a)
+    return (time.perf_counter() - t0) / len(args) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=3000)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    rooms = list(range(1, args.rooms + 1))
+    start, horizon, stays = generate(rooms, args.years)
+
+    t0 = time.perf_counter()
+    index = AvailabilityIndex()
+    index.load_rows(rooms, stays)
+    print(f"{len(rooms):,} rooms, {len(stays):,} reservations; "
+          f"index built in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    by_room = {}
+    for room, check_in, check_out in stays:
+        by_room.setdefault(room, []).append((check_in, check_out))
+
+    def scan_is_free(room, check_in, check_out):
+        return all(e <= check_in or s >= check_out for s, e in by_room.get(room, ()))
+
+    rnd = random.Random(2)
+    ranges = queries(args.queries, start, horizon)
+    one_room = [(rnd.choice(rooms), ci, co) for ci, co in ranges]
+
+    for room, ci, co in one_room[:200]:
+        assert index.is_free(room, ci, co) == scan_is_free(room, ci, co)
+
+    print(f"one room, index:       {per_call_us(index.is_free, one_room):10.2f} us")
+    print(f"one room, linear scan: {per_call_us(scan_is_free, one_room[:200]):10.2f} us")
+
+    hotel = ranges[:500]
+    for ci, co in hotel[:5]:
+        assert index.free_rooms(ci, co) == [r for r in rooms if scan_is_free(r, ci, co)]
+
+    print(f"count free, index:     {per_call_us(index.count_free, hotel) / 1000:10.3f} ms")
+    print(f"list free, index:      {per_call_us(index.free_rooms, hotel) / 1000:10.3f} ms")
+    print(f"all rooms, linear scan:"
+          f"{per_call_us(lambda ci, co: [r for r in rooms if scan_is_free(r, ci, co)], hotel[:5]) / 1000:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
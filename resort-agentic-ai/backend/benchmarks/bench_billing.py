@@ -0,0 +1,110 @@
+"""
+Checkout bill lookup: scan of `orders` vs the `room_bills` rollup.
+
+    python -m backend.benchmarks.bench_billing --orders 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.billing import get_room_bill, rebuild_rollups
+
+SCAN_SQL = text(
+    "SELECT COALESCE(SUM(total_amount), 0), COUNT(*) FROM orders "
+    "WHERE room_number = :room AND status NOT IN ('Paid', 'Cancelled')"
+)
+
+
+def seed(engine, n_orders, n_rooms):
+    rnd = random.Random(42)
+    start = datetime(2025, 1, 1)
+    statuses = ["Confirmed", "Served", "Paid", "Paid", "Paid"]
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        batch = []
+        for i in range(n_orders):
+            qty = rnd.randint(1, 3)
+            batch.append((
+                101 + rnd.randrange(n_rooms),
+                f"Plain Idli x{qty}",
+                str(qty),
+                80.0 * qty,
+                rnd.choice(statuses),
+                str(start + timedelta(minutes=i))
+            ))
+            if len(batch) == 50000:
+                cur.executemany(
+                    "INSERT INTO orders (room_number, items, quantity, total_amount, status, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", batch)
+                batch = []
+        if batch:
+            cur.executemany(
+                "INSERT INTO orders (room_number, items, quantity, total_amount, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", batch)
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def timed(fn, rooms):
+    t0 = time.perf_counter()
+    for room in rooms:
+        fn(room)
+    return (time.perf_counter() - t0) / len(rooms) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+
+        t0 = time.perf_counter()
+        seed(engine, args.orders, args.rooms)
+        print(f"seeded {args.orders:,} orders in {time.perf_counter() - t0:.1f}s")
+
+        t0 = time.perf_counter()
+        rebuild_rollups(db)
+        print(f"rebuild_rollups: {time.perf_counter() - t0:.1f}s")
+
+        rnd = random.Random(7)
+        rooms = [101 + rnd.randrange(args.rooms) for _ in range(args.lookups)]
+
+        scan_ms = timed(lambda r: db.execute(SCAN_SQL, {"room": r}).one(), rooms)
+
+        def rollup_lookup(room):
+            db.expunge_all()    # no identity-map hits, like a fresh request session
+            return get_room_bill(db, room)
+
+        rollup_ms = timed(rollup_lookup, rooms)
+
+        # both paths must agree
+        for room in rooms[:20]:
+            total, count = db.execute(SCAN_SQL, {"room": room}).one()
+            bill = get_room_bill(db, room)
+            assert bill["open_orders"] == count and abs(bill["open_total"] - total) < 0.01
+
+        print(f"bill lookup (scan of orders): {scan_ms:8.3f} ms")
+        print(f"bill lookup (room_bills):     {rollup_ms:8.3f} ms")
+        print(f"speedup: {scan_ms / rollup_ms:.0f}x")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Receptionist latency while the restaurant path is artificially slowed.
+
+A flood of clients hammers a restaurant handler that sleeps --slow-ms per
+call while a probe measures receptionist answers. Compared with one shared
+pool (how all agents ran before bulkheads) and with per-agent bulkheads.
+
+    python -m backend.benchmarks.bench_bulkheads
+"""
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.agents import registry
+from backend.agents.receptionist import receptionist_agent
+from backend.agents.registry import register_agent, dispatch, agent_stats
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run(call, flood_clients, probes, think_s=0.005):
+    stop = threading.Event()
+
+    def flood():
+        # clients pause briefly between messages, including after a shed reply
+        while not stop.is_set():
+            call("restaurant", "flood", "two dosa")
+            time.sleep(think_s)
+
+    threads = [threading.Thread(target=flood, daemon=True) for _ in range(flood_clients)]
+    for t in threads:
+        t.start()
+    time.sleep(0.3)
+
+    latencies = []
+    for _ in range(probes):
+        t0 = time.perf_counter()
+        call("receptionist", "probe", "what is the check in time?")
+        latencies.append((time.perf_counter() - t0) * 1000)
+        time.sleep(0.01)
+
+    stop.set()
+    for t in threads:
+        t.join()
+    return latencies
+
+
+def report(label, latencies):
+    print(f"{label:28} p50 {statistics.median(latencies):8.2f} ms   "
+          f"p99 {percentile(latencies, 0.99):8.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slow-ms", type=float, default=100.0)
+    parser.add_argument("--flood", type=int, default=32, help="concurrent restaurant clients")
+    parser.add_argument("--probes", type=int, default=50)
+    parser.add_argument("--shared-workers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    def slow_restaurant(session_id, message):
+        time.sleep(args.slow_ms / 1000)
+        return "ok"
+
+    handlers = {"restaurant": slow_restaurant, "receptionist": receptionist_agent}
+
+    # quiet baseline
+    report("receptionist, idle", run(lambda n, s, m: handlers[n](s, m), 0, args.probes))
+
+    # before: every agent on one shared pool
+    shared = ThreadPoolExecutor(max_workers=args.shared_workers)
+    report("shared pool, slow restaurant",
+           run(lambda n, s, m: shared.submit(handlers[n], s, m).result(), args.flood, args.probes))
+    shared.shutdown()
+
+    # after: per-agent bulkheads
+    original = registry.AGENTS["restaurant"].spec
+    register_agent("restaurant", slow_restaurant, max_concurrent=4, max_queue=16,
+                   timeout=original.timeout, fallback=original.fallback)
+    try:
+        report("bulkheads, slow restaurant", run(dispatch, args.flood, args.probes))
+        stats = agent_stats()["restaurant"]
+        print(f"restaurant bulkhead: {stats['completed']} served, {stats['rejected']} shed, "
+              f"{stats['timeouts']} timed out")
+    finally:
+        register_agent("restaurant", original.handler, max_concurrent=original.max_concurrent,
+                       max_queue=original.max_queue, timeout=original.timeout,
+                       fallback=original.fallback)
+
+
+if __name__ == "__main__":
+    main()
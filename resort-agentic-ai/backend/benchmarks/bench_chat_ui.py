@@ -0,0 +1,129 @@
+"""
+Chat UI render time per turn in a long conversation: the old client that
+re-renders the whole history on every rerun vs ui/chat_ui.py with its
+bounded window. Both talk to a local stub backend, so the numbers are the
+Streamlit script run (render + one /chat round trip).
+
+    python -m backend.benchmarks.bench_chat_ui --messages 500 --turns 20 2>/dev/null
+
+(AppTest logs harmless "missing ScriptRunContext" warnings to stderr.)
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from streamlit.testing.v1 import AppTest
+
+UI_SCRIPT = os.path.join(os.path.dirname(__file__), "..", "..", "ui", "chat_ui.py")
+
+REPLY = (
+    "🍽️ **Here is our menu:**\n\n"
+    + "".join(f"- **Dish {i}** (₹{100 + i})\n  Freshly made, served hot\n\n" for i in range(10))
+)
+
+# the client before the bounded window: full history in session_state,
+# re-rendered on every rerun, a new connection per message
+LEGACY_SCRIPT = """
+import requests
+import streamlit as st
+
+API_URL = "{api_url}"
+
+for role, msg in st.session_state.chat_history:
+    with st.chat_message(role):
+        st.markdown(msg)
+
+user_input = st.chat_input("Type your message...")
+if user_input:
+    st.session_state.chat_history.append(("user", user_input))
+    with st.chat_message("user"):
+        st.markdown(user_input)
+    response = requests.post(API_URL, json={{"session_id": st.session_state.session_id, "message": user_input}})
+    bot_reply = response.json().get("response", "Sorry, something went wrong.")
+    st.session_state.chat_history.append(("assistant", bot_reply))
+    with st.chat_message("assistant"):
+        st.markdown(bot_reply)
+"""
+
+
+class StubBackend(BaseHTTPRequestHandler):
+    seq = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        StubBackend.seq += 2
+        self._send({"response": REPLY, "seq": StubBackend.seq})
+
+    def do_GET(self):
+        self._send({"messages": [], "has_more": False})
+
+    def _send(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def conversation(n):
+    return [
+        ("user", f"message {i}") if i % 2 == 0 else ("assistant", REPLY)
+        for i in range(n)
+    ]
+
+
+def time_turns(app, turns):
+    app.run()
+    times = []
+    for i in range(turns):
+        app.chat_input[0].set_value(f"turn {i}")
+        t0 = time.perf_counter()
+        app.run(timeout=30)
+        times.append((time.perf_counter() - t0) * 1000)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubBackend)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_base = f"http://127.0.0.1:{server.server_port}"
+    history = conversation(args.messages)
+
+    legacy = AppTest.from_string(LEGACY_SCRIPT.format(api_url=f"{api_base}/chat"))
+    legacy.session_state.session_id = "bench"
+    legacy.session_state.chat_history = list(history)
+    legacy_ms = time_turns(legacy, args.turns)
+
+    os.environ["RESORT_API_URL"] = api_base
+    lean = AppTest.from_file(UI_SCRIPT)
+    lean.session_state.session_id = "bench"
+    StubBackend.seq = args.messages - 1
+    lean.session_state.messages = [(seq, role, text) for seq, (role, text) in enumerate(history)]
+    lean.session_state.window = 40
+    lean.session_state.history_start = 0
+    lean_ms = time_turns(lean, args.turns)
+    rendered = len(lean.chat_message)
+
+    server.shutdown()
+    print(f"{args.messages}-message conversation, {args.turns} turns")
+    print(f"full re-render:  median {statistics.median(legacy_ms):7.1f} ms/turn  "
+          f"(last turn {legacy_ms[-1]:.1f} ms, {len(legacy.chat_message)} messages rendered)")
+    print(f"bounded window:  median {statistics.median(lean_ms):7.1f} ms/turn  "
+          f"(last turn {lean_ms[-1]:.1f} ms, {rendered} messages rendered)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Streaming export: peak RSS and rows/s per format, against loading the whole
+table with pandas (how finance pulled order history before).
+
+    python -m backend.benchmarks.bench_export --orders 5000000
+
+Each export runs in a fresh child process so its peak RSS is its own.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.benchmarks.bench_billing import seed
+from backend.export import export_stream, DEFAULT_CHUNK_SIZE, PARQUET_AVAILABLE
+
+CASES = [
+    ("csv", False),
+    ("csv", True),
+    ("ndjson", False),
+    ("ndjson", True),
+    ("parquet", False)
+]
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024     # KiB on Linux
+
+
+def run_export(path, fmt, gzip, chunk_size):
+    engine = create_engine(f"sqlite:///{path}")
+    db = sessionmaker(bind=engine)()
+    t0 = time.perf_counter()
+    size = 0
+    for chunk in export_stream(db, "orders", fmt, chunk_size=chunk_size, gzip=gzip).chunks:
+        size += len(chunk)      # stands in for the socket
+    elapsed = time.perf_counter() - t0
+    db.close()
+    return {"seconds": elapsed, "bytes": size, "peak_rss_mb": peak_rss_mb()}
+
+
+def run_pandas(path):
+    import pandas as pd
+
+    engine = create_engine(f"sqlite:///{path}")
+    t0 = time.perf_counter()
+    df = pd.read_sql("SELECT * FROM orders", engine)
+    size = len(df.to_csv(index=False).encode("utf-8"))
+    return {"seconds": time.perf_counter() - t0, "bytes": size, "peak_rss_mb": peak_rss_mb()}
+
+
+def in_child(*args):
+    out = subprocess.run(
+        [sys.executable, "-m", "backend.benchmarks.bench_export", "--child", *args],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def report(label, rows, result):
+    print(
+        f"{label:<16} {rows / result['seconds']:>12,.0f} rows/s "
+        f"{result['seconds']:>7.1f} s {result['bytes'] / 2**20:>9.1f} MiB "
+        f"peak RSS {result['peak_rss_mb']:>7.1f} MiB"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=5_000_000)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--skip-pandas", action="store_true",
+                        help="skip the load-everything baseline (needs several GiB at 5M rows)")
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        path, fmt, *rest = args.child
+        if fmt == "pandas":
+            result = run_pandas(path)
+        else:
+            result = run_export(path, fmt, rest == ["gzip"], args.chunk_size)
+        print(json.dumps(result))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        t0 = time.perf_counter()
+        seed(engine, args.orders, 500)
+        engine.dispose()
+        print(f"seeded {args.orders:,} orders in {time.perf_counter() - t0:.1f}s "
+              f"({os.path.getsize(path) / 2**20:.0f} MiB)")
+
+        for fmt, gzip in CASES:
+            if fmt == "parquet" and not PARQUET_AVAILABLE:
+                print("parquet          skipped (pyarrow not installed)")
+                continue
+            extra = ["gzip"] if gzip else []
+            result = in_child(path, fmt, *extra, "--chunk-size", str(args.chunk_size))
+            report(fmt + (" + gzip" if gzip else ""), args.orders, result)
+
+        if not args.skip_pandas:
+            report("pandas read_sql", args.orders, in_child(path, "pandas"))
+
+
+if __name__ == "__main__":
+    main()
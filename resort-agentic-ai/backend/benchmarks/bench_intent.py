@@ -0,0 +1,172 @@
+"""
+Routing with and without the local intent classifier tier.
+
+Trains on a synthetic corpus of guest phrasings (many without any router
+keyword), then routes messages from held-out templates (phrasings never
+seen in training) through `decide_route`. Messages no local tier is
+confident about go to a simulated LLM that costs --llm-ms and answers
+wrongly --llm-error of the time. The classifier's own precision on the
+messages it answers is reported separately.
+
+As in train_intent, the confidence threshold is calibrated on templates
+held out from training (a third set, not the test one): the lowest at
+which the classifier is at least as precise as the LLM path.
+
+    python -m backend.benchmarks.bench_intent
+"""
+import argparse
+import logging
+import random
+import statistics
+import time
+
+from backend.agents import router
+from backend.agents.intent_classifier import IntentClassifier
+
+TEMPLATES = {
+    "restaurant": [
+        "i am {adj} hungry", "i'm starving", "can i get something to {eat}",
+        "what do you serve for {meal}", "bring me {n} {dish} please",
+        "i would like some {dish}", "do you have {dish}", "what's cooking today",
+        "send {dish} to my room", "how much is the {dish}", "get me a coffee",
+        "i want a snack", "anything vegetarian to {eat}", "what can i have for {meal}",
+        "i fancy some {dish}", "is the kitchen open", "can you get me some tea",
+    ],
+    "room_service": [
+        "please tidy my room", "my room is a mess", "need fresh sheets",
+        "can someone make the bed", "the bathroom needs a wipe", "bring an extra {thing}",
+        "i need more {thing}", "send housekeeping", "we ran out of {thing}",
+        "my clothes need washing", "could you vacuum the room", "change the bedsheets please",
+        "the bin is full", "can i get a {thing}", "need an iron for my shirt",
+    ],
+    "receptionist": [
+        "what time can we arrive", "when do we have to leave", "is there a {place}",
+        "what time does the {place} open", "can i extend my stay", "is there wifi",
+        "where is the {place}", "do you have parking", "can i book a taxi",
+        "what is your address", "how far is the beach", "are pets allowed",
+        "can i get a late departure", "when does reception close", "is breakfast included in my stay",
+    ],
+}
+
+FILLERS = {
+    "adj": ["so", "really", "very", "quite", "super"],
+    "eat": ["eat", "munch", "nibble", "have"],
+    "meal": ["breakfast", "lunch", "dinner", "supper", "brunch"],
+    "n": ["one", "two", "3", "a couple of"],
+    "dish": ["idli", "dosa", "sandwich", "pasta", "soup", "fries", "omelette", "salad", "biryani"],
+    "thing": ["towel", "pillow", "blanket", "soap", "shampoo", "hanger", "toilet paper"],
+    "place": ["gym", "spa", "pool", "sauna", "business center", "kids club", "lounge"],
+}
+
+
+def typo(text, rnd):
+    if len(text) < 6 or rnd.random() < 0.6:
+        return text
+    i = rnd.randrange(1, len(text) - 1)
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def split_templates(every=4, templates=TEMPLATES):
+    """Every `every`-th template of each department is held out for testing."""
+    train, test = {}, {}
+    for label, phrasings in templates.items():
+        test[label] = phrasings[every - 1::every]
+        train[label] = [t for t in phrasings if t not in test[label]]
+    return train, test
+
+
+def corpus(templates, n, seed):
+    rnd = random.Random(seed)
+    out = []
+    labels = list(templates)
+    for _ in range(n):
+        label = rnd.choice(labels)
+        text = rnd.choice(templates[label])
+        for key, values in FILLERS.items():
+            text = text.replace("{" + key + "}", rnd.choice(values))
+        out.append((typo(text, rnd), label))
+    return out
+
+
+def run(examples, llm_ms, llm_error, seed=3):
+    rnd = random.Random(seed)
+    correct = llm_calls = classified = classified_correct = 0
+    local = []
+    for i, (message, truth) in enumerate(examples):
+        msg = message.lower().strip()
+        t0 = time.perf_counter()
+        agent, tier = router.decide_route(f"bench-{i}", msg)
+        local.append((time.perf_counter() - t0) * 1000)
+        if agent is None:
+            llm_calls += 1
+            agent = truth
+            if rnd.random() < llm_error:
+                agent = rnd.choice([label for label in TEMPLATES if label != truth])
+        elif tier == "classifier":
+            classified += 1
+            classified_correct += agent == truth
+        correct += agent == truth
+    n = len(examples)
+    local.sort()
+    return {
+        "accuracy": correct / n,
+        "llm_rate": llm_calls / n,
+        "classifier_rate": classified / n,
+        "classifier_precision": classified_correct / classified if classified else float("nan"),
+        "local_mean_ms": statistics.mean(local),
+        "local_p95_ms": local[int(n * 0.95) - 1],
+        "effective_mean_ms": statistics.mean(local) + llm_calls / n * llm_ms,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--train", type=int, default=3000)
+    parser.add_argument("--test", type=int, default=1000)
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="fixed confidence threshold (default: calibrated)")
+    parser.add_argument("--llm-ms", type=float, default=700.0,
+                        help="assumed latency of one LLM routing call")
+    parser.add_argument("--llm-error", type=float, default=0.05,
+                        help="share of simulated LLM routing calls that pick the wrong department")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("router").setLevel(logging.WARNING)
+    train_templates, test_templates = split_templates()
+    fit_templates, calibration_templates = split_templates(3, train_templates)
+    train = corpus(fit_templates, args.train, seed=1)
+    calibration = corpus(calibration_templates, args.test, seed=4)
+    test = corpus(test_templates, args.test, seed=2)
+
+    t0 = time.perf_counter()
+    model = IntentClassifier.train([m for m, _ in train], [l for _, l in train])
+    print(f"trained in {time.perf_counter() - t0:.1f}s, {len(model.vocab)} n-grams")
+
+    threshold = args.threshold
+    if threshold is None:
+        found = model.calibrate([m for m, _ in calibration], [l for _, l in calibration],
+                                1.0 - args.llm_error, min_answered=10)
+        if found is None:
+            threshold = float("inf")
+            print(f"no threshold reaches precision {1.0 - args.llm_error:.2f}: tier answers nothing")
+        else:
+            threshold, precision, coverage = found
+            print(f"calibrated threshold {threshold:.3f} "
+                  f"(precision {precision:.3f}, coverage {coverage:.3f} on calibration templates)")
+
+    previous = router.INTENT_CLASSIFIER, router.INTENT_THRESHOLD
+    try:
+        router.INTENT_CLASSIFIER = None
+        without = run(test, args.llm_ms, args.llm_error)
+        router.INTENT_CLASSIFIER, router.INTENT_THRESHOLD = model, threshold
+        with_tier = run(test, args.llm_ms, args.llm_error)
+    finally:
+        router.INTENT_CLASSIFIER, router.INTENT_THRESHOLD = previous
+
+    print(f"{'':22}{'without':>10}{'with':>10}")
+    for key in without:
+        print(f"{key:22}{without[key]:10.3f}{with_tier[key]:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
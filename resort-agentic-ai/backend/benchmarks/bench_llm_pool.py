@@ -0,0 +1,94 @@
+"""
+LLM routing latency with one provider vs. a failover pool vs. a hedged pool.
+
+Two local stub endpoints answer in --delay-ms (+ jitter), but --tail-rate of
+their answers take --tail-ms longer (a slow or overloaded provider). A second
+round makes the first endpoint fail --error-rate of its requests. Hedging
+costs extra calls; their share is reported as overhead.
+
+    python -m backend.benchmarks.bench_llm_pool
+"""
+import argparse
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.agents.llm_pool import LLMPoolConfig, LLMUnavailable, ProviderPool, ProviderSpec
+from backend.tools.stub_llm_server import StubLLMServer
+
+MESSAGES = [{"role": "user", "content": "is the spa open on sunday?"}]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run(pool, requests, clients):
+    def one(_):
+        started = time.perf_counter()
+        try:
+            pool.complete(MESSAGES)
+        except LLMUnavailable:
+            return None
+        return (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        latencies = list(executor.map(one, range(requests)))
+    return [ms for ms in latencies if ms is not None], latencies.count(None)
+
+
+def calls(pool):
+    return sum(p["calls"] for p in pool.stats()["providers"].values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--delay-ms", type=float, default=40.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--tail-rate", type=float, default=0.02)
+    parser.add_argument("--tail-ms", type=float, default=1500.0)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    random.seed(args.seed)
+
+    servers = [
+        StubLLMServer(delay=args.delay_ms / 1000, jitter=args.jitter_ms / 1000,
+                      tail_rate=args.tail_rate, tail_delay=args.tail_ms / 1000).start()
+        for _ in range(2)
+    ]
+    specs = [ProviderSpec(f"stub{i}", "stub", server.base_url) for i, server in enumerate(servers)]
+    scenarios = [
+        ("single provider", specs[:1], LLMPoolConfig(max_hedges=0)),
+        ("failover only", specs, LLMPoolConfig(max_hedges=0)),
+        ("hedged at p95", specs, LLMPoolConfig()),
+    ]
+    try:
+        for error_rate in (0.0, args.error_rate):
+            print(f"-- first endpoint error rate {error_rate:.0%}")
+            for label, pool_specs, config in scenarios:
+                servers[0].error_rate = 0.0
+                pool = ProviderPool(pool_specs, config)
+                # warm the latency windows so hedges use a measured p95
+                run(pool, config.min_samples * 2, args.clients)
+                servers[0].error_rate = error_rate
+                before = calls(pool)
+
+                latencies, failed = run(pool, args.requests, args.clients)
+                extra = (calls(pool) - before) / args.requests - 1
+                print(f"{label:18} p50 {statistics.median(latencies):7.1f} ms   "
+                      f"p95 {percentile(latencies, 0.95):7.1f} ms   "
+                      f"p99 {percentile(latencies, 0.99):7.1f} ms   "
+                      f"failed {failed:4}   extra calls {extra:6.1%}")
+                pool.configure([])
+    finally:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+/chat throughput with logging off, synchronous logging and queue-based
+JSON logging (full and sampled), writing to a local file and to a slow sink
+that blocks --sink-ms per write (a congested pipe / remote console).
+
+    python -m backend.benchmarks.bench_logging --requests 1000
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.admission import ADMISSION, AdmissionConfig
+from backend.logging_setup import configure_logging, shutdown_logging
+
+class SlowStream:
+    def __init__(self, stream, delay_s):
+        self.stream = stream
+        self.delay_s = delay_s
+
+    def write(self, data):
+        time.sleep(self.delay_s)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+
+MESSAGES = ["what is the check in time?", "is the gym open", "check out time", "tell me about the spa"]
+
+
+def throughput(client, n, rounds=3):
+    """Best of `rounds` runs, in requests per second."""
+    best = 0.0
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for i in range(n):
+            response = client.post("/chat", json={"session_id": f"bench-{i % 500}", "message": MESSAGES[i % 4]})
+            assert response.status_code == 200
+        best = max(best, n / (time.perf_counter() - t0))
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--sink-ms", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    ADMISSION.configure(AdmissionConfig(session_rate=1e6, session_burst=10**6))
+    root = logging.getLogger()
+    for name in ("httpx", "httpx2"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp, TestClient(app) as client:
+        throughput(client, 500, rounds=1)     # warm-up
+        results = {}
+
+        shutdown_logging()
+        logging.disable(logging.CRITICAL)
+        results["logging off"] = throughput(client, args.requests)
+        logging.disable(logging.NOTSET)
+        root.setLevel(logging.INFO)
+
+        sinks = {
+            "file": lambda f: f,
+            f"slow sink {args.sink_ms}ms": lambda f: SlowStream(f, args.sink_ms / 1000),
+        }
+        for sink_name, wrap in sinks.items():
+            with open(os.path.join(tmp, f"{sink_name}.log"), "w") as out:
+                # what router.py used to do: a stream handler on the request thread
+                sync_handler = logging.StreamHandler(wrap(out))
+                sync_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+                root.addHandler(sync_handler)
+                results[f"{sink_name}: sync handler"] = throughput(client, args.requests)
+                root.removeHandler(sync_handler)
+
+                for rate in (1.0, 0.1):
+                    configure_logging(sample_rate=rate, stream=wrap(out))
+                    results[f"{sink_name}: queue+JSON {rate}"] = throughput(client, args.requests)
+                    shutdown_logging()
+
+    base = results["logging off"]
+    for name, rps in results.items():
+        print(f"{name:34} {rps:8.0f} req/s  ({rps / base:6.1%} of logging off)")
+
+
+if __name__ == "__main__":
+    main()
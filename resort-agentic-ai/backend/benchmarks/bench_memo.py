@@ -0,0 +1,126 @@
+"""
+Router latency with and without the response memo on a mixed chat load.
+
+Guests ask FAQ-style questions (check-in time, facility hours, the menu,
+the available-rooms list) in a few common phrasings, mixed with stateful
+turns (orders, specific rooms, date ranges, room service). Reports the
+share of turns served from the memo and the per-turn latency both ways.
+
+    python -m backend.benchmarks.bench_memo --turns 20000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ["OPENAI_API_KEY"] = ""       # keyword / fallback routing only, no LLM calls
+
+from backend.database import Base, SessionLocal, configure_database  # noqa: E402
+from backend.agents.restaurant import SESSION_ORDERS  # noqa: E402
+from backend.agents.router import RESPONSE_MEMO, route_message  # noqa: E402
+from backend.models.room import Room  # noqa: E402
+from backend.properties import PROPERTIES, provision_property  # noqa: E402
+
+MENU = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "menu.json")
+
+STATELESS = [
+    "what is check in time?", "check-in time", "when is check out", "check-out time?",
+    "gym timings", "is the gym open", "spa hours", "what time does the spa open",
+    "pool timings", "is the pool open now", "what facilities do you have", "facilities",
+    "show me the menu", "menu please", "room availability", "any available rooms?",
+    "i want to make a reservation"
+]
+STATEFUL = [
+    ["order two idli and one vada", "{room}"],
+    ["Is room {room} available?"],
+    ["How many rooms free from 2030-01-12 to 2030-01-14?"],
+    ["rooms free next weekend"],
+    ["I need extra towels in room {room}"]
+]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def traffic(turns, stateless_share, seed):
+    rnd = random.Random(seed)
+    scripts, planned = [], 0
+    while planned < turns:
+        if rnd.random() < stateless_share:
+            script = [rnd.choice(STATELESS)]
+        else:
+            room = rnd.randint(101, 130)
+            script = [m.format(room=room) for m in rnd.choice(STATEFUL)]
+        scripts.append(script)
+        planned += len(script)
+    return scripts
+
+
+def run(scripts, enabled, rooms_updated_every):
+    RESPONSE_MEMO.enabled = enabled
+    RESPONSE_MEMO.clear()
+    SESSION_ORDERS.clear()
+    latencies = []
+    for n, script in enumerate(scripts):
+        if rooms_updated_every and n % rooms_updated_every == 0:
+            # a room changes state now and then: the rooms list must be re-rendered
+            db = SessionLocal()
+            room = db.query(Room).filter(Room.room_number == 101 + n % 30).one()
+            room.is_available = not room.is_available
+            db.commit()
+            db.close()
+        for message in script:
+            t0 = time.perf_counter()
+            route_message(f"guest-{n}", message)
+            latencies.append((time.perf_counter() - t0) * 1000)
+    return latencies
+
+
+def report(label, latencies):
+    print(f"{label:14} mean {statistics.mean(latencies):7.3f} ms   "
+          f"p50 {statistics.median(latencies):7.3f} ms   p99 {percentile(latencies, 0.99):7.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=20000)
+    parser.add_argument("--stateless-share", type=float, default=0.6,
+                        help="share of conversations that are a single FAQ-style question")
+    parser.add_argument("--rooms-updated-every", type=int, default=200,
+                        help="conversations between room status changes (0 = never)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    with open(MENU, encoding="utf-8") as f:
+        menu = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = configure_database(f"sqlite:///{tmp}/default.db")
+        Base.metadata.create_all(bind=engine)
+        provision_property("default", range(101, 131), menu)
+        PROPERTIES.clear()
+
+        scripts = traffic(args.turns, args.stateless_share, args.seed)
+        run(scripts[:500], True, 0)     # warm-up (caches, agent threads)
+
+        before = run(scripts, False, args.rooms_updated_every)
+        after = run(scripts, True, args.rooms_updated_every)
+        stats = RESPONSE_MEMO.stats()
+
+        report("memo off", before)
+        report("memo on", after)
+        print(f"served from memo: {stats['hit_share']:.1%} of {stats['turns']} turns "
+              f"({stats['static_hits']} static, {stats['data_hits']} DB-backed, "
+              f"{stats['stale']} re-rendered after a write)")
+        print(f"latency saved: {sum(before) - sum(after):,.0f} ms measured, "
+              f"{stats['saved_ms']:,.0f} ms estimated by the memo "
+              f"({stats['avg_saved_ms']:.3f} ms per hit)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Chat throughput with many properties served by one process: every turn
+goes to a random property's shard and caches.
+
+    python -m backend.benchmarks.bench_properties --properties 50 --turns 5000
+
+Runs three times: all properties' caches warm (MAX_ACTIVE_PROPERTIES >= N),
+an LRU smaller than the working set (evictions and reloads), and a single
+property for reference.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.database import Base, configure_database, use_property
+from backend.agents.router import route_message
+from backend.properties import PROPERTIES, provision_property, scoped_session_id
+
+MENU = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "menu.json")
+
+# (messages of one guest conversation), rooms filled in per property
+CONVERSATIONS = [
+    ["order two idli and one vada", "{room}"],
+    ["Is room {room} available?"],
+    ["How many rooms free from 2030-01-12 to 2030-01-14?"],
+    ["I need extra towels in room {room}"],
+    ["show me the menu"],
+    ["What is check in time?"]
+]
+
+
+def property_key(i):
+    return f"resort-{i:03d}"
+
+
+def run(n_properties, turns, clients, seed=7):
+    rnd = random.Random(seed)
+    jobs, planned = [], 0
+    while planned < turns:
+        i = rnd.randrange(n_properties)
+        room = 100 * (1 + i % 9) + rnd.randint(1, 30)
+        script = [m.format(room=room) for m in rnd.choice(CONVERSATIONS)]
+        jobs.append((property_key(i), f"guest-{len(jobs)}", script))
+        planned += len(script)
+
+    def converse(job):
+        key, guest, script = job
+        with use_property(key):
+            session_id = scoped_session_id(guest)
+            for message in script:
+                route_message(session_id, message)
+        return len(script)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        done = sum(pool.map(converse, jobs))
+    return done / (time.perf_counter() - t0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--properties", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--small-lru", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    with open(MENU, encoding="utf-8") as f:
+        menu = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = configure_database(
+            f"sqlite:///{tmp}/default.db", property_url=f"sqlite:///{tmp}/{{property}}.db"
+        )
+        Base.metadata.create_all(bind=engine)
+
+        t0 = time.perf_counter()
+        for i in range(args.properties):
+            base = 100 * (1 + i % 9)
+            provision_property(property_key(i), range(base + 1, base + 31), menu)
+        print(f"provisioned {args.properties} properties in {time.perf_counter() - t0:.1f}s")
+
+        PROPERTIES.max_active = max(args.properties, PROPERTIES.max_active)
+        PROPERTIES.clear()
+        run(args.properties, args.turns // 5, args.clients)     # warm-up
+        warm = run(args.properties, args.turns, args.clients, seed=8)
+        print(f"{args.properties} properties, all cached:   {warm:8,.0f} turns/s  {PROPERTIES.stats()}")
+
+        PROPERTIES.max_active = args.small_lru
+        PROPERTIES.clear()
+        thrash = run(args.properties, args.turns, args.clients, seed=9)
+        print(f"{args.properties} properties, LRU of {args.small_lru}:  {thrash:8,.0f} turns/s  {PROPERTIES.stats()}")
+
+        PROPERTIES.max_active = max(args.properties, 64)
+        PROPERTIES.clear()
+        run(1, args.turns // 5, args.clients)
+        single = run(1, args.turns, args.clients, seed=10)
+        print(f"1 property:                  {single:8,.0f} turns/s")
+
+
+if __name__ == "__main__":
+    main()
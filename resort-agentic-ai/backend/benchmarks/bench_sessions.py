@@ -0,0 +1,88 @@
+"""
+Bytes per open restaurant session: legacy nested dicts vs OrderSession.
+
+    python -m backend.benchmarks.bench_sessions --sessions 100000
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+
+from backend.utils.session import OrderSession, CartLine, Stage
+
+MENU = [
+    (1, "Masala Dosa", 120.0), (2, "Plain Idli", 80.0), (3, "Medu Vada", 90.0),
+    (4, "Upma", 100.0), (5, "Poha", 100.0), (6, "Aloo Paratha", 130.0),
+    (7, "Paneer Paratha", 150.0), (8, "Puri Bhaji", 140.0), (9, "Omelette", 90.0),
+    (10, "Boiled Eggs", 70.0),
+]
+
+
+def carts(n, seed=0):
+    rnd = random.Random(seed)
+    for _ in range(n):
+        lines = [(rnd.choice(MENU), rnd.choice([None, 1, 2, 3])) for _ in range(rnd.randint(1, 4))]
+        yield lines, rnd.randrange(len(lines))
+
+
+def legacy(lines, current):
+    # name / price are fresh objects per session, as they come off ORM rows
+    return {
+        "items": [
+            {"name": "".join(name), "price": float(str(price)), "qty": qty}
+            for (_, name, price), qty in lines
+        ],
+        "stage": "awaiting_quantity",
+        "current_index": current
+    }
+
+
+def slotted(lines, current):
+    return OrderSession(
+        [CartLine(item_id, qty) for (item_id, _, _), qty in lines],
+        Stage.AWAITING_QUANTITY,
+        current
+    )
+
+
+def packed(lines, current):
+    return slotted(lines, current).to_bytes()
+
+
+def measure(build, n):
+    gc.collect()
+    tracemalloc.start()
+    store = {}
+    for i, (lines, current) in enumerate(carts(n)):
+        store[f"session-{i}"] = build(lines, current)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # the store itself (keys + dict table) is the same for every layout
+    gc.collect()
+    tracemalloc.start()
+    keys = {f"session-{i}": None for i in range(n)}
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store, keys
+    return (size - base) / n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    results = {
+        "legacy dict-of-dicts": measure(legacy, args.sessions),
+        "OrderSession (slots)": measure(slotted, args.sessions),
+        "OrderSession.to_bytes": measure(packed, args.sessions),
+    }
+    before = results["legacy dict-of-dicts"]
+    print(f"{args.sessions:,} open sessions, bytes per session (excluding session-id keys):")
+    for name, per in results.items():
+        print(f"  {name:24} {per:8.0f} B   {before / per:5.1f}x vs legacy")
+
+
+if __name__ == "__main__":
+    main()
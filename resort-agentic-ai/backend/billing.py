@@ -0,0 +1,320 @@
+# backend/billing.py
+"""
+Incrementally maintained billing rollups.
+
+`room_bills` (open folio per room) and `daily_revenue` (per day and status)
+are updated with deltas in the same transaction as the order write, so a
+bill or revenue lookup is a primary-key read instead of a scan of `orders`.
+
+- SQLAlchemy writes are picked up by an `after_flush` listener
+- Raw sqlite3 callers (the dashboard) go through `update_order_status_sql`
+- `rebuild_rollups` recomputes everything from `orders` and reports drift
+"""
+from datetime import datetime
+
+from sqlalchemy import event, inspect, insert, text
+from sqlalchemy.orm import Session
+
+from backend.models.order import Order
+from backend.models.billing import RoomBill, DailyRevenue
+
+# Orders in these states are no longer on the room's open bill
+CLOSED_STATUSES = {"Paid", "Cancelled"}
+
+# Orders in these states don't count as revenue
+NON_REVENUE_STATUSES = {"Cancelled"}
+
+# Both statements use named parameters, which sqlite3 and SQLAlchemy's
+# text() accept alike.
+ROOM_BILL_DELTA_SQL = """
+INSERT INTO room_bills (room_number, open_total, open_orders)
+VALUES (:room_number, :amount, :orders)
+ON CONFLICT(room_number) DO UPDATE SET
+    open_total = open_total + excluded.open_total,
+    open_orders = open_orders + excluded.open_orders
+"""
+
+DAILY_REVENUE_DELTA_SQL = """
+INSERT INTO daily_revenue (day, status, revenue, order_count, item_count)
+VALUES (:day, :status, :amount, :orders, :items)
+ON CONFLICT(day, status) DO UPDATE SET
+    revenue = revenue + excluded.revenue,
+    order_count = order_count + excluded.order_count,
+    item_count = item_count + excluded.item_count
+"""
+
+_TRACKED_FIELDS = ("room_number", "total_amount", "quantity", "status", "created_at")
+
+
+# ===============================
+# Delta helpers
+# ===============================
+def item_count(quantity) -> int:
+    """Total items of an order from its `quantity` column ("2; 1" -> 3)."""
+    total = 0
+    for part in (quantity or "").split(";"):
+        part = part.strip()
+        if part.isdigit():
+            total += int(part)
+    return total
+
+
+def order_day(created_at) -> str:
+    if created_at is None:
+        created_at = datetime.utcnow()
+    if isinstance(created_at, str):
+        return created_at[:10]
+    return created_at.strftime("%Y-%m-%d")
+
+
+def order_deltas(room_number, total_amount, quantity, status, created_at, sign=1):
+    """
+    Rollup statements that add (sign=1) or remove (sign=-1) one order.
+    Returns: [(sql, params)]
+    """
+    amount = (total_amount or 0.0) * sign
+    deltas = []
+
+    if room_number is not None and status not in CLOSED_STATUSES:
+        deltas.append((ROOM_BILL_DELTA_SQL, {
+            "room_number": room_number,
+            "amount": amount,
+            "orders": sign
+        }))
+
+    deltas.append((DAILY_REVENUE_DELTA_SQL, {
+        "day": order_day(created_at),
+        "status": status,
+        "amount": amount,
+        "orders": sign,
+        "items": item_count(quantity) * sign
+    }))
+    return deltas
+
+
+def _previous_values(order):
+    """Values of the tracked fields before the pending flush, or None if unchanged."""
+    state = inspect(order)
+    values = {}
+    changed = False
+    for field in _TRACKED_FIELDS:
+        history = state.attrs[field].history
+        if history.deleted:
+            values[field] = history.deleted[0]
+            changed = True
+        else:
+            values[field] = getattr(order, field)
+    return values if changed else None
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_order_deltas(session, flush_context):
+    deltas = []
+
+    for obj in session.new:
+        if isinstance(obj, Order):
+            deltas += order_deltas(
+                obj.room_number, obj.total_amount, obj.quantity,
+                obj.status, obj.created_at, 1
+            )
+
+    for obj in session.dirty:
+        if not isinstance(obj, Order):
+            continue
+        before = _previous_values(obj)
+        if before is None:
+            continue
+        deltas += order_deltas(*(before[f] for f in _TRACKED_FIELDS), -1)
+        deltas += order_deltas(
+            obj.room_number, obj.total_amount, obj.quantity,
+            obj.status, obj.created_at, 1
+        )
+
+    for obj in session.deleted:
+        if isinstance(obj, Order):
+            deltas += order_deltas(
+                obj.room_number, obj.total_amount, obj.quantity,
+                obj.status, obj.created_at, -1
+            )
+
+    if deltas:
+        conn = session.connection()
+        for sql, params in deltas:
+            conn.execute(text(sql), params)
+
+
+# ===============================
+# Writes
+# ===============================
+def set_order_status(db, order_id: int, status: str):
+    order = db.get(Order, order_id)
+    if order is None:
+        return None
+    order.status = status
+    db.commit()
+    return order
+
+
+def update_order_status_sql(conn, order_id: int, status: str) -> bool:
+    """
+    Status change through a DB-API connection (sqlite3), for callers that
+    don't use SQLAlchemy. The caller commits.
+    """
+    row = conn.execute(
+        "SELECT room_number, total_amount, quantity, status, created_at "
+        "FROM orders WHERE id = :id",
+        {"id": order_id}
+    ).fetchone()
+    if row is None or row[3] == status:
+        return False
+
+    room_number, total_amount, quantity, old_status, created_at = row
+    conn.execute(
+        "UPDATE orders SET status = :status WHERE id = :id",
+        {"status": status, "id": order_id}
+    )
+    deltas = (
+        order_deltas(room_number, total_amount, quantity, old_status, created_at, -1)
+        + order_deltas(room_number, total_amount, quantity, status, created_at, 1)
+    )
+    for sql, params in deltas:
+        conn.execute(sql, params)
+    return True
+
+
+def checkout_room(db, room_number: int) -> dict:
+    """Settle the room's open orders (status -> Paid) and return what was billed."""
+    bill = get_room_bill(db, room_number)
+    orders = db.query(Order).filter(
+        Order.room_number == room_number,
+        Order.status.notin_(CLOSED_STATUSES)
+    ).all()
+    for order in orders:
+        order.status = "Paid"
+    db.commit()
+    return bill
+
+
+# ===============================
+# Reads (primary-key lookups)
+# ===============================
+def get_room_bill(db, room_number: int) -> dict:
+    bill = db.get(RoomBill, room_number)
+    return {
+        "room_number": room_number,
+        "open_total": round(bill.open_total, 2) if bill else 0.0,
+        "open_orders": bill.open_orders if bill else 0
+    }
+
+
+def get_daily_revenue(db, day: str) -> dict:
+    rows = db.query(DailyRevenue).filter(DailyRevenue.day == day).all()
+    by_status = {
+        r.status: {
+            "revenue": round(r.revenue, 2),
+            "orders": r.order_count,
+            "items": r.item_count
+        }
+        for r in rows if r.order_count
+    }
+    counted = [r for r in rows if r.status not in NON_REVENUE_STATUSES]
+    return {
+        "day": day,
+        "revenue": round(sum(r.revenue for r in counted), 2),
+        "orders": sum(r.order_count for r in counted),
+        "items": sum(r.item_count for r in counted),
+        "by_status": by_status
+    }
+
+
+# ===============================
+# Rebuild / audit
+# ===============================
+def compute_rollups(db):
+    """Recompute both rollups from the raw `orders` table (one full scan)."""
+    bills = {}
+    daily = {}
+    rows = db.query(
+        Order.room_number, Order.total_amount, Order.quantity,
+        Order.status, Order.created_at
+    ).yield_per(10000)
+
+    for room_number, total_amount, quantity, status, created_at in rows:
+        amount = total_amount or 0.0
+        if room_number is not None and status not in CLOSED_STATUSES:
+            total, count = bills.get(room_number, (0.0, 0))
+            bills[room_number] = (total + amount, count + 1)
+
+        key = (order_day(created_at), status)
+        revenue, count, items = daily.get(key, (0.0, 0, 0))
+        daily[key] = (revenue + amount, count + 1, items + item_count(quantity))
+
+    return bills, daily
+
+
+def read_rollups(db):
+    bills = {
+        r.room_number: (r.open_total, r.open_orders)
+        for r in db.query(RoomBill).all()
+    }
+    daily = {
+        (r.day, r.status): (r.revenue, r.order_count, r.item_count)
+        for r in db.query(DailyRevenue).all()
+    }
+    return bills, daily
+
+
+def _same(a, b):
+    return all(abs((x or 0) - (y or 0)) < 0.005 for x, y in zip(a, b))
+
+
+def diff_rollups(expected, actual) -> list:
+    """Human-readable mismatches between two (bills, daily) pairs."""
+    problems = []
+    for name, exp, act, zero in (
+        ("room_bills", expected[0], actual[0], (0.0, 0)),
+        ("daily_revenue", expected[1], actual[1], (0.0, 0, 0)),
+    ):
+        for key in sorted(set(exp) | set(act), key=str):
+            e, a = exp.get(key, zero), act.get(key, zero)
+            if not _same(e, a):
+                problems.append(f"{name}[{key}]: expected {e}, stored {a}")
+    return problems
+
+
+def rebuild_rollups(db, check_only: bool = False) -> list:
+    """
+    Compare the stored rollups with the raw orders and, unless `check_only`,
+    replace them with the recomputed values. Returns the mismatches found.
+    """
+    expected = compute_rollups(db)
+    problems = diff_rollups(expected, read_rollups(db))
+    if check_only:
+        return problems
+
+    bills, daily = expected
+    db.query(RoomBill).delete()
+    db.query(DailyRevenue).delete()
+    if bills:
+        db.execute(insert(RoomBill), [
+            {"room_number": room, "open_total": total, "open_orders": count}
+            for room, (total, count) in bills.items()
+        ])
+    if daily:
+        db.execute(insert(DailyRevenue), [
+            {"day": day, "status": status, "revenue": revenue,
+             "order_count": count, "item_count": items}
+            for (day, status), (revenue, count, items) in daily.items()
+        ])
+    db.commit()
+    return problems
+
+
+def ensure_rollups(db):
+    """Backfill the rollups once for databases that predate them."""
+    has_rollups = (
+        db.query(RoomBill).first() is not None
+        or db.query(DailyRevenue).first() is not None
+    )
+    if not has_rollups and db.query(Order).first() is not None:
+        rebuild_rollups(db)
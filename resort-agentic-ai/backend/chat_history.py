@@ -0,0 +1,118 @@
+# backend/chat_history.py
+"""
+Compact server-side chat history, one log per session.
+
+A session's messages live in one bytearray (a role byte + UTF-8 text per
+message) with an array of start offsets, so a page is a slice and a long
+conversation costs roughly its text size instead of a dict per message.
+The chat UI renders only a window of recent messages and pages older ones
+from here ("load earlier").
+
+Each log keeps the newest CHAT_HISTORY_MAX_MESSAGES messages; beyond
+CHAT_HISTORY_MAX_SESSIONS the least recently active session is dropped.
+"""
+import os
+import threading
+from array import array
+from collections import OrderedDict
+
+ROLES = ("user", "assistant")
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+
+MAX_MESSAGES = int(os.getenv("CHAT_HISTORY_MAX_MESSAGES", 1000))
+MAX_SESSIONS = int(os.getenv("CHAT_HISTORY_MAX_SESSIONS", 10000))
+MAX_PAGE = 200
+
+
+class ChatLog:
+    __slots__ = ("data", "offsets", "first_seq")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("I")
+        self.first_seq = 0          # seq of the oldest message still kept
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def append(self, role: str, text: str) -> int:
+        self.offsets.append(len(self.data))
+        self.data.append(_ROLE_CODES[role])
+        self.data += text.encode("utf-8")
+        return self.first_seq + len(self.offsets) - 1
+
+    def message(self, i: int) -> dict:
+        start = self.offsets[i]
+        end = self.offsets[i + 1] if i + 1 < len(self.offsets) else len(self.data)
+        return {
+            "seq": self.first_seq + i,
+            "role": ROLES[self.data[start]],
+            "text": self.data[start + 1:end].decode("utf-8")
+        }
+
+    def page(self, before: int = None, limit: int = 50):
+        """
+        Up to `limit` messages older than seq `before` (default: the newest),
+        oldest first. Returns: (messages, has_more)
+        """
+        end = len(self.offsets) if before is None else min(max(before - self.first_seq, 0), len(self.offsets))
+        start = max(end - limit, 0)
+        return [self.message(i) for i in range(start, end)], start > 0
+
+    def trim(self, keep: int):
+        drop = len(self.offsets) - keep
+        if drop <= 0:
+            return
+        cut = self.offsets[drop]
+        del self.data[:cut]
+        self.offsets = array("I", (offset - cut for offset in self.offsets[drop:]))
+        self.first_seq += drop
+
+
+class ChatHistoryStore:
+    def __init__(self, max_messages: int = MAX_MESSAGES, max_sessions: int = MAX_SESSIONS):
+        self.max_messages = max_messages
+        self.max_sessions = max_sessions
+        self._logs = OrderedDict()      # session_id -> ChatLog, least recent first
+        self._lock = threading.Lock()
+
+    def append_turn(self, session_id: str, message: str, reply: str) -> int:
+        """Records a guest message and its reply together; returns the reply's seq."""
+        with self._lock:
+            log = self._logs.get(session_id)
+            if log is None:
+                log = self._logs[session_id] = ChatLog()
+                if len(self._logs) > self.max_sessions:
+                    self._logs.popitem(last=False)
+            else:
+                self._logs.move_to_end(session_id)
+            log.append("user", message)
+            seq = log.append("assistant", reply)
+            # trim in batches so the bytearray isn't shifted on every turn
+            if len(log) > self.max_messages + max(self.max_messages // 4, 2):
+                log.trim(self.max_messages)
+            return seq
+
+    def page(self, session_id: str, before: int = None, limit: int = 50) -> dict:
+        limit = min(max(limit, 1), MAX_PAGE)
+        with self._lock:
+            log = self._logs.get(session_id)
+            if log is None:
+                return {"messages": [], "has_more": False}
+            messages, has_more = log.page(before, limit)
+        return {"messages": messages, "has_more": has_more}
+
+    def clear(self):
+        with self._lock:
+            self._logs.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._logs),
+                "messages": sum(len(log) for log in self._logs.values()),
+                "bytes": sum(len(log.data) + log.offsets.itemsize * len(log) for log in self._logs.values())
+            }
+
+
+CHAT_HISTORY = ChatHistoryStore()
@@ -0,0 +1,52 @@
+# backend/data_versions.py
+"""
+Shared data versions for in-process caches.
+
+The menu / room caches (`backend.properties`) and the memoized answers
+(`backend.agents.response_memo`) are invalidated right away by ORM
+listeners for writes made in this process. Writes from other workers or
+raw SQL only show up in the per-shard `data_versions` counters, kept by
+triggers (`backend.models.data_version`). Those are re-read at most every
+DATA_VERSION_CHECK_SECONDS (1.0; 0 = on every use) per property, which
+bounds how long such a write can go unseen.
+"""
+import os
+import threading
+import time
+
+from sqlalchemy import text
+
+from backend.database import engine_for
+
+CHECK_SECONDS = float(os.getenv("DATA_VERSION_CHECK_SECONDS", 1.0))
+
+
+class SharedVersions:
+    def __init__(self, check_seconds: float = CHECK_SECONDS, clock=time.monotonic):
+        self.check_seconds = check_seconds
+        self._clock = clock
+        self._read = {}         # property_id -> (read at, {table: version})
+        self._lock = threading.Lock()
+        self.reads = 0
+
+    def get(self, property_id: str, tables) -> tuple:
+        """Versions of `tables` in the property's shard, at most check_seconds old."""
+        now = self._clock()
+        entry = self._read.get(property_id)
+        if entry is None or now - entry[0] >= self.check_seconds:
+            with engine_for(property_id).connect() as conn:
+                versions = dict(conn.execute(
+                    text("SELECT table_name, version FROM data_versions")
+                ).all())
+            entry = (now, versions)
+            with self._lock:
+                self._read[property_id] = entry
+                self.reads += 1
+        return tuple(entry[1].get(table, 0) for table in tables)
+
+    def clear(self):
+        with self._lock:
+            self._read.clear()
+
+
+SHARED_VERSIONS = SharedVersions()
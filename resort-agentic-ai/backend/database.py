@@ -1,17 +1,147 @@
+import contextvars
+import os
+import re
+import threading
+from contextlib import contextmanager
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Database URL (override with the DATABASE_URL environment variable)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resort.db")
+
+# ===============================
+# Properties (one SQLite shard per resort)
+# ===============================
+# The default property lives in DATABASE_URL; every other property in its own
+# shard, PROPERTY_DATABASE_URL with "{property}" replaced by the property key.
+DEFAULT_PROPERTY = os.getenv("DEFAULT_PROPERTY", "default")
+PROPERTY_DATABASE_URL = os.getenv("PROPERTY_DATABASE_URL", "sqlite:///./properties/{property}.db")
+
+PROPERTY_KEY = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")     # also a file name
+
+CURRENT_PROPERTY = contextvars.ContextVar("property", default=DEFAULT_PROPERTY)
+
+
+def validate_property(property_id: str) -> str:
+    if not PROPERTY_KEY.match(property_id or ""):
+        raise ValueError(f"Invalid property key '{property_id}'.")
+    return property_id
+
+
+def current_property() -> str:
+    return CURRENT_PROPERTY.get()
+
+
+@contextmanager
+def use_property(property_id: str):
+    """Run a block (and the agent threads it dispatches to) against one property."""
+    token = CURRENT_PROPERTY.set(validate_property(property_id))
+    try:
+        yield property_id
+    finally:
+        CURRENT_PROPERTY.reset(token)
+
+
+def make_engine(url: str, **kwargs):
+    if url.startswith("sqlite"):
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if url in ("sqlite://", "sqlite:///:memory:"):
+            # one shared connection, otherwise every checkout is a new empty DB
+            kwargs["poolclass"] = StaticPool
+    return create_engine(url, **kwargs)
+
+
+def shard_url(property_id: str) -> str:
+    if property_id == DEFAULT_PROPERTY:
+        return DATABASE_URL
+    return PROPERTY_DATABASE_URL.format(property=validate_property(property_id))
 
-# SQLite database URL
-DATABASE_URL = "sqlite:///./resort.db"
 
-# Create database engine
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)
+def shard_exists(property_id: str) -> bool:
+    """False for a SQLite shard file that hasn't been provisioned yet."""
+    if property_id == DEFAULT_PROPERTY:
+        return True
+    url = make_url(shard_url(property_id))
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return True
+    return os.path.exists(url.database)
+
+
+_ENGINES = {}
+_ENGINES_LOCK = threading.Lock()
+_SCHEMA_READY = set()       # shards already create_all'ed by this process
+
+
+def engine_for(property_id: str):
+    engine_ = _ENGINES.get(property_id)
+    if engine_ is not None:
+        return engine_
+    with _ENGINES_LOCK:
+        if property_id not in _ENGINES:
+            url = shard_url(property_id)
+            database = make_url(url).database
+            if url.startswith("sqlite") and database and database != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+            new_engine = make_engine(url)
+            if property_id != DEFAULT_PROPERTY and property_id not in _SCHEMA_READY:
+                import backend.models  # noqa: F401  (register every table)
+                Base.metadata.create_all(bind=new_engine)
+                _SCHEMA_READY.add(property_id)
+            _ENGINES[property_id] = new_engine
+        return _ENGINES[property_id]
+
+
+def dispose_engine(property_id: str):
+    """
+    Close an inactive shard's pooled connections (the default stays open).
+    The engine object is kept: it holds the compiled-SQL cache, and
+    recompiling every statement made reloading an evicted property ~2x slower.
+    """
+    if property_id == DEFAULT_PROPERTY:
+        return
+    engine_ = _ENGINES.get(property_id)
+    if engine_ is not None:
+        engine_.dispose()
+
+
+class PropertySession(Session):
+    """Session bound to the shard of the property active when it was opened."""
+
+    def __init__(self, **kwargs):
+        self.property_id = current_property()
+        if kwargs.get("bind") is None:
+            kwargs["bind"] = engine_for(self.property_id)
+        super().__init__(**kwargs)
+
+
+# Create database engine (default property)
+engine = make_engine(DATABASE_URL)
+_ENGINES[DEFAULT_PROPERTY] = engine
 
 # Create session
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=PropertySession, autocommit=False, autoflush=False)
 
 # Base class for models
 Base = declarative_base()
+
+
+def configure_database(url: str, property_url: str = None):
+    """Point SessionLocal (and `engine`) at other databases, e.g. for tests."""
+    global DATABASE_URL, PROPERTY_DATABASE_URL, engine
+
+    with _ENGINES_LOCK:
+        previous = list(_ENGINES.values())
+        _ENGINES.clear()
+        _SCHEMA_READY.clear()
+        DATABASE_URL = url
+        if property_url is not None:
+            PROPERTY_DATABASE_URL = property_url
+        engine = make_engine(url)
+        _ENGINES[DEFAULT_PROPERTY] = engine
+    for old in previous:
+        old.dispose()
+    return engine
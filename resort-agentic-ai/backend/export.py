@@ -0,0 +1,231 @@
+# backend/export.py
+"""
+Streaming bulk export of orders and service requests.
+
+Rows are read in fixed-size chunks ordered by id, each chunk its own short
+keyset query (`id > last ORDER BY id LIMIT n`) whose read transaction ends
+before the chunk is sent: an open SQLite cursor would hold a shared lock
+for the whole download and every guest order would fail to commit
+("database is locked") behind a slow client. Chunks are encoded one by one
+as CSV, NDJSON or Parquet (one row group per chunk), optionally gzipped on
+the fly, so memory stays flat however many rows match. Because every export
+is ordered by id, an interrupted download resumes with
+`after_id=<last id received>`.
+
+Timestamps are selected as the text SQLite stores ("2026-01-31 08:15:00.123456")
+and written as-is to CSV / NDJSON; parsing them into datetimes only to format
+them again was most of the export time. Parquet casts them to timestamp[us].
+"""
+import csv
+import io
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Iterator
+
+from sqlalchemy import DateTime, Float, Integer, String, select, type_coerce
+
+from backend.models.order import Order
+from backend.models.service_request import ServiceRequest
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+EXPORTS = {
+    "orders": Order,
+    "service_requests": ServiceRequest
+}
+
+# format -> (media type, file extension)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+
+DEFAULT_CHUNK_SIZE = 10_000
+MAX_CHUNK_SIZE = 100_000
+GZIP_LEVEL = 6
+
+
+@dataclass
+class Export:
+    media_type: str
+    filename: str
+    chunks: Iterator[bytes]
+
+
+# ===============================
+# Query
+# ===============================
+def export_query(model, start: date = None, end: date = None, status=None, after_id: int = None):
+    """Rows of `model` created on [start, end] (inclusive days), ordered by id."""
+    table = model.__table__
+    stmt = select(*(
+        type_coerce(c, String).label(c.name) if isinstance(c.type, DateTime) else c
+        for c in table.columns
+    )).order_by(table.c.id)
+    if after_id is not None:
+        stmt = stmt.where(table.c.id > after_id)
+    if start is not None:
+        stmt = stmt.where(table.c.created_at >= datetime.combine(start, time.min))
+    if end is not None:
+        stmt = stmt.where(table.c.created_at < datetime.combine(end + timedelta(days=1), time.min))
+    if status:
+        statuses = [status] if isinstance(status, str) else list(status)
+        stmt = stmt.where(table.c.status.in_(statuses))
+    return stmt
+
+
+def iter_row_chunks(db, model, chunk_size: int, start: date = None, end: date = None,
+                    status=None, after_id: int = None):
+    """Lists of rows, at most `chunk_size` each, one keyset query per chunk."""
+    while True:
+        stmt = export_query(model, start, end, status, after_id).limit(chunk_size)
+        try:
+            rows = db.execute(stmt).all()
+        finally:
+            db.rollback()       # read-only: release the connection and its lock
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        after_id = rows[-1].id
+
+
+# ===============================
+# Encoders (chunks of rows -> bytes)
+# ===============================
+def encode_csv(columns, row_chunks, header=True):
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    if header:
+        writer.writerow(columns)
+    for rows in row_chunks:
+        writer.writerows(rows)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def encode_ndjson(columns, row_chunks):
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    for rows in row_chunks:
+        yield "".join(dumps(dict(zip(columns, row))) + "\n" for row in rows).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back out, for streaming Parquet."""
+
+    def __init__(self):
+        super().__init__()
+        self._parts = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def arrow_schema(table):
+    fields = []
+    for column in table.columns:
+        if isinstance(column.type, Integer):
+            kind = pa.int64()
+        elif isinstance(column.type, Float):
+            kind = pa.float64()
+        elif isinstance(column.type, DateTime):
+            kind = pa.timestamp("us")
+        else:
+            kind = pa.string()
+        fields.append(pa.field(column.name, kind))
+    return pa.schema(fields)
+
+
+def _arrow_column(values, kind):
+    if pa.types.is_timestamp(kind):
+        return pa.array(values, type=pa.string()).cast(kind)
+    return pa.array(values, type=kind)
+
+
+def encode_parquet(schema, row_chunks):
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+        for rows in row_chunks:
+            columns = list(zip(*rows)) if rows else [()] * len(schema)
+            writer.write_table(pa.Table.from_arrays(
+                [_arrow_column(values, field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    yield sink.drain()      # footer, written on close
+
+
+def gzip_chunks(chunks, level: int = GZIP_LEVEL):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)     # 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# ===============================
+# Entry point
+# ===============================
+def export_stream(db, table: str, fmt: str = "csv", start: date = None, end: date = None,
+                  status=None, after_id: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  gzip: bool = False) -> Export:
+    """
+    Validates the request up front (ValueError) and returns an Export whose
+    `chunks` stream the file. The caller keeps `db` open until the stream ends.
+    A resumed CSV (after_id set) has no header row, so it can be appended.
+    """
+    model = EXPORTS.get(table)
+    if model is None:
+        raise ValueError(f"Unknown export table '{table}'. Choose from: {', '.join(EXPORTS)}.")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(FORMATS)}.")
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise ValueError("Parquet export needs pyarrow installed.")
+    if not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"chunk_size must be between 1 and {MAX_CHUNK_SIZE}.")
+    if start and end and end < start:
+        raise ValueError("end must not be before start.")
+
+    columns = [c.name for c in model.__table__.columns]
+    row_chunks = iter_row_chunks(db, model, chunk_size, start, end, status, after_id)
+
+    if fmt == "csv":
+        chunks = encode_csv(columns, row_chunks, header=after_id is None)
+    elif fmt == "ndjson":
+        chunks = encode_ndjson(columns, row_chunks)
+    else:
+        chunks = encode_parquet(arrow_schema(model.__table__), row_chunks)
+
+    media_type, extension = FORMATS[fmt]
+    filename = f"{table}.{extension}"
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        media_type, filename = "application/gzip", filename + ".gz"
+    return Export(media_type, filename, chunks)
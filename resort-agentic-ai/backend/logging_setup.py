@@ -0,0 +1,112 @@
+# backend/logging_setup.py
+"""
+Non-blocking, structured logging.
+
+Request threads only put records on a queue (QueueHandler); a background
+QueueListener thread formats them as one JSON object per line and does the
+stream I/O. Records marked `routine` (one per routed turn) are sampled at
+LOG_SAMPLE_RATE; warnings, errors and turns slower than LOG_SLOW_MS are
+always kept.
+
+Environment: LOG_LEVEL (INFO), LOG_SAMPLE_RATE (1.0), LOG_SLOW_MS (500).
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+
+# extra= fields copied into the JSON record when present
+STRUCTURED_FIELDS = ("session", "agent", "tier", "latency_ms", "text")
+
+_LISTENER = None
+_HANDLER = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps every non-routine record; samples routine ones unless slow."""
+
+    def __init__(self, sample_rate: float = 1.0, slow_ms: float = 500.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self._random = random.random
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not getattr(record, "routine", False):
+            return True
+        if (getattr(record, "latency_ms", None) or 0) >= self.slow_ms:
+            return True
+        return self.sample_rate >= 1.0 or self._random() < self.sample_rate
+
+
+class _StructuredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # keep exc_info for the JSON formatter instead of flattening it into msg
+        if record.exc_info:
+            return record
+        return super().prepare(record)
+
+
+def configure_logging(level=None, sample_rate=None, slow_ms=None, stream=None):
+    """
+    Route all logging through a queue to one background JSON writer.
+    Safe to call again (e.g. to change sampling); returns the listener.
+    """
+    global _LISTENER, _HANDLER
+
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    sample_rate = float(sample_rate if sample_rate is not None else os.getenv("LOG_SAMPLE_RATE", 1.0))
+    slow_ms = float(slow_ms if slow_ms is not None else os.getenv("LOG_SLOW_MS", 500))
+
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    _HANDLER = _StructuredQueueHandler(log_queue)
+    _HANDLER.addFilter(SamplingFilter(sample_rate, slow_ms))
+
+    root = logging.getLogger()
+    root.addHandler(_HANDLER)
+    root.setLevel(level)
+
+    _LISTENER = logging.handlers.QueueListener(log_queue, output)
+    _LISTENER.start()
+    return _LISTENER
+
+
+def shutdown_logging():
+    """Flush queued records and detach the queue handler."""
+    global _LISTENER, _HANDLER
+    if _HANDLER is not None:
+        logging.getLogger().removeHandler(_HANDLER)
+        _HANDLER = None
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
+
+
+atexit.register(shutdown_logging)
@@ -1,14 +1,32 @@
 # =========================
 # Environment
 # =========================
-from backend.agents.router import route_message
+from backend.agents.router import route_message, load_intent_model, llm_stats, RESPONSE_MEMO
+from backend.agents.registry import agent_stats
 from backend.models.room import Room
-from backend.models import room, order, service_request, menu
-from backend.database import engine, Base, SessionLocal
+from backend.models import room, order, service_request, menu, billing, reservation
+from backend.database import engine, Base, SessionLocal, DEFAULT_PROPERTY, use_property
+from backend.billing import (
+    get_room_bill, get_daily_revenue, checkout_room, set_order_status, ensure_rollups
+)
+from backend.admission import ADMISSION, AdmissionConfig, AdmissionRejected
+from backend.properties import (
+    PROPERTIES, DEFAULT_ROOMS, availability_index, check_property,
+    parse_room_numbers, provision_property, scoped_session_id
+)
+from backend.export import export_stream, DEFAULT_CHUNK_SIZE
+from backend.chat_history import CHAT_HISTORY
+from contextlib import contextmanager
+from datetime import date
+from typing import List, Optional
 from pydantic import BaseModel
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from backend.logging_setup import configure_logging
 from dotenv import load_dotenv
 load_dotenv()
+configure_logging()
+ADMISSION.configure(AdmissionConfig.from_env())
 
 # =========================
 # Standard Imports
@@ -39,21 +57,36 @@ Base.metadata.create_all(bind=engine)
 
 def initialize_rooms():
     db = SessionLocal()
+    has_rooms = db.query(Room).first() is not None
+    db.close()
 
-    if db.query(Room).count() == 0:
-        rooms = [
-            Room(room_number=room_no, is_available=True)
-            for room_no in range(101, 111)
-        ]
-        db.add_all(rooms)
-        db.commit()
+    # other properties are provisioned with `python -m backend.tools.provision_property`
+    if not has_rooms:
+        provision_property(DEFAULT_PROPERTY, parse_room_numbers(DEFAULT_ROOMS))
 
-    db.close()
+
+def initialize_rollups():
+    db = SessionLocal()
+    try:
+        ensure_rollups(db)
+    finally:
+        db.close()
+
+
+def initialize_availability():
+    db = SessionLocal()
+    try:
+        availability_index().load(db)
+    finally:
+        db.close()
 
 
 @app.on_event("startup")
 def startup_event():
     initialize_rooms()
+    initialize_rollups()
+    initialize_availability()
+    load_intent_model()
 
 # =========================
 # API Schemas
@@ -63,6 +96,35 @@ def startup_event():
 class ChatRequest(BaseModel):
     session_id: str
     message: str
+    property_id: str = DEFAULT_PROPERTY
+
+
+class OrderStatusRequest(BaseModel):
+    status: str
+
+
+class ReservationRequest(BaseModel):
+    room_number: int
+    check_in: date
+    check_out: date
+    guest_name: Optional[str] = None
+
+# =========================
+# Properties
+# =========================
+
+
+@contextmanager
+def property_scope(property_id: str):
+    """Runs the request against one property's shard and caches."""
+    try:
+        check_property(property_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    with use_property(property_id):
+        yield
 
 # =========================
 # Routes
@@ -76,5 +138,200 @@ def home():
 
 @app.post("/chat")
 def chat(req: ChatRequest):
-    response = route_message(req.session_id, req.message)
-    return {"response": response}
+    with property_scope(req.property_id):
+        session_id = scoped_session_id(req.session_id)
+        try:
+            with ADMISSION.admit(session_id):
+                response = route_message(session_id, req.message)
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=e.reason,
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        seq = CHAT_HISTORY.append_turn(session_id, req.message, response)
+    return {"response": response, "seq": seq}
+
+
+@app.get("/chat/{session_id}/history")
+def chat_history(session_id: str, before: Optional[int] = None, limit: int = 50,
+                 property_id: str = DEFAULT_PROPERTY):
+    with property_scope(property_id):
+        return CHAT_HISTORY.page(scoped_session_id(session_id), before, limit)
+
+
+@app.get("/metrics/admission")
+def admission_metrics():
+    return ADMISSION.stats()
+
+
+@app.get("/metrics/agents")
+def agents_metrics():
+    return agent_stats()
+
+
+@app.get("/metrics/llm")
+def llm_metrics():
+    return llm_stats()
+
+
+@app.get("/metrics/memo")
+def memo_metrics():
+    return RESPONSE_MEMO.stats()
+
+
+@app.get("/metrics/properties")
+def properties_metrics():
+    return PROPERTIES.stats()
+
+
+# =========================
+# Billing
+# =========================
+
+
+@app.get("/billing/rooms/{room_number}")
+def room_bill(room_number: int, property_id: str = DEFAULT_PROPERTY):
+    with property_scope(property_id):
+        db = SessionLocal()
+        try:
+            return get_room_bill(db, room_number)
+        finally:
+            db.close()
+
+
+@app.post("/billing/rooms/{room_number}/checkout")
+def room_checkout(room_number: int, property_id: str = DEFAULT_PROPERTY):
+    with property_scope(property_id):
+        db = SessionLocal()
+        try:
+            return checkout_room(db, room_number)
+        finally:
+            db.close()
+
+
+@app.get("/billing/revenue/{day}")
+def daily_revenue(day: str, property_id: str = DEFAULT_PROPERTY):
+    with property_scope(property_id):
+        db = SessionLocal()
+        try:
+            return get_daily_revenue(db, day)
+        finally:
+            db.close()
+
+
+@app.patch("/orders/{order_id}/status")
+def order_status(order_id: int, req: OrderStatusRequest, property_id: str = DEFAULT_PROPERTY):
+    with property_scope(property_id):
+        db = SessionLocal()
+        try:
+            order = set_order_status(db, order_id, req.status)
+            if order is None:
+                raise HTTPException(status_code=404, detail="Order not found")
+            return {"id": order.id, "status": order.status}
+        finally:
+            db.close()
+
+
+# =========================
+# Reservations
+# =========================
+
+
+@app.get("/availability")
+def availability(check_in: date, check_out: date, room_number: Optional[int] = None,
+                 property_id: str = DEFAULT_PROPERTY):
+    if check_out <= check_in:
+        raise HTTPException(status_code=400, detail="check_out must be after check_in")
+    with property_scope(property_id):
+        index = availability_index()
+        db = SessionLocal()
+        try:
+            index.ensure_loaded(db)
+        finally:
+            db.close()
+
+    if room_number is not None:
+        free = index.is_free(room_number, check_in, check_out)
+        if free is None:
+            raise HTTPException(status_code=404, detail="Room not found")
+        return {"room_number": room_number, "free": free}
+
+    rooms = index.free_rooms(check_in, check_out)
+    return {"free_rooms": rooms, "count": len(rooms)}
+
+
+@app.post("/reservations")
+def create_reservation(req: ReservationRequest, property_id: str = DEFAULT_PROPERTY):
+    with property_scope(property_id):
+        index = availability_index()
+        db = SessionLocal()
+        try:
+            try:
+                res = index.book(db, req.room_number, req.check_in, req.check_out, req.guest_name)
+            except ValueError as e:
+                raise HTTPException(status_code=409, detail=str(e))
+            return {
+                "id": res.id,
+                "room_number": res.room_number,
+                "check_in": res.check_in,
+                "check_out": res.check_out,
+                "status": res.status
+            }
+        finally:
+            db.close()
+
+
+@app.delete("/reservations/{reservation_id}")
+def cancel_reservation(reservation_id: int, property_id: str = DEFAULT_PROPERTY):
+    with property_scope(property_id):
+        index = availability_index()
+        db = SessionLocal()
+        try:
+            res = index.cancel(db, reservation_id)
+            if res is None:
+                raise HTTPException(status_code=404, detail="Reservation not found")
+            return {"id": res.id, "status": res.status}
+        finally:
+            db.close()
+
+
+# =========================
+# Bulk export
+# =========================
+
+
+def _close_after(chunks, db):
+    try:
+        yield from chunks
+    finally:
+        db.close()
+
+
+@app.get("/export/{table}")
+def export(
+    table: str,
+    format: str = "csv",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    status: Optional[List[str]] = Query(None),
+    after_id: Optional[int] = None,
+    gzip: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    property_id: str = DEFAULT_PROPERTY
+):
+    with property_scope(property_id):
+        db = SessionLocal()
+        try:
+            result = export_stream(
+                db, table, format, start=start, end=end, status=status,
+                after_id=after_id, chunk_size=chunk_size, gzip=gzip
+            )
+        except ValueError as e:
+            db.close()
+            raise HTTPException(status_code=400, detail=str(e))
+        return StreamingResponse(
+            _close_after(result.chunks, db),
+            media_type=result.media_type,
+            headers={"Content-Disposition": f'attachment; filename="{result.filename}"'}
+        )
@@ -2,3 +2,9 @@ from .room import Room
 from .order import Order
 from .service_request import ServiceRequest
 from .menu import MenuItem
+from .billing import RoomBill, DailyRevenue
+from .reservation import Reservation
+from .data_version import DataVersion
+
+# Keeps the billing rollups in step with every Order write
+from backend import billing  # noqa: E402,F401
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Float
+from backend.database import Base
+
+
+class RoomBill(Base):
+    """Running folio of a room: sum of its unsettled orders."""
+    __tablename__ = "room_bills"
+
+    room_number = Column(Integer, primary_key=True)
+    open_total = Column(Float, nullable=False, default=0.0)
+    open_orders = Column(Integer, nullable=False, default=0)
+
+
+class DailyRevenue(Base):
+    """Per-day, per-status restaurant totals."""
+    __tablename__ = "daily_revenue"
+
+    day = Column(String(10), primary_key=True)   # YYYY-MM-DD
+    status = Column(String, primary_key=True)
+    revenue = Column(Float, nullable=False, default=0.0)
+    order_count = Column(Integer, nullable=False, default=0)
+    item_count = Column(Integer, nullable=False, default=0)
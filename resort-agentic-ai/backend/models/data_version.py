@@ -0,0 +1,32 @@
+from sqlalchemy import DDL, Column, Integer, String, event
+from backend.database import Base
+
+# Tables read through in-process caches (property menu / rooms, memoized answers)
+VERSIONED_TABLES = ("menu_items", "rooms")
+
+
+class DataVersion(Base):
+    """
+    Write counter per table, bumped by SQLite triggers on every insert /
+    update / delete, whoever makes it (this worker, another one, raw SQL).
+    """
+    __tablename__ = "data_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+def _version_trigger(table: str, operation: str) -> DDL:
+    return DDL(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_{operation.lower()}_version "
+        f"AFTER {operation} ON {table} BEGIN "
+        f"INSERT OR IGNORE INTO data_versions (table_name, version) VALUES ('{table}', 0); "
+        f"UPDATE data_versions SET version = version + 1 WHERE table_name = '{table}'; "
+        f"END"
+    ).execute_if(dialect="sqlite")
+
+
+# after every create_all, so databases created before the triggers get them too
+for _table in VERSIONED_TABLES:
+    for _operation in ("INSERT", "UPDATE", "DELETE"):
+        event.listen(Base.metadata, "after_create", _version_trigger(_table, _operation))
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy.orm import column_property
 from backend.database import Base
 from datetime import datetime
 
@@ -6,10 +7,12 @@ from datetime import datetime
 class Order(Base):
     __tablename__ = "orders"
 
+    # active_history: the billing rollups (backend/billing.py) need the old
+    # values of the tracked columns even when set on an expired instance
     id = Column(Integer, primary_key=True, index=True)
-    room_number = Column(Integer)
+    room_number = column_property(Column(Integer), active_history=True)
     items = Column(String)
-    quantity = Column(String)
-    total_amount = Column(Float)
-    status = Column(String, default="Pending")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    quantity = column_property(Column(String), active_history=True)
+    total_amount = column_property(Column(Float), active_history=True)
+    status = column_property(Column(String, default="Pending"), active_history=True)
+    created_at = column_property(Column(DateTime, default=datetime.utcnow), active_history=True)
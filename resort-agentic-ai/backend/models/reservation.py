@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime
+from backend.database import Base
+from datetime import datetime
+
+
+class Reservation(Base):
+    __tablename__ = "reservations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    room_number = Column(Integer, index=True, nullable=False)
+    guest_name = Column(String, nullable=True)
+    check_in = Column(Date, nullable=False)
+    check_out = Column(Date, nullable=False)    # exclusive: the departure day
+    status = Column(String, default="Booked")   # Booked, Cancelled
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,264 @@
+# backend/properties.py
+"""
+Per-property caches for serving several resorts from one deployment.
+
+Each property has its own SQLite shard (see `backend.database`). The data the
+agents read on every turn (room numbers, the menu, the availability index) is
+cached per property and loaded on first use. At most MAX_ACTIVE_PROPERTIES
+caches are kept; the least recently used property is evicted and its shard's
+connections closed, and reloaded from the shard the next time that property is used.
+A commit that changes the menu or adds/removes rooms drops the cached menu
+and room numbers of that property; they are reloaded on the next turn.
+Writes from other workers or raw SQL are noticed through the shard's
+shared data versions (`backend.data_versions`) within a second.
+
+Environment: MAX_ACTIVE_PROPERTIES (64), DEFAULT_ROOMS ("101-110").
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.availability import AvailabilityIndex
+from backend.data_versions import SHARED_VERSIONS
+from backend.database import (
+    SessionLocal, current_property, dispose_engine,
+    shard_exists, use_property, validate_property
+)
+from backend.models.menu import MenuItem
+from backend.models.room import Room
+
+MAX_ACTIVE_PROPERTIES = int(os.getenv("MAX_ACTIVE_PROPERTIES", 64))
+DEFAULT_ROOMS = os.getenv("DEFAULT_ROOMS", "101-110")
+
+
+@dataclass(slots=True, frozen=True)
+class MenuEntry:
+    id: int
+    item_name: str
+    description: str
+    price: float
+
+
+class PropertyCache:
+    __slots__ = ("property_id", "rooms", "menu", "menu_by_id", "availability", "versions", "_lock")
+
+    def __init__(self, property_id: str):
+        self.property_id = property_id
+        self.rooms = None           # frozenset of room numbers
+        self.menu = None            # [MenuEntry] of available items
+        self.menu_by_id = None
+        self.availability = AvailabilityIndex()
+        self.versions = {}          # table -> shared data version when its part was loaded
+        self._lock = threading.Lock()
+
+    def _shared_version(self, table: str) -> int:
+        return SHARED_VERSIONS.get(self.property_id, (table,))[0]
+
+    def _drop_stale(self, table: str):
+        """Drop `table`'s part if another worker or raw SQL wrote it since it was loaded."""
+        loaded = self.versions.get(table)
+        if loaded is not None and self._shared_version(table) != loaded:
+            self.drop_catalog((table,))
+
+    # readers take a local reference: drop_catalog() may reset the attribute meanwhile
+    def get_rooms(self, db) -> frozenset:
+        self._drop_stale(Room.__tablename__)
+        rooms = self.rooms
+        if rooms is None:
+            with self._lock:
+                if self.rooms is None:
+                    version = self._shared_version(Room.__tablename__)    # before the read
+                    self.rooms = frozenset(r for (r,) in db.query(Room.room_number).all())
+                    self.versions[Room.__tablename__] = version
+                rooms = self.rooms
+        return rooms
+
+    def get_menu(self, db) -> list:
+        self._drop_stale(MenuItem.__tablename__)
+        menu = self.menu
+        if menu is None:
+            menu = self._load_menu(db)[0]
+        return menu
+
+    def get_menu_by_id(self, db) -> dict:
+        self._drop_stale(MenuItem.__tablename__)
+        menu_by_id = self.menu_by_id
+        if menu_by_id is None:
+            menu_by_id = self._load_menu(db)[1]
+        return menu_by_id
+
+    def _load_menu(self, db):
+        with self._lock:
+            if self.menu is None or self.menu_by_id is None:
+                version = self._shared_version(MenuItem.__tablename__)     # before the read
+                items = db.query(MenuItem).filter(MenuItem.available == True).all()
+                menu = [MenuEntry(i.id, i.item_name, i.description, i.price) for i in items]
+                self.menu_by_id = {entry.id: entry for entry in menu}
+                self.menu = menu
+                self.versions[MenuItem.__tablename__] = version
+            return self.menu, self.menu_by_id
+
+    def drop_catalog(self, tables):
+        """Forget the cached menu and/or room numbers after a write to `tables`."""
+        with self._lock:        # waits for a load in progress, which may have read the old rows
+            if MenuItem.__tablename__ in tables:
+                self.menu = self.menu_by_id = None
+                self.versions.pop(MenuItem.__tablename__, None)
+            if Room.__tablename__ in tables:
+                self.rooms = None
+                self.versions.pop(Room.__tablename__, None)
+
+
+class PropertyRegistry:
+    def __init__(self, max_active: int = MAX_ACTIVE_PROPERTIES):
+        self.max_active = max_active
+        self._caches = OrderedDict()        # property_id -> PropertyCache, least recent first
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, property_id: str = None) -> PropertyCache:
+        property_id = property_id or current_property()
+        with self._lock:
+            cache = self._caches.get(property_id)
+            if cache is not None:
+                self._caches.move_to_end(property_id)
+                return cache
+            cache = self._caches[property_id] = PropertyCache(property_id)
+            self.loads += 1
+            evicted = []
+            while len(self._caches) > self.max_active:
+                evicted.append(self._caches.popitem(last=False)[0])
+                self.evictions += 1
+        for old in evicted:
+            dispose_engine(old)
+        return cache
+
+    def peek(self, property_id: str):
+        """The property's cache if it is loaded (no load, no LRU update)."""
+        with self._lock:
+            return self._caches.get(property_id)
+
+    def invalidate(self, property_id: str = None):
+        """Drop a property's cached rooms / menu / availability (e.g. after provisioning)."""
+        with self._lock:
+            self._caches.pop(property_id or current_property(), None)
+
+    def clear(self):
+        with self._lock:
+            self._caches.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "active": len(self._caches),
+                "max_active": self.max_active,
+                "loads": self.loads,
+                "evictions": self.evictions
+            }
+
+
+PROPERTIES = PropertyRegistry()
+
+
+# ===============================
+# Cache invalidation on writes
+# ===============================
+@event.listens_for(Session, "after_flush")
+def _note_catalog_writes(session, flush_context):
+    # room availability flips on every booking; only the set of room numbers is cached
+    touched = {obj.__tablename__ for obj in (*session.new, *session.dirty, *session.deleted)
+               if isinstance(obj, MenuItem)}
+    touched |= {obj.__tablename__ for obj in (*session.new, *session.deleted)
+                if isinstance(obj, Room)}
+    if touched:
+        session.info.setdefault("catalog_tables", set()).update(touched)
+
+
+# insert=True: runs before the response memo bumps its data versions, so an
+# answer rendered at the new version never comes from the old cache
+@event.listens_for(Session, "after_commit", insert=True)
+def _drop_cached_catalog(session):
+    tables = session.info.pop("catalog_tables", None)
+    if tables:
+        cache = PROPERTIES.peek(getattr(session, "property_id", None) or current_property())
+        if cache is not None:
+            cache.drop_catalog(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_catalog_writes(session):
+    session.info.pop("catalog_tables", None)
+
+
+# ===============================
+# Current-property helpers (used by the agents)
+# ===============================
+def property_rooms(db) -> frozenset:
+    return PROPERTIES.get().get_rooms(db)
+
+
+def property_menu(db) -> list:
+    return PROPERTIES.get().get_menu(db)
+
+
+def menu_entry(db, item_id: int):
+    return PROPERTIES.get().get_menu_by_id(db).get(item_id)
+
+
+def availability_index() -> AvailabilityIndex:
+    return PROPERTIES.get().availability
+
+
+def scoped_session_id(session_id: str) -> str:
+    """
+    Chat session ids are only unique within a property. Every property is
+    prefixed, the default one too: property keys have no ':', so a client
+    id like "seaside:g1" can't reach another property's session.
+    """
+    return f"{current_property()}:{session_id}"
+
+
+def check_property(property_id: str) -> str:
+    """ValueError for a malformed key, LookupError for a property with no shard."""
+    validate_property(property_id)
+    if not shard_exists(property_id):
+        raise LookupError(f"Unknown property '{property_id}'.")
+    return property_id
+
+
+# ===============================
+# Provisioning
+# ===============================
+def parse_room_numbers(spec: str) -> list:
+    """Room numbers from a spec like "101-110,201-205,301"."""
+    rooms = []
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        rooms.extend(range(int(lo), int(hi or lo) + 1))
+    return rooms
+
+
+def provision_property(property_id: str, room_numbers, menu_rows=()):
+    """Create (or top up) a property's shard with rooms and menu items."""
+    with use_property(property_id):
+        db = SessionLocal()
+        try:
+            existing = {r for (r,) in db.query(Room.room_number).all()}
+            db.add_all([
+                Room(room_number=n, is_available=True)
+                for n in room_numbers if n not in existing
+            ])
+            if menu_rows and db.query(MenuItem).first() is None:
+                db.add_all([MenuItem(available=True, **row) for row in menu_rows])
+            db.commit()
+        finally:
+            db.close()
+        PROPERTIES.invalidate(property_id)
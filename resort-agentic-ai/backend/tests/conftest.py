@@ -0,0 +1,83 @@
+"""
+Hermetic test database and state.
+
+Each pytest process (every pytest-xdist worker) gets its own SQLite file
+seeded from fixtures/menu.json (a snapshot of Restaurant_Menu.xlsx, see
+`python -m backend.tools.load_menu --snapshot`) and rooms 101-110, plus a
+directory for property shards. Before every test the mutable tables and
+in-memory agent state are reset.
+"""
+import json
+import os
+
+import pytest
+
+# no LLM calls or decision capture from tests
+os.environ["OPENAI_API_KEY"] = ""
+os.environ.pop("ROUTER_CAPTURE_PATH", None)
+os.environ.pop("LLM_PROVIDERS", None)
+
+from backend.database import Base, SessionLocal, configure_database  # noqa: E402
+from backend.models import (  # noqa: E402
+    Room, Order, ServiceRequest, RoomBill, DailyRevenue, Reservation
+)
+from backend.tools.load_menu import load_menu_rows  # noqa: E402
+from backend.agents import router  # noqa: E402
+from backend.agents.restaurant import SESSION_ORDERS  # noqa: E402
+from backend.agents.room_service import PENDING_REQUESTS  # noqa: E402
+from backend.properties import PROPERTIES  # noqa: E402
+from backend.admission import ADMISSION, AdmissionConfig  # noqa: E402
+from backend.chat_history import CHAT_HISTORY  # noqa: E402
+from backend.data_versions import SHARED_VERSIONS  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+ROOM_NUMBERS = range(101, 111)
+MUTABLE_TABLES = (Order, ServiceRequest, RoomBill, DailyRevenue, Reservation)
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_engine(tmp_path_factory):
+    root = tmp_path_factory.mktemp("db")
+    engine = configure_database(
+        f"sqlite:///{root / 'resort-test.db'}",
+        property_url=f"sqlite:///{root / 'properties'}/{{property}}.db"
+    )
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    db.add_all([Room(room_number=n, is_available=True) for n in ROOM_NUMBERS])
+    load_menu_rows(db, load_fixture("menu.json"))
+    db.close()
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clean_state(database_engine):
+    with database_engine.begin() as conn:
+        for model in MUTABLE_TABLES:
+            conn.execute(model.__table__.delete())
+        conn.execute(Room.__table__.update().values(is_available=True))
+
+    SESSION_ORDERS.clear()
+    PENDING_REQUESTS.clear()
+    CHAT_HISTORY.clear()
+    PROPERTIES.clear()
+    SHARED_VERSIONS.clear()
+    ADMISSION.configure(AdmissionConfig())
+    router.INTENT_CLASSIFIER = None
+    router.RESPONSE_MEMO.clear()
+    yield
+
+
+@pytest.fixture
+def db(database_engine):
+    session = SessionLocal()
+    yield session
+    session.close()
@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.admission import AdmissionController, AdmissionConfig, AdmissionRejected
+from backend.admission import ADMISSION
+
+# -----------------------------
+# Helper
+# -----------------------------
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_session_token_bucket_refills():
+    clock = FakeClock()
+    ctl = AdmissionController(AdmissionConfig(session_rate=1.0, session_burst=2), clock=clock)
+
+    for _ in range(2):
+        with ctl.admit("s1"):
+            pass
+    with pytest.raises(AdmissionRejected) as exc:
+        with ctl.admit("s1"):
+            pass
+    assert exc.value.status_code == 429
+
+    # other sessions are unaffected, and the bucket refills over time
+    with ctl.admit("s2"):
+        pass
+    clock.now += 1.0
+    with ctl.admit("s1"):
+        pass
+    assert ctl.stats()["shed_rate_limited"] == 1
+
+
+def test_saturated_server_sheds_with_503():
+    ctl = AdmissionController(AdmissionConfig(max_concurrent=1, max_queue=1, queue_timeout=0.05))
+    release = threading.Event()
+    entered = threading.Event()
+
+    def hold():
+        with ctl.admit("holder"):
+            entered.set()
+            release.wait(2)
+
+    t = threading.Thread(target=hold)
+    t.start()
+    entered.wait(2)
+
+    # queue has room: waits, then times out
+    with pytest.raises(AdmissionRejected) as exc:
+        with ctl.admit("waiter"):
+            pass
+    assert exc.value.status_code == 503
+
+    release.set()
+    t.join()
+    stats = ctl.stats()
+    assert stats["queued"] == 1
+    assert stats["shed_queue_timeout"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_full_queue_rejects_immediately():
+    ctl = AdmissionController(AdmissionConfig(max_concurrent=1, max_queue=0))
+    with ctl.admit("a"):
+        with pytest.raises(AdmissionRejected):
+            with ctl.admit("b"):
+                pass
+    assert ctl.stats()["shed_queue_full"] == 1
+
+
+def test_llm_budget_degrades():
+    clock = FakeClock()
+    ctl = AdmissionController(AdmissionConfig(llm_rate=0.0, llm_burst=1), clock=clock)
+    with ctl.llm_slot() as allowed:
+        assert allowed
+    with ctl.llm_slot() as allowed:
+        assert not allowed
+    stats = ctl.stats()
+    assert stats["llm_calls"] == 1
+    assert stats["llm_degraded"] == 1
+
+
+def test_llm_tokens_not_spent_while_slots_are_busy():
+    clock = FakeClock()
+    ctl = AdmissionController(AdmissionConfig(llm_max_concurrent=1, llm_rate=0.0, llm_burst=2), clock=clock)
+    release = ctl.llm_call()
+    assert ctl.llm_call() is None
+    assert ctl.llm_extra_call() is None
+    release()
+    # both denials happened at the slot, so the second token is still there
+    second = ctl.llm_call()
+    assert second is not None
+    second()
+    assert ctl.llm_call() is None
+    stats = ctl.stats()
+    assert (stats["llm_calls"], stats["llm_degraded"], stats["llm_extra_denied"]) == (2, 2, 1)
+
+
+def test_chat_returns_429_when_rate_limited():
+    from backend.main import app
+
+    ADMISSION.configure(AdmissionConfig(session_rate=0.0, session_burst=1))
+    try:
+        client = TestClient(app)
+        assert client.post("/chat", json={"session_id": "rl", "message": "gym"}).status_code == 200
+        response = client.post("/chat", json={"session_id": "rl", "message": "gym"})
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+        assert client.get("/metrics/admission").json()["shed_rate_limited"] == 1
+    finally:
+        ADMISSION.configure(AdmissionConfig())
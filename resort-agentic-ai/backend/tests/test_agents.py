@@ -0,0 +1,59 @@
+from datetime import date
+
+from backend.agents.router import route_message
+from backend.billing import get_room_bill
+from backend.models.order import Order
+from backend.models.service_request import ServiceRequest
+from backend.properties import availability_index
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_restaurant_order_is_stored_and_billed(db):
+    route_message("a1", "order two idli and one vada")
+    route_message("a1", "102")
+
+    order = db.query(Order).one()
+    assert order.room_number == 102
+    assert order.items == "Plain Idli x2, Medu Vada x1"
+    assert order.total_amount == 250
+    assert get_room_bill(db, 102)["open_total"] == 250
+
+
+def test_room_service_request_is_stored(db):
+    assert "room number" in route_message("a2", "Can I get some towels?")
+    assert db.query(ServiceRequest).count() == 0        # not without a room
+    assert "Invalid room number" in route_message("a2", "room 999")
+    assert db.query(ServiceRequest).count() == 0
+    assert "room 105" in route_message("a2", "105")
+
+    request = db.query(ServiceRequest).one()
+    assert request.request_type == "Extra Towels"
+    assert request.room_number == 105
+    assert request.status == "Pending"
+
+    route_message("a4", "please clean room 104")
+    assert db.query(ServiceRequest).filter(ServiceRequest.room_number == 104).count() == 1
+
+
+def test_unanswered_room_question_is_dropped(db):
+    route_message("a5", "I need a blanket")
+    assert "check-in" in route_message("a5", "what is check in time?").lower()
+    route_message("a5", "102")
+    assert db.query(ServiceRequest).count() == 0
+
+
+def test_booking_shows_in_receptionist_replies(db):
+    availability_index().book(db, 103, date(2030, 1, 10), date(2030, 1, 15), "Test Guest")
+
+    reply = route_message("a3", "Is room 103 free from 2030-01-12 to 2030-01-14?")
+    assert "booked" in reply
+    reply = route_message("a3", "How many rooms free from 2030-01-12 to 2030-01-14?")
+    assert "**9**" in reply
+
+
+def test_each_test_starts_with_empty_tables(db):
+    assert db.query(Order).count() == 0
+    assert db.query(ServiceRequest).count() == 0
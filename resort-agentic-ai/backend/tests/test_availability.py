@@ -0,0 +1,84 @@
+from datetime import date
+
+import pytest
+
+from backend.models.reservation import Reservation
+from backend.availability import AvailabilityIndex
+from backend.properties import availability_index
+from backend.agents.router import route_message
+from backend.utils.dates import parse_date_range
+
+D = date
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_index_range_queries():
+    index = AvailabilityIndex()
+    index.load_rows([101, 102], [
+        (101, D(2026, 3, 10), D(2026, 3, 12)),
+        (101, D(2026, 3, 15), D(2026, 3, 20)),
+    ])
+
+    assert index.is_free(101, D(2026, 3, 12), D(2026, 3, 15))      # back-to-back stays
+    assert not index.is_free(101, D(2026, 3, 11), D(2026, 3, 13))
+    assert not index.is_free(101, D(2026, 3, 16), D(2026, 3, 17))  # inside a stay
+    assert not index.is_free(101, D(2026, 3, 1), D(2026, 3, 30))   # covers a stay
+    assert index.is_free(999, D(2026, 3, 1), D(2026, 3, 2)) is None
+    assert index.free_rooms(D(2026, 3, 11), D(2026, 3, 12)) == [102]
+
+
+def test_book_and_cancel_update_db_and_index(db):
+    index = AvailabilityIndex()
+    res = index.book(db, 101, D(2026, 5, 1), D(2026, 5, 4), "Asha")
+
+    assert db.query(Reservation).count() == 1
+    assert not index.is_free(101, D(2026, 5, 2), D(2026, 5, 3))
+    with pytest.raises(ValueError):
+        index.book(db, 101, D(2026, 5, 3), D(2026, 5, 5))
+
+    index.cancel(db, res.id)
+    assert index.is_free(101, D(2026, 5, 2), D(2026, 5, 3))
+
+    # a fresh index loaded from the DB ignores cancelled stays
+    reloaded = AvailabilityIndex()
+    reloaded.load(db)
+    assert reloaded.free_rooms(D(2026, 5, 1), D(2026, 5, 4)) == list(range(101, 111))
+
+
+def test_parse_date_range():
+    today = D(2026, 10, 19)     # a Monday
+    assert parse_date_range("free from the 12th to the 15th", today) == (D(2026, 11, 12), D(2026, 11, 15))
+    assert parse_date_range("march 12 to 15", today) == (D(2027, 3, 12), D(2027, 3, 15))
+    assert parse_date_range("2026-12-30 to 2027-01-02", today) == (D(2026, 12, 30), D(2027, 1, 2))
+    assert parse_date_range("rooms free next weekend", today) == (D(2026, 10, 23), D(2026, 10, 25))
+    assert parse_date_range("is room 101 free", today) is None
+    assert parse_date_range("is room 12 free for 2-3 nights", today) is None
+    assert parse_date_range("any room for 2 to 3 people", today) is None
+    assert parse_date_range("free 2-3 nov", today) == (D(2026, 11, 2), D(2026, 11, 3))
+    assert parse_date_range("free from 2-4", today) == (D(2026, 11, 2), D(2026, 11, 4))
+
+
+def test_weekend_ranges():
+    monday, friday, saturday, sunday = D(2026, 10, 19), D(2026, 10, 23), D(2026, 10, 24), D(2026, 10, 25)
+    upcoming, following = (D(2026, 10, 23), D(2026, 10, 25)), (D(2026, 10, 30), D(2026, 11, 1))
+
+    assert parse_date_range("this weekend", monday) == upcoming
+    assert parse_date_range("next weekend", monday) == upcoming
+    assert parse_date_range("this weekend", friday) == upcoming
+    assert parse_date_range("next weekend", friday) == following
+    assert parse_date_range("this weekend", saturday) == (saturday, D(2026, 10, 25))
+    assert parse_date_range("next weekend", saturday) == following
+    assert parse_date_range("this weekend", sunday) == following
+    assert parse_date_range("next weekend", sunday) == (D(2026, 11, 6), D(2026, 11, 8))
+
+
+def test_receptionist_answers_range_questions():
+    availability_index().load_rows([101, 102, 103], [(101, D(2030, 1, 10), D(2030, 1, 15))])
+
+    reply = route_message("av1", "Is room 101 free from 2030-01-12 to 2030-01-14?")
+    assert "booked" in reply
+    reply = route_message("av1", "How many rooms free from 2030-01-12 to 2030-01-14?")
+    assert "**2**" in reply
@@ -0,0 +1,101 @@
+from backend.models.order import Order
+from backend.billing import (
+    get_room_bill, get_daily_revenue, set_order_status, checkout_room,
+    rebuild_rollups, update_order_status_sql, item_count
+)
+
+# -----------------------------
+# Helper
+# -----------------------------
+
+
+def add_order(db, room, quantity, total, status="Confirmed"):
+    order = Order(room_number=room, items="x", quantity=quantity,
+                  total_amount=total, status=status)
+    db.add(order)
+    db.commit()
+    return order
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_item_count():
+    assert item_count("2; 1") == 3
+    assert item_count("4") == 4
+    assert item_count(None) == 0
+
+
+def test_insert_updates_room_bill_and_revenue(db):
+    order = add_order(db, 101, "2; 1", 320.0)
+    add_order(db, 101, "1", 80.0)
+    add_order(db, 102, "3", 240.0)
+
+    assert get_room_bill(db, 101) == {"room_number": 101, "open_total": 400.0, "open_orders": 2}
+    day = order.created_at.strftime("%Y-%m-%d")
+    revenue = get_daily_revenue(db, day)
+    assert revenue["revenue"] == 640.0
+    assert revenue["orders"] == 3
+    assert revenue["items"] == 7
+
+
+def test_status_change_moves_rollups(db):
+    order = add_order(db, 101, "2", 200.0)
+    day = order.created_at.strftime("%Y-%m-%d")
+
+    set_order_status(db, order.id, "Served")
+    assert get_daily_revenue(db, day)["by_status"] == {
+        "Served": {"revenue": 200.0, "orders": 1, "items": 2}
+    }
+    assert get_room_bill(db, 101)["open_total"] == 200.0
+
+    set_order_status(db, order.id, "Cancelled")
+    assert get_room_bill(db, 101)["open_total"] == 0.0
+    assert get_daily_revenue(db, day)["revenue"] == 0.0
+
+
+def test_changes_to_expired_order_keep_rollups_consistent(db):
+    order = add_order(db, 101, "2", 200.0)      # committed: every attribute expired
+    order.status = "Paid"
+    db.commit()
+    assert rebuild_rollups(db, check_only=True) == []
+
+    order.total_amount = 150.0
+    order.room_number = 102
+    order.status = "Served"
+    db.commit()
+    assert rebuild_rollups(db, check_only=True) == []
+    assert get_room_bill(db, 101)["open_total"] == 0.0
+    assert get_room_bill(db, 102)["open_total"] == 150.0
+
+
+def test_checkout_settles_open_orders(db):
+    add_order(db, 103, "1", 90.0)
+    add_order(db, 103, "2", 180.0)
+
+    bill = checkout_room(db, 103)
+    assert bill["open_total"] == 270.0
+    assert get_room_bill(db, 103)["open_orders"] == 0
+
+
+def test_raw_status_update_keeps_rollups_consistent(db):
+    order = add_order(db, 104, "1", 150.0)
+    conn = db.connection().connection.driver_connection
+
+    assert update_order_status_sql(conn, order.id, "Paid")
+    conn.commit()
+    db.expire_all()
+
+    assert get_room_bill(db, 104)["open_total"] == 0.0
+    assert rebuild_rollups(db, check_only=True) == []
+
+
+def test_rebuild_detects_and_fixes_drift(db):
+    add_order(db, 105, "1", 100.0)
+    db.execute(Order.__table__.update().values(total_amount=999.0))
+    db.commit()
+
+    assert rebuild_rollups(db) != []
+    assert rebuild_rollups(db, check_only=True) == []
+    assert get_room_bill(db, 105)["open_total"] == 999.0
@@ -0,0 +1,71 @@
+from fastapi.testclient import TestClient
+
+from backend.chat_history import ChatHistoryStore, ChatLog
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_log_pages_backwards_oldest_first():
+    log = ChatLog()
+    for i in range(10):
+        log.append("user" if i % 2 == 0 else "assistant", f"msg {i} ✅")
+
+    messages, has_more = log.page(limit=3)
+    assert [m["seq"] for m in messages] == [7, 8, 9]
+    assert messages[-1] == {"seq": 9, "role": "assistant", "text": "msg 9 ✅"}
+    assert has_more
+
+    messages, has_more = log.page(before=3, limit=5)
+    assert [m["seq"] for m in messages] == [0, 1, 2]
+    assert not has_more
+
+
+def test_trim_keeps_sequence_numbers():
+    log = ChatLog()
+    for i in range(10):
+        log.append("user", f"m{i}")
+    log.trim(4)
+
+    assert len(log) == 4
+    messages, has_more = log.page()
+    assert [(m["seq"], m["text"]) for m in messages] == [(6, "m6"), (7, "m7"), (8, "m8"), (9, "m9")]
+    assert not has_more
+    assert log.page(before=6)[0] == []
+    assert log.append("user", "m10") == 10
+
+
+def test_store_bounds_messages_and_sessions():
+    store = ChatHistoryStore(max_messages=8, max_sessions=2)
+    store.append_turn("b", "hi", "hello")
+    for i in range(20):
+        store.append_turn("a", f"q{i}", f"r{i}")
+    store.append_turn("c", "hi", "hello")
+
+    assert store.page("b")["messages"] == []      # least recently active, dropped
+    page = store.page("a", limit=100)
+    assert len(page["messages"]) <= 10
+    assert page["messages"][-1] == {"seq": 39, "role": "assistant", "text": "r19"}
+    assert store.stats()["sessions"] == 2
+
+
+def test_chat_endpoint_records_history():
+    from backend.main import app
+
+    client = TestClient(app)
+    seqs = [
+        client.post("/chat", json={"session_id": "h1", "message": m}).json()["seq"]
+        for m in ("gym", "spa", "pool")
+    ]
+    assert seqs == [1, 3, 5]
+
+    page = client.get("/chat/h1/history", params={"limit": 2}).json()
+    assert [m["text"] for m in page["messages"]] == ["pool", page["messages"][1]["text"]]
+    assert page["messages"][1]["role"] == "assistant"
+    assert page["has_more"]
+
+    page = client.get("/chat/h1/history", params={"before": 4, "limit": 10}).json()
+    assert [m["seq"] for m in page["messages"]] == [0, 1, 2, 3]
+    assert page["messages"][0] == {"seq": 0, "role": "user", "text": "gym"}
+    assert not page["has_more"]
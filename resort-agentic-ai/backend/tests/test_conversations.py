@@ -0,0 +1,26 @@
+import json
+import os
+
+import pytest
+
+from backend.agents.router import route_message
+
+# -----------------------------
+# Helper
+# -----------------------------
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "conversations.json")
+
+with open(FIXTURE, encoding="utf-8") as f:
+    CONVERSATIONS = json.load(f)
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+@pytest.mark.parametrize("case", CONVERSATIONS, ids=[c["id"] for c in CONVERSATIONS])
+def test_conversation(case):
+    for message, expected in case["turns"]:
+        reply = route_message(case["id"], message)
+        assert expected in reply, f"{message!r} -> {reply!r}"
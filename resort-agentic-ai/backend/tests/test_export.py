@@ -0,0 +1,132 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from backend.database import SessionLocal
+from backend.export import export_stream, PARQUET_AVAILABLE
+from backend.models.order import Order
+from backend.models.service_request import ServiceRequest
+
+# -----------------------------
+# Helper
+# -----------------------------
+
+
+def add_orders(db, n=12):
+    for i in range(n):
+        db.add(Order(
+            room_number=101 + i % 3,
+            items="Upma x1",
+            quantity="1",
+            total_amount=100.0,
+            status=("Confirmed", "Paid", "Cancelled")[i % 3],
+            created_at=datetime(2026, 3, 1 + i, 9, 30)
+        ))
+    db.commit()
+
+
+def body(db, *args, **kwargs):
+    return b"".join(export_stream(db, *args, **kwargs).chunks)
+
+
+def ndjson_ids(data):
+    return [json.loads(line)["id"] for line in data.decode().splitlines()]
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_csv_streams_every_row_in_id_order(db):
+    add_orders(db)
+    export = export_stream(db, "orders", "csv", chunk_size=5)
+    chunks = list(export.chunks)
+    assert len(chunks) >= 3
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert [int(r["id"]) for r in rows] == list(range(1, 13))
+    assert rows[0]["created_at"].startswith("2026-03-01 09:30:00")
+    assert export.filename == "orders.csv"
+
+
+def test_date_and_status_filters(db):
+    add_orders(db)
+    data = body(db, "orders", "ndjson", start=date(2026, 3, 2), end=date(2026, 3, 8), status=["Paid"])
+    assert ndjson_ids(data) == [2, 5, 8]
+
+
+def test_resume_after_id(db):
+    add_orders(db)
+    data = body(db, "orders", "csv", after_id=9)
+    lines = data.decode().splitlines()
+    assert [int(line.split(",")[0]) for line in lines] == [10, 11, 12]    # no header on resume
+
+
+def test_gzip_round_trip(db):
+    add_orders(db)
+    export = export_stream(db, "orders", "ndjson", gzip=True, chunk_size=4)
+    assert export.filename == "orders.ndjson.gz"
+    assert ndjson_ids(gzip.decompress(b"".join(export.chunks))) == list(range(1, 13))
+
+
+@pytest.mark.skipif(not PARQUET_AVAILABLE, reason="pyarrow not installed")
+def test_parquet_round_trip(db):
+    import pyarrow.parquet as pq
+
+    add_orders(db)
+    table = pq.read_table(io.BytesIO(body(db, "orders", "parquet", chunk_size=5)))
+    assert table.num_rows == 12
+    assert table.column("id").to_pylist() == list(range(1, 13))
+    assert table.column("created_at").to_pylist()[0] == datetime(2026, 3, 1, 9, 30)
+
+
+def test_service_requests_export(db):
+    db.add(ServiceRequest(room_number=104, request_type="Extra Towels", status="Pending"))
+    db.commit()
+    rows = list(csv.DictReader(io.StringIO(body(db, "service_requests", "csv").decode())))
+    assert rows[0]["request_type"] == "Extra Towels"
+
+
+def test_invalid_requests_rejected(db):
+    with pytest.raises(ValueError):
+        export_stream(db, "rooms")
+    with pytest.raises(ValueError):
+        export_stream(db, "orders", "xlsx")
+    with pytest.raises(ValueError):
+        export_stream(db, "orders", chunk_size=0)
+
+
+def test_export_endpoint(db):
+    from backend.main import app
+
+    add_orders(db)
+    client = TestClient(app)
+    response = client.get("/export/orders", params={"format": "ndjson", "status": ["Paid", "Cancelled"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "orders.ndjson" in response.headers["content-disposition"]
+    assert ndjson_ids(response.content) == [2, 3, 5, 6, 8, 9, 11, 12]
+    assert client.get("/export/orders", params={"format": "xml"}).status_code == 400
+
+
+def test_writes_commit_while_export_is_paused(db):
+    add_orders(db)
+    chunks = export_stream(db, "orders", "ndjson", chunk_size=5).chunks
+    first = next(chunks)            # slow client: the download stops here
+
+    writer = SessionLocal()
+    try:
+        writer.execute(text("PRAGMA busy_timeout = 100"))
+        writer.add(Order(room_number=101, items="Idli x2", quantity="2", total_amount=80.0,
+                         status="Confirmed", created_at=datetime(2026, 4, 1, 8, 0)))
+        writer.commit()
+    finally:
+        writer.close()
+
+    rest = b"".join(chunks)
+    assert ndjson_ids(first + rest) == list(range(1, 14))
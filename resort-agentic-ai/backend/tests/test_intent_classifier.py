@@ -0,0 +1,127 @@
+import json
+import random
+
+import pytest
+
+from backend.agents import router
+from backend.agents.intent_classifier import IntentClassifier
+from backend.agents.restaurant import SESSION_ORDERS
+from backend.tools import train_intent
+from backend.tools.train_intent import read_examples
+
+EXAMPLES = [
+    ("i am starving", "restaurant"),
+    ("i am so starving right now", "restaurant"),
+    ("what do you serve tonight", "restaurant"),
+    ("what do you serve for supper", "restaurant"),
+    ("please tidy my room", "room_service"),
+    ("please tidy up the room", "room_service"),
+    ("need fresh sheets", "room_service"),
+    ("need fresh sheets and soap", "room_service"),
+    ("what time can we arrive", "receptionist"),
+    ("what time can we arrive tomorrow", "receptionist"),
+    ("is there wifi", "receptionist"),
+    ("is there wifi in the lobby", "receptionist"),
+]
+
+# -----------------------------
+# Helper
+# -----------------------------
+
+
+@pytest.fixture
+def model():
+    return IntentClassifier.train(
+        [m for m, _ in EXAMPLES], [l for _, l in EXAMPLES], min_df=1, epochs=400
+    )
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_classifier_learns_training_set(model):
+    for message, label in EXAMPLES:
+        assert model.predict(message)[0] == label
+
+
+def test_model_file_roundtrip(model, tmp_path):
+    path = tmp_path / "intent.npz"
+    model.save(path)
+    loaded = IntentClassifier.load(path)
+
+    assert loaded.classes == model.classes
+    assert loaded.predict("i am starving") == pytest.approx(model.predict("i am starving"))
+
+
+def test_router_uses_classifier_tier(model, tmp_path):
+    path = tmp_path / "intent.npz"
+    model.save(path)
+    SESSION_ORDERS.clear()
+    try:
+        router.load_intent_model(str(path), threshold=0.0)
+        assert router.decide_route("ic1", "what time can we arrive") == ("receptionist", "classifier")
+        # keyword tiers still win
+        assert router.decide_route("ic1", "show me the menu") == ("restaurant", "keyword")
+    finally:
+        router.load_intent_model(str(tmp_path / "missing.npz"))
+    assert router.INTENT_CLASSIFIER is None
+
+
+def test_training_skips_own_and_session_decisions(tmp_path):
+    rows = [
+        {"message": "is there wifi", "agent": "receptionist", "tier": "llm"},
+        {"message": "i fancy soup", "agent": "room_service", "tier": "classifier"},
+        {"message": "need an iron", "agent": "restaurant", "tier": "classifier", "label": "room_service"},
+        {"message": "2", "agent": "restaurant", "tier": "session"},
+        {"message": "any parking", "agent": "receptionist", "tier": "llm_fallback"},
+    ]
+    path = tmp_path / "captures.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+
+    messages, labels = read_examples([str(path)])
+    assert dict(zip(messages, labels)) == {"is there wifi": "receptionist", "need an iron": "room_service"}
+
+
+def test_keyword_guess_without_llm_answer_is_not_an_llm_label(tmp_path, monkeypatch):
+    path = tmp_path / "captures.jsonl"
+    monkeypatch.setattr(router, "CAPTURE_PATH", str(path))
+    router.route_message("lf1", "qwzx")         # no provider configured in tests
+
+    row = json.loads(path.read_text(encoding="utf-8"))
+    assert row["tier"] == "llm_fallback"
+    assert read_examples([str(path)]) == ([], [])
+
+
+def test_threshold_calibrated_and_stored(model, tmp_path):
+    threshold, precision, coverage = model.calibrate(
+        [m for m, _ in EXAMPLES], [l for _, l in EXAMPLES], min_precision=1.0)
+    assert precision == 1.0 and coverage == 1.0
+    wrong = [(m, "room_service" if l == "restaurant" else "restaurant") for m, l in EXAMPLES]
+    assert model.calibrate([m for m, _ in wrong], [l for _, l in wrong], 0.5) is None
+
+    model.threshold = threshold
+    path = tmp_path / "intent.npz"
+    model.save(path)
+    try:
+        router.load_intent_model(str(path))
+        assert router.INTENT_THRESHOLD == pytest.approx(threshold)
+    finally:
+        router.load_intent_model(str(tmp_path / "missing.npz"))
+
+
+def test_imprecise_model_not_written_to_startup_path(tmp_path, monkeypatch):
+    # random labels: nothing to learn
+    rnd = random.Random(0)
+    rows = [{"message": f"note number {i}", "agent": rnd.choice(["receptionist", "restaurant"]),
+             "tier": "llm"} for i in range(100)]
+    captures = tmp_path / "captures.jsonl"
+    captures.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+    startup = tmp_path / "intent_model.npz"
+    monkeypatch.setattr(train_intent, "DEFAULT_INTENT_MODEL_PATH", str(startup))
+
+    assert train_intent.main([str(captures), "--out", str(startup), "--min-df", "1"]) == 1
+    assert not startup.exists()
+    elsewhere = tmp_path / "candidate.npz"
+    assert train_intent.main([str(captures), "--out", str(elsewhere), "--min-df", "1"]) == 0
+    assert IntentClassifier.load(elsewhere).threshold is None
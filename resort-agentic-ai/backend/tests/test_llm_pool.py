@@ -0,0 +1,150 @@
+import time
+
+import pytest
+
+from backend.admission import AdmissionConfig, AdmissionController
+from backend.agents.llm_pool import (
+    LLM_POOL, LLMPoolConfig, LLMUnavailable, ProviderPool, ProviderSpec
+)
+from backend.agents.llm_router import llm_decide
+from backend.tools.stub_llm_server import StubLLMServer
+
+# -----------------------------
+# Helper
+# -----------------------------
+
+MESSAGES = [{"role": "user", "content": "where do I get breakfast"}]
+
+
+@pytest.fixture
+def stubs():
+    servers = {}
+
+    def start(name, **settings):
+        servers[name] = StubLLMServer(**settings).start()
+        return servers[name]
+
+    yield start
+    for server in servers.values():
+        server.stop()
+
+
+def make_pool(*servers, **config):
+    specs = [ProviderSpec(f"p{i}", "stub", server.base_url) for i, server in enumerate(servers)]
+    return ProviderPool(specs, LLMPoolConfig(**{"timeout": 3.0, **config}))
+
+
+def timed(pool, **kwargs):
+    started = time.perf_counter()
+    answer = pool.complete(MESSAGES, **kwargs)
+    return answer, time.perf_counter() - started
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_hedges_after_p95_of_slow_provider(stubs):
+    slow = stubs("slow", reply="restaurant", delay=0.02)
+    fast = stubs("fast", reply="room_service", delay=0.02)
+    pool = make_pool(slow, fast, min_samples=5, hedge_default_delay=1.0)
+
+    for _ in range(5):                      # p0 has a ~20 ms p95 now
+        assert pool.complete(MESSAGES) == "restaurant"
+    slow.delay = 1.5
+
+    answer, elapsed = timed(pool)
+    assert answer == "room_service"
+    assert elapsed < 0.5
+
+    stats = pool.stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+    assert stats["providers"]["p1"]["hedges"] == 1
+    assert stats["providers"]["p1"]["wins"] == 1
+    assert stats["providers"]["p0"]["p95_ms"] < 500
+
+
+def test_fails_over_on_error_and_invalid_answer(stubs):
+    broken = stubs("broken", status=500)
+    confused = stubs("confused", reply="I think the restaurant?")
+    good = stubs("good", reply="restaurant")
+    pool = make_pool(broken, confused, good)
+
+    answer, elapsed = timed(pool, validate=lambda text: text in ("restaurant", "receptionist"))
+    assert answer == "restaurant"
+    assert elapsed < 0.5                    # no hedge delay waited
+
+    providers = pool.stats()["providers"]
+    assert providers["p0"]["errors"] == 1
+    assert providers["p1"]["invalid"] == 1 and providers["p1"]["failovers"] == 1
+    assert providers["p2"]["wins"] == 1
+
+
+def test_prefers_faster_provider_and_cools_down_failing_one(stubs):
+    slow = stubs("slow", delay=0.3)
+    fast = stubs("fast", delay=0.0)
+    pool = make_pool(slow, fast, error_threshold=2, hedge_default_delay=0.1)
+
+    for _ in range(4):
+        pool.complete(MESSAGES)
+    assert [p.spec.name for p in pool.ranked()] == ["p1", "p0"]
+
+    fast.status = 503
+    for _ in range(2):
+        pool.complete(MESSAGES)
+    assert [p.spec.name for p in pool.ranked()] == ["p0", "p1"]
+    assert pool.stats()["providers"]["p1"]["cooling_down"]
+
+
+def test_hedges_and_failovers_charged_to_llm_budget(stubs):
+    slow = stubs("slow", reply="restaurant", delay=0.6)
+    fast = stubs("fast", reply="room_service")
+
+    # one LLM slot, held by the first call: no hedge
+    ctl = AdmissionController(AdmissionConfig(llm_max_concurrent=1))
+    pool = make_pool(slow, fast, hedge_default_delay=0.05)
+    answer, elapsed = timed(pool, admit=ctl.llm_extra_call, release=ctl.llm_call())
+    assert answer == "restaurant" and elapsed >= 0.5
+    assert fast.requests == 0
+    assert pool.stats()["budget_denied"] == 1 and ctl.stats()["llm_extra_denied"] == 1
+
+    # two slots: the hedge wins, the slow first call keeps its slot until it ends
+    ctl = AdmissionController(AdmissionConfig(llm_max_concurrent=2))
+    pool = make_pool(slow, fast, hedge_default_delay=0.05)
+    answer, elapsed = timed(pool, admit=ctl.llm_extra_call, release=ctl.llm_call())
+    assert answer == "room_service" and elapsed < 0.5
+    assert ctl.stats()["llm_extra_calls"] == 1
+    release = ctl.llm_call()
+    assert release is not None and ctl.llm_call() is None
+    release()
+    time.sleep(0.8)
+    assert ctl.llm_call() is not None and ctl.llm_call() is not None
+
+    # an error fails over only while there is budget (here: one token)
+    slow.status, slow.delay = 500, 0.0
+    ctl = AdmissionController(AdmissionConfig(llm_rate=0.0, llm_burst=1))
+    with pytest.raises(LLMUnavailable):
+        make_pool(slow, fast).complete(MESSAGES, admit=ctl.llm_extra_call, release=ctl.llm_call())
+    assert fast.requests == 1
+
+
+def test_unavailable_pool_falls_back_to_keywords(stubs):
+    down = stubs("down", status=500)
+    pool = make_pool(down)
+    with pytest.raises(LLMUnavailable):
+        pool.complete(MESSAGES)
+    assert pool.stats()["failed"] == 1
+
+    # no provider configured (tests run without OPENAI_API_KEY)
+    assert ProviderPool([ProviderSpec("openai", "gpt-4o-mini")]).stats()["providers"] == {}
+    assert llm_decide("I am hungry") == "restaurant"
+
+
+def test_llm_decide_uses_pool(stubs):
+    server = stubs("local", reply="Room_Service")
+    LLM_POOL.configure([ProviderSpec("local", "stub", server.base_url)], LLMPoolConfig(timeout=3.0))
+    try:
+        assert llm_decide("something odd") == "room_service"
+        assert server.requests == 1
+    finally:
+        LLM_POOL.configure()
@@ -0,0 +1,67 @@
+import io
+import json
+import logging
+
+import pytest
+
+from backend.logging_setup import configure_logging, shutdown_logging
+from backend.agents.router import route_message
+
+# -----------------------------
+# Helper
+# -----------------------------
+
+
+@pytest.fixture
+def log_stream():
+    stream = io.StringIO()
+    yield stream
+    shutdown_logging()
+
+
+def records(stream):
+    shutdown_logging()      # flush the queue listener
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_turn_record_is_structured_json(log_stream):
+    configure_logging(stream=log_stream, sample_rate=1.0)
+    route_message("log1", "what is the check in time?")
+
+    turn = [r for r in records(log_stream) if r["msg"] == "Routed message"][-1]
+    assert turn["session"] == "log1"
+    assert turn["agent"] == "receptionist"
+    assert turn["tier"] == "keyword"
+    assert isinstance(turn["latency_ms"], float)
+
+
+def test_routine_turns_are_sampled_but_errors_kept(log_stream):
+    configure_logging(stream=log_stream, sample_rate=0.0, slow_ms=10_000)
+    route_message("log2", "what is the check in time?")
+    logging.getLogger("router").error("something broke")
+
+    out = records(log_stream)
+    assert not [r for r in out if r["msg"] == "Routed message"]
+    assert [r for r in out if r["level"] == "ERROR"]
+
+
+def test_slow_turns_always_logged(log_stream):
+    configure_logging(stream=log_stream, sample_rate=0.0, slow_ms=0)
+    route_message("log3", "what is the check in time?")
+
+    assert [r for r in records(log_stream) if r["msg"] == "Routed message"]
+
+
+def test_exceptions_keep_traceback(log_stream):
+    configure_logging(stream=log_stream)
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        logging.getLogger("router").exception("Router error")
+
+    error = records(log_stream)[-1]
+    assert "ValueError: bad" in error["exc"]
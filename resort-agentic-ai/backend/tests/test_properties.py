@@ -0,0 +1,179 @@
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from backend.agents.router import route_message
+from backend.data_versions import SHARED_VERSIONS, SharedVersions
+from backend.database import DEFAULT_PROPERTY, SessionLocal, shard_exists, use_property
+from backend.models.menu import MenuItem
+from backend.models.order import Order
+from backend.models.room import Room
+from backend.properties import (
+    PROPERTIES, PropertyRegistry, parse_room_numbers, property_menu, property_rooms,
+    provision_property
+)
+from backend.tools import rebuild_rollups
+from backend.utils.session import extract_room_number
+
+# -----------------------------
+# Helper
+# -----------------------------
+
+MENU = os.path.join(os.path.dirname(__file__), "fixtures", "menu.json")
+
+
+def provision(key, rooms):
+    with open(MENU, encoding="utf-8") as f:
+        provision_property(key, parse_room_numbers(rooms), json.load(f))
+
+
+def chat(client, property_id, session_id, message):
+    response = client.post("/chat", json={
+        "session_id": session_id, "message": message, "property_id": property_id
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["response"]
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_room_numbers_come_from_data():
+    rooms = frozenset(parse_room_numbers("1-20,204"))
+    assert extract_room_number("deliver to 204 please", rooms) == 204
+    assert extract_room_number("room 7", rooms) == 7
+    assert extract_room_number("room 999", rooms) == 999      # explicit, caller rejects it
+    assert extract_room_number("free from 2030-01-12 to 2030-01-14", rooms) is None
+    assert extract_room_number("my room is 110", frozenset(range(101, 111))) == 110
+
+
+def test_properties_are_isolated():
+    from backend.main import app
+
+    provision("seaside", "201-230")
+    client = TestClient(app)
+
+    chat(client, "seaside", "g1", "order two idli")
+    assert "Total ₹160" in chat(client, "seaside", "g1", "225")
+
+    # same session id at the default property is a different guest
+    chat(client, "default", "g1", "order two idli")
+    assert "Invalid room number" in chat(client, "default", "g1", "room 225")
+
+    with use_property("seaside"):
+        db = SessionLocal()
+        assert [o.room_number for o in db.query(Order).all()] == [225]
+        assert property_rooms(db) == frozenset(range(201, 231))
+        db.close()
+    assert "Room **225** is available" in chat(client, "seaside", "g2", "Is room 225 available?")
+    assert "does not exist" in chat(client, "default", "g2", "Is room 225 available?")
+
+
+def test_session_ids_cannot_cross_properties():
+    from backend.main import app
+
+    provision("seaside", "201-230")
+    client = TestClient(app)
+    chat(client, "seaside", "g1", "order two idli")
+
+    # a default-property client naming the seaside session gets its own, empty one
+    assert "Order confirmed" not in chat(client, "default", "seaside:g1", "225")
+    history = client.get("/chat/seaside:g1/history").json()["messages"]
+    assert [m["text"] for m in history if m["role"] == "user"] == ["225"]
+    assert "Total ₹160" in chat(client, "seaside", "g1", "225")
+
+
+def test_unknown_or_malformed_property_rejected():
+    from backend.main import app
+
+    client = TestClient(app)
+    payload = {"session_id": "x", "message": "gym"}
+    assert client.post("/chat", json={**payload, "property_id": "nowhere"}).status_code == 404
+    assert client.post("/chat", json={**payload, "property_id": "../etc"}).status_code == 400
+    with pytest.raises(ValueError):
+        with use_property("Bad Key"):
+            pass
+
+
+def test_rebuild_rollups_rejects_unknown_property(capsys):
+    assert rebuild_rollups.main(["--check", "--property", "nowhere"]) == 2
+    assert rebuild_rollups.main(["--check", "--property", "../etc"]) == 2
+    assert "Unknown property 'nowhere'" in capsys.readouterr().err
+    assert not shard_exists("nowhere")
+    assert rebuild_rollups.main(["--check"]) == 0
+
+
+def test_raw_sql_and_other_worker_writes_reach_the_cache(db, database_engine, monkeypatch):
+    monkeypatch.setattr(SHARED_VERSIONS, "check_seconds", 0.0)
+    assert "Masala Dosa" in [item.item_name for item in property_menu(db)]
+
+    # no ORM session of this process sees this write, only the shard's triggers
+    with database_engine.begin() as conn:
+        conn.execute(text("UPDATE menu_items SET available = 0 WHERE item_name = 'Masala Dosa'"))
+    try:
+        assert "Masala Dosa" not in [item.item_name for item in property_menu(db)]
+    finally:
+        with database_engine.begin() as conn:
+            conn.execute(text("UPDATE menu_items SET available = 1 WHERE item_name = 'Masala Dosa'"))
+    assert "Masala Dosa" in [item.item_name for item in property_menu(db)]
+
+
+def test_shared_versions_reread_after_interval(database_engine):
+    now = [0.0]
+    versions = SharedVersions(check_seconds=1.0, clock=lambda: now[0])
+    before = versions.get(DEFAULT_PROPERTY, ("rooms",))
+    with database_engine.begin() as conn:
+        conn.execute(text("UPDATE rooms SET is_available = 0 WHERE room_number = 101"))
+
+    now[0] = 0.5
+    assert versions.get(DEFAULT_PROPERTY, ("rooms",)) == before
+    now[0] = 1.0
+    assert versions.get(DEFAULT_PROPERTY, ("rooms",)) == (before[0] + 1,)
+    assert versions.reads == 2
+
+
+def test_registry_evicts_least_recently_used():
+    registry = PropertyRegistry(max_active=2)
+    a = registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")           # evicts b, not a
+
+    assert registry.get("a") is a
+    assert registry.stats()["evictions"] == 1
+    registry.get("b")
+    assert registry.stats() == {"active": 2, "max_active": 2, "loads": 4, "evictions": 2}
+
+
+def test_menu_and_rooms_reloaded_after_write(db):
+    assert "Masala Dosa" in route_message("m1", "show me the menu")
+    route_message("m2", "order one masala dosa")        # in the cart, waiting for a room
+
+    dosa = db.query(MenuItem).filter(MenuItem.item_name == "Masala Dosa").one()
+    dosa.available = False
+    db.commit()
+    try:
+        assert "Masala Dosa" not in route_message("m1", "show me the menu")
+        assert "no longer available" in route_message("m2", "101")
+        assert "Masala Dosa" not in route_message("m3", "order one masala dosa")
+    finally:
+        dosa.available = True
+        db.commit()
+    assert "Masala Dosa" in [item.item_name for item in property_menu(db)]
+
+    # availability flips keep the cached room numbers; a new room drops them
+    rooms = property_rooms(db)
+    db.query(Room).filter(Room.room_number == 101).one().is_available = False
+    db.commit()
+    assert PROPERTIES.get().rooms is rooms
+    db.add(Room(room_number=111, is_available=True))
+    db.commit()
+    try:
+        assert 111 in property_rooms(db)
+    finally:
+        db.query(Room).filter(Room.room_number == 111).delete()
+        db.commit()
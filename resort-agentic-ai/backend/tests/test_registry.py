@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from backend.agents import registry
+from backend.agents.registry import register_agent, dispatch, agent_stats
+
+# -----------------------------
+# Helper
+# -----------------------------
+
+
+@pytest.fixture
+def temp_agent():
+    yield "test_desk"
+    registry.AGENTS.pop("test_desk").shutdown()
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_builtin_departments_registered():
+    assert {"receptionist", "restaurant", "room_service"} <= set(registry.AGENTS)
+    assert "check-in" in dispatch("receptionist", "r1", "check in time?").lower()
+
+
+def test_timeout_returns_fallback(temp_agent):
+    register_agent(temp_agent, lambda s, m: time.sleep(0.5) or "late",
+                   timeout=0.05, fallback="busy")
+
+    assert dispatch(temp_agent, "t1", "hi") == "busy"
+    assert agent_stats()[temp_agent]["timeouts"] == 1
+
+
+def test_saturated_agent_rejects_without_blocking_others(temp_agent):
+    release = threading.Event()
+    register_agent(temp_agent, lambda s, m: release.wait(2) and "done",
+                   max_concurrent=1, max_queue=0, fallback="busy")
+
+    holder = threading.Thread(target=dispatch, args=(temp_agent, "t1", "hi"))
+    holder.start()
+    time.sleep(0.05)
+    try:
+        assert dispatch(temp_agent, "t2", "hi") == "busy"
+        stats = agent_stats()[temp_agent]
+        assert stats["rejected"] == 1
+        assert stats["saturation"] == 1.0
+        # other departments are unaffected
+        assert "check-in" in dispatch("receptionist", "r1", "check in time?").lower()
+    finally:
+        release.set()
+        holder.join()
+
+
+def test_handler_errors_propagate(temp_agent):
+    def broken(session_id, message):
+        raise RuntimeError("boom")
+
+    register_agent(temp_agent, broken)
+    with pytest.raises(RuntimeError):
+        dispatch(temp_agent, "t1", "hi")
+    assert agent_stats()[temp_agent]["errors"] == 1
+
+
+def test_timeout_after_start_is_not_reported_as_busy(temp_agent):
+    written = []
+
+    def slow_writer(session_id, message):
+        time.sleep(0.2)
+        written.append(message)
+        return "placed"
+
+    register_agent(temp_agent, slow_writer, max_concurrent=1, max_queue=1, timeout=0.05,
+                   fallback="busy", timeout_reply="still processing")
+
+    # the first call runs (and writes) after its timeout; the second never starts
+    first = []
+    holder = threading.Thread(target=lambda: first.append(dispatch(temp_agent, "t1", "two idli")))
+    holder.start()
+    time.sleep(0.01)
+    assert dispatch(temp_agent, "t2", "one dosa") == "busy"
+    holder.join()
+    assert first == ["still processing"]
+
+    time.sleep(0.3)
+    assert written == ["two idli"]
+    stats = agent_stats()[temp_agent]
+    assert stats["timeouts"] == 2
+    assert stats["queue_depth"] == 0 and stats["running"] == 0
+
+
+def test_writing_agents_tell_guest_not_to_resend():
+    for name in ("restaurant", "room_service"):
+        reply = registry.AGENTS[name].spec.timeout_reply
+        assert "don't resend" in reply and "try again" not in reply.lower()
@@ -0,0 +1,120 @@
+import json
+import os
+
+from backend.agents.registry import agent_stats
+from backend.agents.router import RESPONSE_MEMO, route_message
+from backend.data_versions import SHARED_VERSIONS
+from backend.database import use_property
+from backend.models.menu import MenuItem
+from backend.models.room import Room
+from backend.properties import parse_room_numbers, provision_property
+
+# -----------------------------
+# Helper
+# -----------------------------
+
+MENU = os.path.join(os.path.dirname(__file__), "fixtures", "menu.json")
+
+
+def receptionist_calls():
+    return agent_stats()["receptionist"]["calls"]
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_static_answer_served_from_table():
+    first = route_message("m1", "What is check in time?")
+    calls = receptionist_calls()
+
+    assert route_message("m2", "What is check in time?") == first
+    assert route_message("m2", "  what is CHECK IN time?") == first
+    assert receptionist_calls() == calls        # no agent call for memo hits
+
+    stats = RESPONSE_MEMO.stats()
+    assert stats["hits"] == 2 and stats["static_hits"] == 2
+    assert stats["turns"] == 3
+    assert stats["hit_share"] == round(2 / 3, 3)
+
+
+def test_stateful_messages_not_memoized():
+    for message in ("Is room 101 available?", "rooms free next weekend", "I need towels"):
+        route_message("m1", message)
+        route_message("m1", message)
+    assert RESPONSE_MEMO.stats()["hits"] == 0
+
+    # while an order waits for a room number, the restaurant gets the turn
+    route_message("m2", "gym timings")
+    route_message("m3", "order two idli")
+    assert "gym" not in route_message("m3", "gym timings").lower()
+    assert RESPONSE_MEMO.stats()["hits"] == 0
+
+
+def test_db_backed_answer_invalidated_on_write(db):
+    first = route_message("m1", "show room availability")
+    assert route_message("m2", "show room availability") == first
+    assert RESPONSE_MEMO.stats()["data_hits"] == 1
+
+    db.query(Room).filter(Room.room_number == 105).one().is_available = False
+    db.commit()
+
+    second = route_message("m3", "show room availability")
+    assert second != first and "105" not in second
+    assert route_message("m4", "show room availability") == second
+    stats = RESPONSE_MEMO.stats()
+    assert stats["stale"] == 1 and stats["data_hits"] == 2
+
+
+def test_menu_answer_rerendered_from_fresh_menu(db):
+    first = route_message("m1", "show me the menu")
+    assert route_message("m2", "show me the menu") == first
+
+    dosa = db.query(MenuItem).filter(MenuItem.item_name == "Masala Dosa").one()
+    dosa.available = False
+    db.commit()
+    try:
+        second = route_message("m3", "show me the menu")
+        assert "Masala Dosa" in first and "Masala Dosa" not in second
+        assert route_message("m4", "show me the menu") == second
+    finally:
+        dosa.available = True
+        db.commit()
+    assert route_message("m5", "show me the menu") == first
+    assert RESPONSE_MEMO.stats()["stale"] == 2
+
+
+def test_answer_expires_on_write_from_another_worker(database_engine, monkeypatch):
+    monkeypatch.setattr(SHARED_VERSIONS, "check_seconds", 0.0)
+    first = route_message("m1", "show room availability")
+    assert route_message("m2", "show room availability") == first
+
+    # raw SQL, as another worker's commit: no listener in this process fires
+    with database_engine.begin() as conn:
+        conn.execute(Room.__table__.update().where(Room.room_number == 105).values(is_available=False))
+    second = route_message("m3", "show room availability")
+    assert second != first and "105" not in second
+
+
+def test_db_backed_answers_are_per_property():
+    with open(MENU, encoding="utf-8") as f:
+        provision_property("lakeside", parse_room_numbers("301-303"), json.load(f))
+
+    default = route_message("m1", "show room availability")
+    with use_property("lakeside"):
+        lakeside = route_message("m1", "show room availability")
+        assert route_message("m2", "show room availability") == lakeside
+    assert lakeside == "✅ Available rooms: 301, 302, 303"
+    assert route_message("m2", "show room availability") == default
+
+
+def test_disabled_memo_routes_normally():
+    RESPONSE_MEMO.enabled = False
+    try:
+        route_message("m1", "What is check in time?")
+        calls = receptionist_calls()
+        route_message("m2", "What is check in time?")
+        assert receptionist_calls() == calls + 1
+        assert RESPONSE_MEMO.stats()["hits"] == 0
+    finally:
+        RESPONSE_MEMO.enabled = True
@@ -0,0 +1,34 @@
+from backend.utils.session import OrderSession, CartLine, Stage
+from backend.agents.router import route_message
+from backend.agents.restaurant import SESSION_ORDERS
+
+# -----------------------------
+# Tests
+# -----------------------------
+
+
+def test_order_session_roundtrip():
+    session = OrderSession(
+        [CartLine(2, 3), CartLine(6), CartLine(9, 0)],
+        Stage.AWAITING_QUANTITY,
+        1
+    )
+    data = session.to_bytes()
+
+    assert len(data) == 5 + 3 * 6
+    assert OrderSession.from_bytes(data) == session
+
+
+def test_empty_session_roundtrip():
+    assert OrderSession.from_bytes(OrderSession().to_bytes()) == OrderSession()
+
+
+def test_restaurant_keeps_item_ids_in_session():
+    SESSION_ORDERS.clear()
+    route_message("s1", "I want dosa")
+
+    session = SESSION_ORDERS["s1"]
+    assert session.stage == Stage.AWAITING_QUANTITY
+    assert len(session.lines) == 1
+    assert isinstance(session.lines[0].item_id, int)
+    assert session.lines[0].qty is None
@@ -1,25 +1,54 @@
-import pandas as pd
+import argparse
+import json
+
 from backend.database import SessionLocal
 from backend.models.menu import MenuItem
 
 
-def load_menu_from_excel(path):
+def read_menu_excel(path):
+    """Rows of the menu sheet as plain dicts (pandas is only needed here)."""
+    import pandas as pd
+
     df = pd.read_excel(path)
-    db = SessionLocal()
+    return [
+        {
+            "item_name": row["Item Name"],
+            "description": row["Description"],
+            "price": float(row["Price (₹)"])
+        }
+        for _, row in df.iterrows()
+    ]
 
-    for _, row in df.iterrows():
-        item = MenuItem(
-            item_name=row["Item Name"],
-            description=row["Description"],
-            price=row["Price (₹)"],
-            available=True
-        )
-        db.add(item)
 
+def load_menu_rows(db, rows):
+    for row in rows:
+        db.add(MenuItem(available=True, **row))
     db.commit()
+
+
+def load_menu_from_excel(path):
+    db = SessionLocal()
+    load_menu_rows(db, read_menu_excel(path))
     db.close()
     print("Menu loaded successfully.")
 
 
+def write_snapshot(path, out):
+    """Freeze the Excel menu into JSON for fast, pandas-free test seeding."""
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(read_menu_excel(path), f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"Menu snapshot written to {out}.")
+
+
 if __name__ == "__main__":
-    load_menu_from_excel("Restaurant_Menu.xlsx")
+    parser = argparse.ArgumentParser(description="Load Restaurant_Menu.xlsx into the database.")
+    parser.add_argument("path", nargs="?", default="Restaurant_Menu.xlsx")
+    parser.add_argument("--snapshot", metavar="JSON",
+                        help="write the menu to a JSON snapshot instead of the database")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        write_snapshot(args.path, args.snapshot)
+    else:
+        load_menu_from_excel(args.path)
@@ -0,0 +1,34 @@
+import argparse
+import json
+import sys
+
+from backend.database import shard_url
+from backend.properties import parse_room_numbers, provision_property
+from backend.tools.load_menu import read_menu_excel
+
+
+def read_menu(path):
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return read_menu_excel(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Create a property's database shard with its rooms and menu."
+    )
+    parser.add_argument("property", help="property key, e.g. 'seaside' (lowercase, digits, - and _)")
+    parser.add_argument("--rooms", required=True, help="room numbers, e.g. '101-140,201-220'")
+    parser.add_argument("--menu", help="Restaurant_Menu.xlsx or a JSON snapshot (see load_menu --snapshot)")
+    args = parser.parse_args(argv)
+
+    rooms = parse_room_numbers(args.rooms)
+    menu = read_menu(args.menu) if args.menu else ()
+    provision_property(args.property, rooms, menu)
+    print(f"Property '{args.property}': {len(rooms)} rooms, {len(menu)} menu items -> {shard_url(args.property)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import argparse
+import sys
+
+from backend.database import SessionLocal, Base, DEFAULT_PROPERTY, engine_for, use_property
+from backend.billing import rebuild_rollups
+from backend.properties import check_property
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Recompute room_bills / daily_revenue from the orders table."
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="only compare the stored rollups with the raw orders"
+    )
+    parser.add_argument("--property", default=DEFAULT_PROPERTY, help="property shard to check")
+    args = parser.parse_args(argv)
+
+    # an unknown key would otherwise create (and "rebuild") an empty shard
+    try:
+        check_property(args.property)
+    except (ValueError, LookupError) as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    Base.metadata.create_all(bind=engine_for(args.property))
+    with use_property(args.property):
+        db = SessionLocal()
+    try:
+        problems = rebuild_rollups(db, check_only=args.check)
+    finally:
+        db.close()
+
+    for line in problems:
+        print(line)
+
+    if args.check:
+        print("Rollups OK." if not problems else f"{len(problems)} mismatches.")
+        return 1 if problems else 0
+
+    print(f"Rollups rebuilt ({len(problems)} mismatches fixed).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Minimal OpenAI-compatible chat completions server for local testing.
+
+Answers every POST .../chat/completions with a fixed reply after a
+configurable delay (optionally jittered, with an occasional slow "tail"
+answer) or with an HTTP error, always or for a random share of requests, so the LLM
+provider pool can be exercised without a real model:
+
+    python -m backend.tools.stub_llm_server --port 8101 --delay 0.3 --reply receptionist
+    LLM_PROVIDERS='[{"name": "stub", "base_url": "http://127.0.0.1:8101/v1", "model": "stub"}]'
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubLLMServer:
+    def __init__(self, reply: str = "receptionist", delay: float = 0.0, jitter: float = 0.0,
+                 status: int = 200, tail_rate: float = 0.0, tail_delay: float = 0.0,
+                 error_rate: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        # settings can be changed while the server runs
+        self.reply = reply
+        self.delay = delay
+        self.jitter = jitter
+        self.tail_rate = tail_rate          # share of requests that take tail_delay longer
+        self.tail_delay = tail_delay
+        self.error_rate = error_rate        # share of requests answered with HTTP 500
+        self.status = status
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with stub._lock:
+                    stub.requests += 1
+                delay = stub.delay + random.uniform(0, stub.jitter)
+                if random.random() < stub.tail_rate:
+                    delay += stub.tail_delay
+                time.sleep(delay)
+
+                if not self.path.endswith("/chat/completions"):
+                    return self._send(404, {"error": {"message": "not found"}})
+                status = 500 if random.random() < stub.error_rate else stub.status
+                if status != 200:
+                    return self._send(status, {"error": {"message": "stub error"}})
+                self._send(200, {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": stub.reply},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+                })
+
+            def _send(self, status, payload):
+                data = json.dumps(payload).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass        # client gave up (e.g. a hedged call that lost)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve_forever(self):
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stub OpenAI-compatible LLM endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8101)
+    parser.add_argument("--reply", default="receptionist")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds before answering")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay, seconds")
+    parser.add_argument("--status", type=int, default=200, help="HTTP status to answer with")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="share of slow answers")
+    parser.add_argument("--tail-delay", type=float, default=0.0, help="extra seconds for slow answers")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of HTTP 500 answers")
+    args = parser.parse_args(argv)
+
+    server = StubLLMServer(args.reply, args.delay, args.jitter, args.status,
+                           args.tail_rate, args.tail_delay, args.error_rate, args.host, args.port)
+    print(f"Stub LLM on {server.base_url} (delay {args.delay}s, status {args.status})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
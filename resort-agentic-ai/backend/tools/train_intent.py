@@ -0,0 +1,114 @@
+"""
+Train the local intent classifier from captured router decisions.
+
+    ROUTER_CAPTURE_PATH=captures.jsonl uvicorn backend.main:app ...
+    python -m backend.tools.train_intent captures.jsonl --out backend/agents/intent_model.npz
+
+Each input line is JSON with "message" and "agent" (or "label", which wins,
+for hand-corrected examples). Session-continuation turns ("2", "101") are
+not intents and are skipped, and so are the classifier's own decisions
+(retraining on them would reinforce its mistakes) and the keyword guesses
+made when the LLM was over budget or didn't answer, unless a "label" is set.
+
+The confidence threshold is calibrated on the holdout: the lowest one at
+which the classifier's answers are at least --min-precision correct (the
+LLM path it replaces). A model that can't reach it is not written to the
+path the router loads at startup.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from backend.agents.intent_classifier import IntentClassifier
+from backend.agents.router import DEFAULT_INTENT_MODEL_PATH
+from backend.agents.registry import AGENTS
+
+SKIPPED_TIERS = {"session", "llm_degraded", "llm_fallback", "classifier"}
+
+
+def read_examples(paths):
+    seen = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                if row.get("tier") in SKIPPED_TIERS and "label" not in row:
+                    continue
+                label = row.get("label") or row.get("agent")
+                message = (row.get("message") or "").strip()
+                if message and label in AGENTS:
+                    # last decision for a message wins
+                    seen[message.lower()] = label
+    return list(seen.keys()), list(seen.values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the local intent classifier.")
+    parser.add_argument("captures", nargs="+", help="JSONL files of router decisions")
+    parser.add_argument("--out", default=DEFAULT_INTENT_MODEL_PATH)
+    parser.add_argument("--holdout", type=float, default=0.2,
+                        help="fraction kept aside to calibrate the threshold and report accuracy")
+    parser.add_argument("--min-precision", type=float, default=0.95,
+                        help="share of its answers the tier must get right (the LLM path's precision)")
+    parser.add_argument("--min-answered", type=int, default=10,
+                        help="fewest holdout answers a calibrated threshold may rest on")
+    parser.add_argument("--min-df", type=int, default=2)
+    parser.add_argument("--epochs", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    messages, labels = read_examples(args.captures)
+    if len(set(labels)) < 2:
+        print("Need examples of at least two agents to train.")
+        return 1
+
+    order = list(range(len(messages)))
+    random.Random(0).shuffle(order)
+    n_test = int(len(order) * args.holdout)
+    test, train = order[:n_test], order[n_test:]
+
+    t0 = time.perf_counter()
+    model = IntentClassifier.train(
+        [messages[i] for i in train], [labels[i] for i in train],
+        min_df=args.min_df, epochs=args.epochs
+    )
+    print(f"trained on {len(train)} examples, {len(model.vocab)} n-grams "
+          f"in {time.perf_counter() - t0:.1f}s")
+
+    calibration = None
+    if test:
+        test_messages, test_labels = [messages[i] for i in test], [labels[i] for i in test]
+        proba = model.predict_proba(test_messages)
+        predicted = [model.classes[j] for j in proba.argmax(axis=1)]
+        accuracy = np.mean([p == label for p, label in zip(predicted, test_labels)])
+        print(f"holdout accuracy: {accuracy:.3f} ({len(test)} examples, every answer taken)")
+        calibration = model.calibrate(test_messages, test_labels, args.min_precision,
+                                      args.min_answered)
+
+    if calibration is None:
+        print(f"no threshold reaches precision {args.min_precision:.2f} on the holdout")
+        if os.path.abspath(args.out) == os.path.abspath(DEFAULT_INTENT_MODEL_PATH):
+            print(f"not writing {args.out}: the router would load it at startup "
+                  f"(use --out elsewhere to keep the model for inspection)")
+            return 1
+    else:
+        model.threshold, precision, coverage = calibration
+        print(f"threshold {model.threshold:.3f}: precision {precision:.3f}, "
+              f"answers {coverage:.1%} of holdout messages")
+
+    model.save(args.out)
+    t0 = time.perf_counter()
+    IntentClassifier.load(args.out)
+    print(f"saved {args.out} (loads in {(time.perf_counter() - t0) * 1000:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
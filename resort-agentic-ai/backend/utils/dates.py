@@ -0,0 +1,117 @@
+import re
+from datetime import date, timedelta
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+
+_MONTH = r"(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*"
+_DAY = r"\b(\d{1,2})(?:st|nd|rd|th)?\b"
+
+ISO_RANGE = re.compile(r"(\d{4}-\d{2}-\d{2})\s*(?:to|until|till|-)\s*(\d{4}-\d{2}-\d{2})")
+# "12 march to 15 march", "12th to 15th of march", "from the 12th to the 15th"
+DAY_FIRST_RANGE = re.compile(
+    rf"(?:the\s+)?{_DAY}(?:\s+(?:of\s+)?{_MONTH})?\s*(?:to|until|till|-)\s*"
+    rf"(?:the\s+)?{_DAY}(?:\s+(?:of\s+)?{_MONTH})?"
+)
+# a bare "2-3" is only read as days when something marks it as dates:
+# a month, an ordinal, a leading "the" or "from"/"on"/"between" before it
+DAY_RANGE_LEAD = re.compile(r"\b(?:from|on|between)\s+$")
+ORDINAL = re.compile(r"\d(?:st|nd|rd|th)\b")
+# ... and never when it counts something ("2-3 nights")
+COUNTED = re.compile(r"\s*(?:nights?|days?|weeks?|people|persons?|guests?|adults?|kids?|children|rooms?)\b")
+# "march 12 to march 15", "march 12 to 15"
+MONTH_FIRST_RANGE = re.compile(
+    rf"{_MONTH}\s+{_DAY}\s*(?:to|until|till|-)\s*(?:{_MONTH}\s+)?{_DAY}"
+)
+
+
+def _next_month(year: int, month: int):
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _resolve(day: int, month, today: date, not_before: date = None):
+    """Date for a day-of-month with an optional month, on or after `not_before`."""
+    not_before = not_before or today
+    year = today.year
+    if month is None:
+        year, month = not_before.year, not_before.month
+        if day < not_before.day:
+            year, month = _next_month(year, month)
+    try:
+        resolved = date(year, month, day)
+    except ValueError:
+        return None
+    if resolved < not_before:
+        try:
+            resolved = date(resolved.year + 1, month, day)
+        except ValueError:
+            return None
+    return resolved
+
+
+def _day_range(t: str):
+    """First DAY_FIRST_RANGE match that reads as dates rather than a count."""
+    for m in DAY_FIRST_RANGE.finditer(t):
+        if COUNTED.match(t, m.end()):
+            continue
+        if (m.group(2) or m.group(4) or ORDINAL.search(m.group(0))
+                or m.group(0).startswith("the") or DAY_RANGE_LEAD.search(t, 0, m.start())):
+            return m
+    return None
+
+
+def _weekend(today: date, next_one: bool):
+    # Friday check-in, Sunday check-out (Friday + Saturday nights)
+    weekday = today.weekday()
+    friday = today + timedelta(days=4 - weekday)        # this week's Friday
+    if weekday == 6:
+        friday += timedelta(days=7)     # Sunday: this weekend's nights are over
+    if next_one and weekday >= 4:
+        friday += timedelta(days=7)     # during a weekend, "next" is the one after it
+    return max(friday, today), friday + timedelta(days=2)
+
+
+def parse_date_range(text: str, today: date = None):
+    """
+    Parses a stay from free text.
+    Returns: (check_in, check_out) with check_out exclusive, or None
+    """
+    today = today or date.today()
+    t = (text or "").lower()
+
+    m = ISO_RANGE.search(t)
+    if m:
+        try:
+            start, end = date.fromisoformat(m.group(1)), date.fromisoformat(m.group(2))
+        except ValueError:
+            return None
+        return (start, end) if end > start else None
+
+    m = MONTH_FIRST_RANGE.search(t)
+    if m:
+        month = MONTHS[m.group(1)]
+        end_month = MONTHS[m.group(3)] if m.group(3) else month
+        start = _resolve(int(m.group(2)), month, today)
+        end = start and _resolve(int(m.group(4)), end_month, today, start + timedelta(days=1))
+        return (start, end) if start and end else None
+
+    m = _day_range(t)
+    if m:
+        start_month = MONTHS[m.group(2)] if m.group(2) else None
+        end_month = MONTHS[m.group(4)] if m.group(4) else None
+        start = _resolve(int(m.group(1)), start_month or end_month, today)
+        end = start and _resolve(int(m.group(3)), end_month, today, start + timedelta(days=1))
+        return (start, end) if start and end else None
+
+    if "next weekend" in t:
+        return _weekend(today, next_one=True)
+    if "weekend" in t:
+        return _weekend(today, next_one=False)
+    if "tonight" in t:
+        return today, today + timedelta(days=1)
+    if "tomorrow" in t:
+        return today + timedelta(days=1), today + timedelta(days=2)
+
+    return None
@@ -1,8 +1,79 @@
 import re
+import struct
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Optional
 
 
-def extract_room_number(message: str):
-    match = re.search(r"\b(10[1-9]|110)\b", message)
+# "room 204", "room no. 12", "rm #7"
+ROOM_REFERENCE = re.compile(r"\b(?:room|rm)\s*(?:no\.?|number)?\s*#?\s*(\d{1,5})\b")
+# a bare number that isn't part of a date like 2030-01-12 or 12/01
+BARE_NUMBER = re.compile(r"(?<![\d/-])\b(\d{1,5})\b(?![/-]\d)")
+
+
+def extract_room_number(message: str, rooms=None):
+    """
+    Room number mentioned in a message. An explicit "room N" is returned even
+    if N isn't a room (so callers can say so); otherwise the first bare number
+    that is one of `rooms`, the property's room numbers.
+    """
+    text = (message or "").lower()
+    match = ROOM_REFERENCE.search(text)
     if match:
-        return int(match.group())
+        return int(match.group(1))
+    for match in BARE_NUMBER.finditer(text):
+        number = int(match.group(1))
+        if rooms is not None and number in rooms:
+            return number
     return None
+
+
+# ===============================
+# Restaurant order sessions
+# ===============================
+class Stage(IntEnum):
+    AWAITING_ITEMS = 0
+    AWAITING_QUANTITY = 1
+    AWAITING_ROOM = 2
+
+
+@dataclass(slots=True)
+class CartLine:
+    item_id: int                  # MenuItem.id
+    qty: Optional[int] = None     # None until the guest tells us
+
+
+@dataclass(slots=True)
+class OrderSession:
+    lines: list = field(default_factory=list)
+    stage: Stage = Stage.AWAITING_ITEMS
+    current_index: int = 0
+
+    # header: stage (u8), current_index (u16), line count (u16)
+    # line:   item_id (u32), qty (u16, 0xFFFF = unknown)
+    _HEADER = struct.Struct("<BHH")
+    _LINE = struct.Struct("<IH")
+    _NO_QTY = 0xFFFF
+
+    def next_missing_qty(self):
+        for idx, line in enumerate(self.lines):
+            if line.qty is None:
+                return idx
+        return None
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(self._HEADER.pack(self.stage, self.current_index, len(self.lines)))
+        for line in self.lines:
+            out += self._LINE.pack(line.item_id, self._NO_QTY if line.qty is None else line.qty)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        stage, current_index, count = cls._HEADER.unpack_from(data, 0)
+        lines = []
+        offset = cls._HEADER.size
+        for _ in range(count):
+            item_id, qty = cls._LINE.unpack_from(data, offset)
+            lines.append(CartLine(item_id, None if qty == cls._NO_QTY else qty))
+            offset += cls._LINE.size
+        return cls(lines, Stage(stage), current_index)
@@ -1,4 +1,5 @@
 import os
+import sys
 import streamlit as st
 import sqlite3
 import pandas as pd
@@ -9,6 +10,10 @@ import pandas as pd
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(BASE_DIR, "resort.db")
 
+# backend helpers (billing rollups) live next to the dashboard
+sys.path.insert(0, BASE_DIR)
+from backend.billing import update_order_status_sql  # noqa: E402
+
 st.set_page_config(
     page_title="Resort Operations Dashboard",
     layout="wide"
@@ -101,10 +106,8 @@ else:
                     f"🍽 Mark Served",
                     key=f"serve_{row['id']}"
                 ):
-                    cursor.execute(
-                        "UPDATE orders SET status='Served' WHERE id=?",
-                        (row["id"],)
-                    )
+                    # status + rollups in one transaction
+                    update_order_status_sql(conn, int(row["id"]), "Served")
                     conn.commit()
                     st.rerun()
 
@@ -1,27 +1,134 @@
-import streamlit as st
-import requests
+import os
 import uuid
 
-API_URL = "http://127.0.0.1:8000/chat"
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_BASE = os.getenv("RESORT_API_URL", "http://127.0.0.1:8000")
+API_URL = f"{API_BASE}/chat"
+
+TIMEOUT = (3.05, 30)    # connect, read (an LLM-routed turn can take a while)
+RENDER_WINDOW = 40      # messages rendered on each rerun
+PAGE_SIZE = 40          # messages fetched per "Load earlier"
+MAX_RENDERED = 400
+BUSY_STATUSES = (429, 503)  # admission rejections: the message was not handled
 
 st.set_page_config(page_title="Resort AI Assistant", layout="centered")
 st.title("🏨 Resort AI Assistant")
 
+# -------------------------
+# HTTP client
+# -------------------------
+
+
+@st.cache_resource
+def http_session():
+    # one pooled keep-alive session per server process. Only connection
+    # failures and admission rejections (429/503, sent before the message is
+    # handled) are retried, so a slow order is never placed twice.
+    retry = Retry(
+        total=3, connect=3, read=0, status=2,
+        status_forcelist=BUSY_STATUSES,
+        allowed_methods=frozenset({"GET", "POST"}),
+        backoff_factor=0.5,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def send_message(session_id: str, text: str):
+    """Returns: (reply seq or None, reply text or None, notice or None)"""
+    payload = {"session_id": session_id, "message": text}
+    try:
+        response = http_session().post(API_URL, json=payload, timeout=TIMEOUT)
+        if response.status_code in BUSY_STATUSES:
+            wait = response.headers.get("Retry-After")
+            hint = f" in {wait} s" if wait and wait.isdigit() and int(wait) > 0 else " in a moment"
+            return None, None, f"⏳ The assistant is busy right now. Please send your message again{hint}."
+        if not response.ok:
+            return None, "Backend error. Please try again.", None
+        data = response.json()
+    except (requests.RequestException, ValueError):
+        return None, "Backend error. Please try again.", None
+    return data.get("seq"), data.get("response", "Sorry, something went wrong."), None
+
+
+def fetch_history(session_id: str, before: int, limit: int = PAGE_SIZE):
+    """Returns: ([(seq, role, text)], has_more)"""
+    try:
+        response = http_session().get(
+            f"{API_URL}/{session_id}/history",
+            params={"before": before, "limit": limit},
+            timeout=TIMEOUT
+        )
+        response.raise_for_status()
+        data = response.json()
+    except (requests.RequestException, ValueError):
+        return [], True
+    messages = [(m["seq"], m["role"], m["text"]) for m in data.get("messages", [])]
+    return messages, data.get("has_more", False)
+
 # -------------------------
 # Session handling
 # -------------------------
+
+
 if "session_id" not in st.session_state:
     st.session_state.session_id = str(uuid.uuid4())
 
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
+if "messages" not in st.session_state:
+    st.session_state.messages = []          # (seq, role, text), oldest first
+    st.session_state.window = RENDER_WINDOW
+    st.session_state.history_start = 0      # oldest seq the server still has
+
+
+def trim_window():
+    extra = len(st.session_state.messages) - st.session_state.window
+    if extra > 0:
+        del st.session_state.messages[:extra]
+
+
+def oldest_seq():
+    return next((seq for seq, _, _ in st.session_state.messages if seq is not None), None)
+
+
+def load_earlier():
+    before = oldest_seq()
+    if before is None:                      # nothing from the server yet: no anchor to page from
+        return
+    older, has_more = fetch_history(st.session_state.session_id, before)
+    st.session_state.messages[:0] = older
+    st.session_state.window = min(st.session_state.window + len(older), MAX_RENDERED)
+    if not has_more:
+        st.session_state.history_start = older[0][0] if older else before
+
+
+def render(role: str, text: str):
+    with st.chat_message(role):
+        st.markdown(text)
 
 # -------------------------
-# Display chat history
+# Display chat history (recent window only)
 # -------------------------
-for role, msg in st.session_state.chat_history:
-    with st.chat_message(role):
-        st.markdown(msg)
+
+
+trim_window()
+oldest = oldest_seq()
+if oldest is not None and oldest > st.session_state.history_start:
+    if st.session_state.window < MAX_RENDERED:
+        st.button("⬆️ Load earlier messages", on_click=load_earlier)
+    else:
+        st.caption(f"Showing the latest {MAX_RENDERED} messages.")
+
+for _, role, msg in st.session_state.messages:
+    render(role, msg)
 
 # -------------------------
 # User input
@@ -30,24 +137,18 @@ user_input = st.chat_input("Type your message...")
 
 if user_input:
     # Show user message
-    st.session_state.chat_history.append(("user", user_input))
-    with st.chat_message("user"):
-        st.markdown(user_input)
+    render("user", user_input)
 
     # Call backend
-    payload = {
-        "session_id": st.session_state.session_id,
-        "message": user_input
-    }
+    seq, bot_reply, notice = send_message(st.session_state.session_id, user_input)
 
-    response = requests.post(API_URL, json=payload)
+    if notice:
+        # turned away before it was handled: not part of the conversation
+        st.warning(notice)
+    else:
+        # Show bot message
+        render("assistant", bot_reply)
 
-    try:
-        bot_reply = response.json().get("response", "Sorry, something went wrong.")
-    except Exception:
-        bot_reply = "Backend error. Please try again."
-
-    # Show bot message
-    st.session_state.chat_history.append(("assistant", bot_reply))
-    with st.chat_message("assistant"):
-        st.markdown(bot_reply)
+        st.session_state.messages.append((seq - 1 if seq is not None else None, "user", user_input))
+        st.session_state.messages.append((seq, "assistant", bot_reply))
+        trim_window()